@@ -0,0 +1,49 @@
+"""Configuração do pytest: a raiz do repositório entra no sys.path (para `import src...`) e o log dos nós fica em silêncio."""
+import logging
+import socket
+
+import pytest
+
+from src.common.instrumentation import get_logger
+
+get_logger('tests')
+logging.getLogger('simula').setLevel(logging.ERROR)
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture(scope='session')
+def pyro_ns():
+    """Name Server do Pyro5 para os testes do Grupo B (reaproveita um que já esteja no ar)."""
+    from src.launcher import start_pyro_ns, stop_pyro_ns
+    process = start_pyro_ns()
+    yield
+    stop_pyro_ns(process)
+
+@pytest.fixture
+def cluster(request):
+    """Sobe `count` nós reais de um grupo como threads deste processo, em portas livres; todos param no fim do teste.
+
+    Os nós do Grupo B precisam do fixture `pyro_ns`.
+    """
+    from src.launcher import create_node
+    from src.topology import cluster_ids
+    started = []
+
+    def start(group_id, count, first_id=1):
+        config = {node_id: {'host': '127.0.0.1', 'port': _free_port()} for node_id in range(first_id, first_id + count)}
+        group_a, group_b = (config, {}) if group_id == 'A' else ({}, config)
+        nodes = [create_node(group_id, node_id, group_a, group_b) for node_id in config]
+        started.extend(nodes)
+        for node in nodes:
+            node.start()
+        for node in nodes:
+            assert node.wait_ready(10)
+        return nodes
+
+    yield start
+    for node in started:
+        if node.is_running:
+            node.stop()
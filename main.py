@@ -1,52 +1,92 @@
+import argparse
 import time
-import subprocess
 import threading
-import sys
 
-from src.config import GROUP_A_NODES, GROUP_B_NODES
-from src.group_a.node_a import NodeA
-from src.group_b.node_b import NodeB
+from src.config import SNAPSHOT_DIR, LAUNCHER_STATUS_INTERVAL, METRICS_HOST, METRICS_PORT
 from src.common.token_manager import TokenManager
+from src.common.timers import shared_wheel
+from src.common.instrumentation import start_metrics_server
+from src.topology import default_topology, generate_topology
+from src.launcher import ClusterLauncher, create_node, wait_for_leaders, start_pyro_ns, stop_pyro_ns
+# grpc e Pyro5 só são importados pelos nós (e pelo Name Server) dos grupos que existem na topologia
 
-def start_pyro_ns():
-    """Inicia o Pyro Name Server em um processo separado."""
-    try:
-        # Tenta localizar um NS existente
-        import Pyro5.api
-        Pyro5.api.locate_ns()
-        print("Pyro Name Server já está rodando.")
-        return None
-    except Pyro5.errors.NamingError:
-        print("Iniciando Pyro Name Server...")
-        # O comando pode variar dependendo do ambiente (ex: 'pyro5-ns')
-        return subprocess.Popen([sys.executable, "-m", "Pyro5.nameserver"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Simulação de dois grupos de nós (gRPC e Pyro5).")
+    parser.add_argument('--nodes-a', type=int, help="nós do Grupo A (padrão: a topologia de src/config.py; 0 não inicia o grupo)")
+    parser.add_argument('--nodes-b', type=int, help="nós do Grupo B (padrão: a topologia de src/config.py; 0 não inicia o grupo)")
+    parser.add_argument('--processes', type=int, help="distribui os nós entre este número de processos")
+    parser.add_argument('--nodes-per-process', type=int,
+                        help="executa os nós em processos separados, com até este número de nós por processo")
+    return parser.parse_args()
 
 def main():
-    # Inicia o Pyro Name Server
-    pyro_ns_process = start_pyro_ns()
-    time.sleep(2) # Dá tempo para o NS iniciar
+    args = parse_args()
+    if args.nodes_a is not None or args.nodes_b is not None:
+        default_a, default_b = default_topology()
+        nodes_a = len(default_a) if args.nodes_a is None else args.nodes_a
+        nodes_b = len(default_b) if args.nodes_b is None else args.nodes_b
+        try:
+            group_a, group_b = generate_topology(nodes_a, nodes_b)
+        except ValueError as e:
+            raise SystemExit(f"Invalid topology: {e}")
+    else:
+        group_a, group_b = default_topology()
+
+    # Inicia o Pyro Name Server, só necessário para o Grupo B
+    pyro_ns_process = start_pyro_ns() if group_b else None
 
+    if args.processes or args.nodes_per_process:
+        run_processes(group_a, group_b, args, pyro_ns_process)
+    else:
+        run_threads(group_a, group_b, pyro_ns_process)
+
+def run_processes(group_a, group_b, args, pyro_ns_process):
+    """Modo multiprocesso: cada processo de trabalho executa um ou mais nós."""
+    launcher = ClusterLauncher(group_a, group_b, nodes_per_process=args.nodes_per_process or 1, processes=args.processes)
+    launcher.start()
+    print("Pressione Ctrl+C para encerrar a simulação.\n")
+    try:
+        while True:
+            time.sleep(LAUNCHER_STATUS_INTERVAL)
+            status = launcher.poll_status()
+            print(f"\n--- Status: {len(launcher.alive_workers())}/{len(launcher.workers)} processos ativos ---")
+            for group in ('A', 'B'):
+                nodes = [s for s in status.values() if s['group'] == group]
+                leaders = sorted({s['leader_id'] for s in nodes if s['leader_id'] is not None})
+                print(f"Grupo {group}: {len(nodes)} nós reportando, líder(es) {leaders}")
+            print("---------------------------\n")
+    except KeyboardInterrupt:
+        print("\nEncerrando a simulação...")
+        launcher.stop()
+        stop_pyro_ns(pyro_ns_process)
+        print("Simulação encerrada.")
+
+def run_threads(group_a, group_b, pyro_ns_process):
+    """Modo original: todos os nós como threads deste processo."""
     nodes = []
-    
-    # Inicia nós do Grupo A
-    for node_id in GROUP_A_NODES:
-        node = NodeA(node_id)
-        nodes.append(node)
-        node.start()
-
-    # Inicia nós do Grupo B
-    for node_id in GROUP_B_NODES:
-        node = NodeB(node_id)
-        nodes.append(node)
-        node.start()
-
-    print("\nTodos os nós foram iniciados. A simulação está em execução.")
-    print("Eleições de líder em cada grupo começarão em breve.")
+    started = time.monotonic()
+    start_metrics_server(METRICS_PORT, METRICS_HOST)
+
+    # Inicia nós do Grupo A e do Grupo B
+    for group_id, group in (('A', group_a), ('B', group_b)):
+        for node_id in group:
+            node = create_node(group_id, node_id, group_a, group_b)
+            nodes.append(node)
+            node.start()
+
+    for node in nodes:
+        node.wait_ready(timeout=max(started + 15 - time.monotonic(), 0))
+    print(f"\nTodos os nós foram iniciados em {time.monotonic() - started:.2f}s. A simulação está em execução.")
+    print("Eleições de líder em cada grupo começarão assim que a maioria do grupo responder.")
     print("Pressione Ctrl+C para encerrar a simulação.\n")
 
     try:
         # Demonstração de funcionalidades após a eleição
-        time.sleep(15) # Espera as eleições terminarem
+        leaders = wait_for_leaders(nodes, timeout=15)
+        for group_id, leader in sorted(leaders.items()):
+            if 'agreed_at' in leader:
+                print(f"Grupo {group_id}: líder {leader['leader_id']} conhecido por todos os nós "
+                      f"{leader['agreed_at'] - started:.2f}s após o início.")
 
         print("\n--- DEMONSTRAÇÃO DE FUNCIONALIDADES ---")
         
@@ -65,7 +105,7 @@ def main():
             token = TokenManager.generate_token(leader_a.node_id)
             print(f"Líder {leader_a.node_id} gerou um token.")
             TokenManager.access_sensitive_data(token)
-        else:
+        elif group_a:
             print("\nNenhum líder eleito no Grupo A ainda.")
 
         if leader_b:
@@ -73,23 +113,40 @@ def main():
             token = TokenManager.generate_token(leader_b.node_id)
             print(f"Líder {leader_b.node_id} gerou um token.")
             TokenManager.access_sensitive_data(token)
-        else:
+        elif group_b:
             print("\nNenhum líder eleito no Grupo B ainda.")
 
         # Eleição do Supercoordenador (simplificado)
         if leader_a and leader_b:
-            super_coordinator = max(leader_a, leader_b, key=lambda x: x.node_id)
+            # Os líderes elegem o supercoordenador pelo barramento multicast intergrupos
+            super_id = leader_a.super_coordinator_id or leader_b.super_coordinator_id
+            announced = [leader for leader in (leader_a, leader_b) if leader.node_id == super_id]
+            super_coordinator = announced[0] if announced else max(leader_a, leader_b, key=lambda x: x.node_id)
             print(f"\nEleição de Supercoordenador: Nó {super_coordinator.node_id} foi eleito.")
-            # Aqui viria a lógica de snapshot de Chandy-Lamport iniciada pelo supercoordenador
-            print("(Lógica de snapshot de Chandy-Lamport a ser implementada aqui)")
+            # O supercoordenador inicia o snapshot de Chandy-Lamport; o líder do outro grupo entra com o mesmo id
+            snapshot_id = super_coordinator.initiate_snapshot()
+            for leader in (leader_a, leader_b):
+                if leader is not super_coordinator:
+                    leader.initiate_snapshot(snapshot_id)
+            print(f"Snapshot global {snapshot_id} iniciado. Cada nó grava sua parte em '{SNAPSHOT_DIR}/'.")
+
+        # Cada líder distribui um lote de tarefas entre os membros vivos do seu grupo
+        for leader in (leader_a, leader_b):
+            if leader:
+                for i in range(20):
+                    leader.submit_task(f"task-{leader.group_id}-{i}")
+                print(f"Líder {leader.node_id} recebeu 20 tarefas para distribuir.")
 
         # Mantém a simulação rodando
         while True:
             time.sleep(10)
             print("\n--- Status Atual dos Nós ---")
             for node in nodes:
-                if node.is_alive():
+                if node.is_running:
                     print(node)
+                    if node.leader_id == node.node_id:
+                        print(f"  Escalonador: {node.scheduler.get_stats()}")
+            print(f"Temporizadores: {shared_wheel().get_stats()}")
             print("---------------------------\n")
 
 
@@ -100,10 +157,7 @@ def main():
         for node in nodes:
             node.join(timeout=2)
         
-        if pyro_ns_process:
-            pyro_ns_process.terminate()
-            pyro_ns_process.wait()
-        
+        stop_pyro_ns(pyro_ns_process)
         print("Simulação encerrada.")
 
 if __name__ == "__main__":
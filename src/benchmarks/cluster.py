@@ -0,0 +1,405 @@
+"""Bateria de desempenho de clusters reais no localhost, com saída em JSON para comparar versões.
+
+Mede, por grupo: tempo até o primeiro líder, tempo de failover depois de matar o processo do líder,
+CPU e bytes enviados por nó com o cluster ocioso (só a detecção de falhas), vazão e latência (p50/p99)
+de ExecuteTask/execute_task; e o custo de gerar e validar tokens.
+
+    python -m src.benchmarks.cluster --nodes-a 5 --nodes-b 5 --output baseline.json
+    python -m src.benchmarks.cluster --groups B --suites failover,tasks --baseline baseline.json
+
+Com --baseline, as métricas que pioraram mais que --tolerance são listadas em 'regressions' e o código de
+saída é 1. Cada medição roda em um processo novo: os nós escrevem o log no stdout, o resultado vai para um arquivo.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.benchmarks import startup
+from src.common.instrumentation import get_logger
+
+SUITES = ('startup', 'failover', 'tasks', 'tokens')
+_HIGHER_IS_BETTER = ('throughput',)
+_PID = re.compile(r'pid=(\d+)')
+_BYTES_SENT = re.compile(r'bytes_sent:(\d+)')
+
+def _topology(group_id, nodes):
+    """Topologia com só o grupo medido: o outro grupo não sobe nem aparece nos relógios vetoriais."""
+    from src.topology import generate_topology
+    group_a, group_b = generate_topology(nodes, nodes)
+    return (group_a, {}) if group_id == 'A' else ({}, group_b)
+
+def _rpc_error(group_id):
+    if group_id == 'A':
+        import grpc
+        return grpc.RpcError
+    import Pyro5.errors
+    return Pyro5.errors.PyroError
+
+# --- Uso de recursos por processo (Linux) ---
+def _cpu_seconds(pid):
+    """CPU (usuário + sistema) consumida pelo processo, em segundos; None sem /proc."""
+    try:
+        with open(f'/proc/{pid}/stat') as stat:
+            # O nome do processo pode ter espaços; os campos numéricos vêm depois do ')'
+            fields = stat.read().rpartition(')')[2].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+def _tcp_bytes_sent():
+    """Bytes enviados por processo nas conexões TCP estabelecidas, segundo o `ss`; None se indisponível.
+
+    Só conta sockets TCP: a fila de relatórios do lançador (um pipe) e o log não entram na conta.
+    """
+    try:
+        output = subprocess.run(['ss', '-tinpH', 'state', 'established'], capture_output=True, text=True,
+                                check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    sent = {}
+    pids = ()
+    for line in output.splitlines():
+        if not line[:1].isspace():
+            # Linha do socket, com os processos donos; a seguinte traz os contadores do TCP
+            pids = [int(pid) for pid in _PID.findall(line)]
+            continue
+        match = _BYTES_SENT.search(line)
+        for pid in pids if match else ():
+            sent[pid] = sent.get(pid, 0) + int(match.group(1))
+    return sent
+
+def _process_usage(pids):
+    """{node_id: (segundos de CPU, bytes enviados por TCP)} dos processos dados."""
+    sent = _tcp_bytes_sent()
+    return {node_id: (_cpu_seconds(pid), None if sent is None else sent.get(pid, 0)) for node_id, pid in pids.items()}
+
+def _rate(before, after, elapsed, scale=1):
+    if before is None or after is None:
+        return None
+    return (after - before) * scale / elapsed
+
+# --- Medições (cada uma roda em um processo filho) ---
+def _await_leader(launcher, node_ids, timeout, previous=None):
+    """Sonda os relatórios dos processos até os nós dados concordarem sobre um líder entre eles, diferente de `previous`.
+
+    Retorna (primeiro relatório com um líder novo, acordo, líder) em time.monotonic(); None no que não ocorreu no prazo.
+    """
+    first = None
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = launcher.poll_status()
+        now = time.monotonic()
+        leaders = {status[nid]['leader_id'] if nid in status else None for nid in node_ids}
+        if first is None and leaders - {None, previous}:
+            first = now
+        if len(leaders) == 1 and leaders <= set(node_ids):
+            return first, now, leaders.pop()
+        time.sleep(launcher.status_interval / 2)
+    return first, None, None
+
+def measure_failover(group_id, nodes, settle, idle_window, status_interval, timeout):
+    """Um processo por nó: uso de recursos com o cluster ocioso e failover depois de matar (SIGKILL) o líder.
+
+    A resolução do failover é o intervalo dos relatórios de estado (`status_interval`).
+    """
+    from src.launcher import ClusterLauncher
+    group_a, group_b = _topology(group_id, nodes)
+    node_ids = sorted(group_a or group_b)
+    launcher = ClusterLauncher(group_a, group_b, status_interval=status_interval)
+    launcher.start()
+    try:
+        workers = {assignment[0][1]: worker for assignment, worker in zip(launcher.assignments, launcher.workers)}
+        _, agreed, leader_id = _await_leader(launcher, node_ids, timeout)
+        if agreed is None:
+            raise RuntimeError(f"Group {group_id} did not agree on a leader within {timeout}s.")
+
+        # Depois da eleição só resta a detecção de falhas (heartbeats, sondagens do SWIM ou renovações do arrendamento)
+        time.sleep(settle)
+        pids = {nid: worker.pid for nid, worker in workers.items()}
+        sampled_at, before = time.monotonic(), _process_usage(pids)
+        time.sleep(idle_window)
+        elapsed, after = time.monotonic() - sampled_at, _process_usage(pids)
+        cpu = {nid: _rate(before[nid][0], after[nid][0], elapsed, scale=100) for nid in node_ids}
+        sent = {nid: _rate(before[nid][1], after[nid][1], elapsed) for nid in node_ids}
+
+        # Relatórios anteriores à queda não contam para o novo acordo
+        launcher.poll_status()
+        launcher.node_status.clear()
+        killed_at = time.monotonic()
+        workers[leader_id].kill()
+        survivors = [nid for nid in node_ids if nid != leader_id]
+        first, agreed, _ = _await_leader(launcher, survivors, timeout, previous=leader_id)
+    finally:
+        launcher.stop()
+
+    followers = [nid for nid in node_ids if nid != leader_id]
+    return {
+        'first_leader_seconds': None if first is None else first - killed_at,
+        'agreed_leader_seconds': None if agreed is None else agreed - killed_at,
+        'idle_leader_cpu_percent': cpu[leader_id],
+        'idle_follower_cpu_percent': _median([cpu[nid] for nid in followers]),
+        'idle_leader_bytes_sent_per_second': sent[leader_id],
+        'idle_follower_bytes_sent_per_second': _median([sent[nid] for nid in followers]),
+    }
+
+def measure_tasks(group_id, nodes, clients, duration, timeout):
+    """Nós em threads deste processo; `clients` threads do líder enviam tarefas aos seguidores durante `duration` s."""
+    import threading
+    from src.launcher import create_node, wait_for_leaders
+    group_a, group_b = _topology(group_id, nodes)
+    cluster = [create_node(group_id, node_id, group_a, group_b) for node_id in sorted(group_a or group_b)]
+    for node in cluster:
+        node.start()
+    try:
+        for node in cluster:
+            node.wait_ready(timeout)
+        leader_id = wait_for_leaders(cluster, timeout).get(group_id, {}).get('leader_id')
+        if leader_id is None:
+            raise RuntimeError(f"Group {group_id} did not agree on a leader within {timeout}s.")
+        sender = next(node for node in cluster if node.node_id == leader_id)
+        targets = [node.node_id for node in cluster if node is not sender] or [leader_id]
+        # Abre as conexões (e gera o token) fora da medição
+        for target_id in targets:
+            sender.send_task(target_id, 'warmup')
+
+        rpc_error = _rpc_error(group_id)
+        latencies = [[] for _ in range(clients)]
+        errors = [0] * clients
+        stop_at = time.perf_counter() + duration
+
+        def client(index):
+            samples = latencies[index]
+            sent = index
+            while True:
+                started = time.perf_counter()
+                if started >= stop_at:
+                    return
+                try:
+                    sender.send_task(targets[sent % len(targets)], f"bench-{index}-{sent}")
+                except rpc_error:
+                    errors[index] += 1
+                else:
+                    samples.append(time.perf_counter() - started)
+                sent += 1
+
+        threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        stoppers = [threading.Thread(target=node.stop) for node in cluster]
+        for stopper in stoppers:
+            stopper.start()
+        for stopper in stoppers:
+            stopper.join()
+
+    samples = sorted(sample for client_samples in latencies for sample in client_samples)
+    return {
+        'throughput': len(samples) / elapsed,
+        'p50_ms': _percentile(samples, 0.50) * 1000 if samples else None,
+        'p99_ms': _percentile(samples, 0.99) * 1000 if samples else None,
+        'errors': sum(errors),
+    }
+
+def measure_tokens(iterations):
+    """Custo médio (µs) de gerar um token, validá-lo na primeira vez (assinatura JWT) e de novo (cache)."""
+    from src.common.token_manager import TokenManager
+    TokenManager.generate_token(0) # Importa o jwt fora da medição
+    # Um node_id por token: tokens iguais (mesmo nó e mesmo segundo de expiração) cairiam no cache
+    started = time.perf_counter()
+    tokens = [TokenManager.generate_token(node_id) for node_id in range(1, iterations + 1)]
+    generated = time.perf_counter()
+    for token in tokens:
+        TokenManager.validate_token(token)
+    verified = time.perf_counter()
+    for token in tokens:
+        TokenManager.validate_token(token)
+    cached = time.perf_counter()
+    return {
+        'generate_us': (generated - started) * 1e6 / iterations,
+        'validate_uncached_us': (verified - generated) * 1e6 / iterations,
+        'validate_cached_us': (cached - verified) * 1e6 / iterations,
+    }
+
+def _percentile(ordered, fraction):
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+def _median(values):
+    values = [value for value in values if value is not None]
+    return statistics.median(values) if values else None
+
+# --- Processo coordenador ---
+def compare(metrics, baseline, tolerance):
+    """Métricas piores que as da linha de base por mais que `tolerance` (fração); vazão piora quando cai."""
+    regressions = []
+    for name, value in sorted(metrics.items()):
+        previous = baseline.get(name)
+        if value is None or previous is None:
+            continue
+        higher_is_better = name.rsplit('.', 1)[-1] in _HIGHER_IS_BETTER
+        if previous == 0:
+            worse = value < 0 if higher_is_better else value > 0
+            change = None
+        else:
+            change = (value - previous) / previous
+            worse = (-change if higher_is_better else change) > tolerance
+        if worse:
+            regressions.append({'metric': name, 'baseline': previous, 'value': value, 'change': change})
+    return regressions
+
+def _metadata(args, groups, suites):
+    from src import config
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'groups': groups,
+        'suites': suites,
+        'nodes': {'A': args.nodes_a, 'B': args.nodes_b},
+        'runs': args.runs,
+        'membership_protocol': config.MEMBERSHIP_PROTOCOL,
+        'lease_duration': config.LEASE_DURATION,
+        'heartbeat_interval': config.HEARTBEAT_INTERVAL,
+    }
+
+def _run_child(args, suite, group_id, directory):
+    """Executa uma medição em um processo novo; retorna (resultado, erro)."""
+    path = f"{directory}/{suite}-{group_id or 'all'}.json"
+    command = [sys.executable, '-m', 'src.benchmarks.cluster', '--child-suite', suite, '--child-output', path,
+               '--nodes-a', str(args.nodes_a), '--nodes-b', str(args.nodes_b), '--timeout', str(args.timeout),
+               '--settle', str(args.settle), '--idle-window', str(args.idle_window),
+               '--status-interval', str(args.status_interval), '--clients', str(args.clients),
+               '--task-duration', str(args.task_duration), '--token-iterations', str(args.token_iterations)]
+    if group_id:
+        command += ['--groups', group_id]
+    child = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if child.returncode != 0:
+        lines = child.stderr.strip().splitlines()
+        return None, lines[-1] if lines else f"exit code {child.returncode}"
+    with open(path) as output:
+        return json.load(output), None
+
+def _child_main(args):
+    group_id = args.groups.upper()
+    nodes = args.nodes_a if group_id == 'A' else args.nodes_b
+    if args.child_suite == 'failover':
+        result = measure_failover(group_id, nodes, args.settle, args.idle_window, args.status_interval, args.timeout)
+    elif args.child_suite == 'tasks':
+        result = measure_tasks(group_id, nodes, args.clients, args.task_duration, args.timeout)
+    else:
+        result = measure_tokens(args.token_iterations)
+    with open(args.child_output, 'w') as output:
+        json.dump(result, output)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Eleição, failover, custo da detecção de falhas, vazão de tarefas "
+                                                 "e tokens em clusters reais no localhost.")
+    parser.add_argument('--nodes-a', type=int, default=3)
+    parser.add_argument('--nodes-b', type=int, default=3)
+    parser.add_argument('--groups', default='AB', help="grupos medidos: A, B ou AB")
+    parser.add_argument('--suites', default=','.join(SUITES), help=f"medições, separadas por vírgula: {', '.join(SUITES)}")
+    parser.add_argument('--runs', type=int, default=3, help="repetições de cada medição (o resultado é a mediana)")
+    parser.add_argument('--timeout', type=float, default=30.0, help="prazo (segundos) para eleger um líder")
+    parser.add_argument('--settle', type=float, default=2.0, help="segundos entre a eleição e a janela ociosa")
+    parser.add_argument('--idle-window', type=float, default=5.0, help="segundos de medição com o cluster ocioso")
+    parser.add_argument('--status-interval', type=float, default=0.05,
+                        help="intervalo dos relatórios dos processos (resolução do failover)")
+    parser.add_argument('--clients', type=int, default=4, help="threads enviando tarefas")
+    parser.add_argument('--task-duration', type=float, default=5.0, help="segundos enviando tarefas")
+    parser.add_argument('--token-iterations', type=int, default=2000)
+    parser.add_argument('--output', help="também grava o resultado neste arquivo")
+    parser.add_argument('--baseline', help="resultado anterior (JSON) para detectar regressões")
+    parser.add_argument('--tolerance', type=float, default=0.3, help="piora relativa tolerada em relação à linha de base")
+    parser.add_argument('--child-suite', help=argparse.SUPPRESS)
+    parser.add_argument('--child-output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    groups = set(args.groups.upper())
+    if not groups or groups - {'A', 'B'}:
+        parser.error("--groups must be A, B or AB")
+    suites = {args.child_suite} if args.child_suite else set(args.suites.split(','))
+    unknown = suites - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+    # Só os grupos medidos sobem; o failover precisa de um seguidor para assumir, tokens não sobem cluster
+    minimum = 2 if 'failover' in suites else 1 if suites & {'startup', 'tasks'} else 0
+    for group_id in sorted(groups):
+        nodes = args.nodes_a if group_id == 'A' else args.nodes_b
+        if nodes < minimum:
+            parser.error(f"group {group_id} needs at least {minimum} node(s) for the selected suites")
+    return args
+
+def main():
+    args = parse_args()
+    if args.child_output:
+        _child_main(args)
+        return
+
+    # O stdout do coordenador é só o JSON: o log dele (início do Name Server etc.) fica restrito aos avisos
+    get_logger('benchmarks')
+    logging.getLogger('simula').setLevel(logging.WARNING)
+    groups = sorted(set(args.groups.upper()))
+    suites = [suite for suite in SUITES if suite in args.suites.split(',')]
+    report = {'meta': _metadata(args, groups, suites), 'metrics': {}, 'runs': {}, 'failures': {}}
+    runs = report['runs']
+
+    if 'startup' in suites:
+        try:
+            runs['startup'] = startup.run(args.nodes_a, args.nodes_b, groups, args.runs, args.timeout)
+        except subprocess.CalledProcessError as e:
+            report['failures']['startup'] = str(e)
+
+    from src.launcher import start_pyro_ns, stop_pyro_ns
+    jobs = [(suite, group_id) for suite in ('failover', 'tasks') if suite in suites for group_id in groups]
+    if 'tokens' in suites:
+        jobs.append(('tokens', None))
+    pyro_ns_process = start_pyro_ns() if 'B' in groups and any(group_id == 'B' for _, group_id in jobs) else None
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for suite, group_id in jobs:
+                key = f"{suite}.{group_id}" if group_id else suite
+                for _ in range(args.runs):
+                    result, error = _run_child(args, suite, group_id, directory)
+                    if error is not None:
+                        report['failures'][key] = error
+                        break
+                    runs.setdefault(key, []).append(result)
+    finally:
+        stop_pyro_ns(pyro_ns_process)
+
+    for key, results in runs.items():
+        for name in results[0]:
+            report['metrics'][f"{key}.{name}"] = _median([result[name] for result in results])
+
+    if args.baseline:
+        with open(args.baseline) as source:
+            baseline = json.load(source)
+        report['baseline'] = baseline['meta'].get('commit')
+        report['regressions'] = compare(report['metrics'], baseline['metrics'], args.tolerance)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as destination:
+            destination.write(output + '\n')
+    if report.get('regressions'):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Tempo de inicialização de um cluster real: importações, nós atendendo e primeiro líder de cada grupo.
+
+Cada execução roda em um processo novo, para que as importações (grpc, Pyro5, jwt) sejam medidas a frio:
+
+    python -m src.benchmarks.startup --nodes-a 5 --nodes-b 5 --runs 5
+    python -m src.benchmarks.startup --groups B --nodes-b 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+def measure(nodes_a, nodes_b, groups, timeout):
+    """Sobe os nós dos grupos pedidos neste processo e retorna os instantes (segundos desde o início) de cada fase."""
+    started = time.monotonic()
+    from src.topology import generate_topology
+    from src.launcher import create_node, wait_for_leaders
+    if 'A' in groups:
+        import src.group_a.node_a
+    if 'B' in groups:
+        import src.group_b.node_b
+    imported = time.monotonic()
+
+    group_a, group_b = generate_topology(nodes_a, nodes_b)
+    nodes = [create_node(group_id, node_id, group_a, group_b)
+             for group_id, group in (('A', group_a), ('B', group_b)) if group_id in groups for node_id in group]
+    for node in nodes:
+        node.start()
+    for node in nodes:
+        node.wait_ready(timeout)
+    ready = time.monotonic()
+    leaders = wait_for_leaders(nodes, timeout)
+
+    result = {'import': imported - started, 'ready': ready - started}
+    for group_id in groups:
+        leader = leaders.get(group_id, {})
+        result[f'first_leader_{group_id}'] = leader['first_leader_at'] - started if 'first_leader_at' in leader else None
+        result[f'agreed_leader_{group_id}'] = leader['agreed_at'] - started if 'agreed_at' in leader else None
+
+    # Os nós param em paralelo; o Name Server não pode guardar URIs de nós mortos para a próxima execução
+    stoppers = [threading.Thread(target=node.stop) for node in nodes]
+    for stopper in stoppers:
+        stopper.start()
+    for stopper in stoppers:
+        stopper.join()
+    return result
+
+def _summary(results):
+    summary = {}
+    for key in results[0]:
+        values = [result[key] for result in results if result[key] is not None]
+        summary[key] = {
+            'median': statistics.median(values) if values else None,
+            'min': min(values) if values else None,
+            'max': max(values) if values else None,
+            'missing': len(results) - len(values),
+        }
+    return summary
+
+def run(nodes_a, nodes_b, groups, runs, timeout):
+    """Executa `runs` medições, cada uma em um processo novo, e retorna a lista de resultados."""
+    from src.launcher import start_pyro_ns, stop_pyro_ns
+    pyro_ns_process = start_pyro_ns() if 'B' in groups else None
+    command = [sys.executable, '-m', 'src.benchmarks.startup', '--nodes-a', str(nodes_a),
+               '--nodes-b', str(nodes_b), '--groups', ''.join(groups), '--timeout', str(timeout)]
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for index in range(runs):
+                path = f"{directory}/run-{index}.json"
+                subprocess.run(command + ['--child-output', path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               check=True)
+                with open(path) as output:
+                    results.append(json.load(output))
+    finally:
+        stop_pyro_ns(pyro_ns_process)
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Tempo até o primeiro líder, com cada execução em um processo novo.")
+    parser.add_argument('--nodes-a', type=int, default=3)
+    parser.add_argument('--nodes-b', type=int, default=3)
+    parser.add_argument('--groups', default='AB', help="grupos iniciados: A, B ou AB")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=30.0, help="prazo (segundos) de cada fase")
+    parser.add_argument('--child-output', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    groups = sorted(set(args.groups.upper()))
+    if args.child_output:
+        # O resultado vai para um arquivo: o stdout do processo filho é do log dos nós
+        result = measure(args.nodes_a, args.nodes_b, groups, args.timeout)
+        with open(args.child_output, 'w') as output:
+            json.dump(result, output)
+        return
+
+    results = run(args.nodes_a, args.nodes_b, groups, args.runs, args.timeout)
+    print(json.dumps({'runs': results, 'summary': _summary(results)}, indent=2))
+
+if __name__ == "__main__":
+    main()
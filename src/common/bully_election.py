@@ -0,0 +1,172 @@
+import threading
+import time
+
+from src.common.timers import call_later
+from src.common.instrumentation import histogram
+
+_DURATION = histogram('simula_election_duration_seconds', "Duração das eleições, do início até o líder ser conhecido.",
+                      algorithm='bully')
+
+# Fases da eleição
+IDLE = 'IDLE'
+ELECTING = 'ELECTING'
+WAITING_COORDINATOR = 'WAITING_COORDINATOR'
+
+class BullyElection:
+    """Motor do algoritmo Bully, independente do transporte.
+
+    `broadcast(targets, message_type, timeout, callback)` envia 'ELECTION' ou 'COORDINATOR' a todos os
+    alvos em paralelo e chama callback(responders) uma única vez, com os nós que responderam OK
+    (ou confirmaram o coordenador), assim que todos respondem ou o prazo expira.
+    """
+
+    def __init__(self, node_id, peers, broadcast, on_leader=None, election_timeout=1.0,
+                 coordinator_timeout=3.0, schedule=call_later, clock=time.monotonic):
+        self.node_id = node_id
+        self.peers = peers
+        self.broadcast = broadcast
+        self.on_leader = on_leader
+        self.election_timeout = election_timeout
+        self.coordinator_timeout = coordinator_timeout
+        self.schedule = schedule
+        self.clock = clock
+        self.state = IDLE
+        self.leader_id = None
+        self.last_election = None
+        self.stats = {'elections': 0, 'suppressed': 0, 'restarts': 0, 'messages': 0}
+        self._epoch = 0
+        self._started_at = None
+        self._leader_at = None
+        self._messages = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_progress(self):
+        return self.state != IDLE
+
+    def start(self):
+        """Inicia uma eleição; retorna False se já houver uma em andamento neste nó."""
+        with self._lock:
+            if self.state != IDLE:
+                self.stats['suppressed'] += 1
+                return False
+            self.state = ELECTING
+            self._epoch += 1
+            epoch = self._epoch
+            if self._started_at is None:
+                self._started_at = self.clock()
+                self._messages = 0
+                self.stats['elections'] += 1
+            higher = sorted(nid for nid in self.peers() if nid > self.node_id)
+            self._count(len(higher))
+
+        if not higher:
+            self._become_leader(epoch)
+        else:
+            self.broadcast(higher, 'ELECTION', self.election_timeout,
+                           lambda responders: self._on_election_replies(epoch, responders))
+        return True
+
+    # --- Mensagens recebidas ---
+    def on_election(self, sender_id):
+        """Trata um ELECTION; retorna True se este nó deve responder OK ao remetente."""
+        if sender_id >= self.node_id:
+            return False
+        with self._lock:
+            settled = (self.state == IDLE and self.leader_id is not None and self.leader_id >= self.node_id
+                       and self.clock() - self._leader_at < self.coordinator_timeout
+                       and (self.leader_id == self.node_id or self.leader_id in self.peers()))
+            reannounce = settled and self.leader_id == self.node_id
+            if settled:
+                self.stats['suppressed'] += 1
+            if reannounce:
+                self._count(1)
+        if settled:
+            # Eleição recém-concluída com um líder vivo acima deste nó: o ELECTION é um atraso da mesma rodada.
+            # Só o líder reanuncia, e apenas ao remetente; recomeçar aqui alimentaria uma cascata de eleições.
+            if reannounce:
+                self.broadcast([sender_id], 'COORDINATOR', self.election_timeout, lambda responders: None)
+            return True
+        # Um nó maior assume a eleição; start() suprime eleições concorrentes neste nó
+        self.start()
+        return True
+
+    def on_ok(self, sender_id):
+        with self._lock:
+            if self.state != ELECTING:
+                return
+            self._count(1)
+            self._wait_for_coordinator(self._epoch)
+
+    def on_coordinator(self, sender_id):
+        with self._lock:
+            self._epoch += 1 # Invalida respostas e prazos pendentes da eleição local
+            self.state = IDLE
+            self.leader_id = sender_id
+            self._leader_at = self.clock()
+            self._finish(sender_id)
+        if self.on_leader:
+            self.on_leader(sender_id)
+        if sender_id < self.node_id:
+            # Um nó menor se declarou líder sem saber deste: o Bully exige uma nova eleição
+            self.start()
+
+    # --- Fases internas ---
+    def _on_election_replies(self, epoch, responders):
+        with self._lock:
+            if epoch != self._epoch or self.state != ELECTING:
+                return
+            self._count(len(responders))
+            if responders:
+                self._wait_for_coordinator(epoch)
+                return
+        self._become_leader(epoch)
+
+    def _wait_for_coordinator(self, epoch):
+        self.state = WAITING_COORDINATOR
+        self.schedule(self.coordinator_timeout, lambda: self._on_coordinator_timeout(epoch))
+
+    def _on_coordinator_timeout(self, epoch):
+        with self._lock:
+            if epoch != self._epoch or self.state != WAITING_COORDINATOR:
+                return
+            # Quem respondeu OK falhou antes de anunciar: recomeça a eleição
+            self.state = IDLE
+            self.stats['restarts'] += 1
+        self.start()
+
+    def _become_leader(self, epoch):
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            self.state = IDLE
+            self.leader_id = self.node_id
+            self._leader_at = self.clock()
+            others = [nid for nid in self.peers() if nid != self.node_id]
+            self._count(len(others))
+        if self.on_leader:
+            self.on_leader(self.node_id)
+        self.broadcast(others, 'COORDINATOR', self.election_timeout,
+                       lambda responders: self._on_announced(epoch, responders))
+
+    def _on_announced(self, epoch, responders):
+        with self._lock:
+            self._count(len(responders))
+            if epoch == self._epoch:
+                self._finish(self.node_id)
+
+    def _count(self, messages):
+        self._messages += messages
+        self.stats['messages'] += messages
+
+    def _finish(self, leader_id):
+        if self._started_at is None:
+            return
+        duration = self.clock() - self._started_at
+        _DURATION.observe(duration)
+        self.last_election = {
+            'leader': leader_id,
+            'duration': duration,
+            'messages': self._messages,
+        }
+        self._started_at = None
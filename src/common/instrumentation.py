@@ -0,0 +1,281 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+from src.config import LOG_LEVEL, TRACE_SAMPLE_RATE, TRACE_BUFFER
+
+# --- Métricas ---
+class Counter:
+    """Contador monotônico com uma célula por thread: incrementar não disputa lock com as outras threads."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._cells = []
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        cell = getattr(self._local, 'cell', None)
+        if cell is None:
+            cell = self._local.cell = [0]
+            with self._lock:
+                self._cells.append(cell)
+        cell[0] += amount
+
+    def value(self):
+        with self._lock:
+            return sum(cell[0] for cell in self._cells)
+
+# Histograma log-linear no estilo HDR: 16 subfaixas por potência de dois, em microssegundos (erro relativo <= 1/16)
+_SUB_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BITS
+_MAX_SHIFT = 32
+_BUCKETS = (_MAX_SHIFT + 2) * _SUB_BUCKETS
+# Limites exportados para o Prometheus: as potências de dois de 32 us a ~134 s, alinhadas às subfaixas
+_EXPORT_BOUNDS = [1 << k for k in range(_SUB_BITS + 1, 28)]
+
+def _bucket(micros):
+    if micros < 2 * _SUB_BUCKETS:
+        return micros
+    shift = micros.bit_length() - (_SUB_BITS + 1)
+    return min((shift + 1) * _SUB_BUCKETS + (micros >> shift) - _SUB_BUCKETS, _BUCKETS - 1)
+
+def _bucket_upper(index):
+    """Maior valor (em microssegundos, exclusivo) coberto pela subfaixa."""
+    if index < 2 * _SUB_BUCKETS:
+        return index + 1
+    shift = index // _SUB_BUCKETS - 1
+    return (_SUB_BUCKETS + index % _SUB_BUCKETS + 1) << shift
+
+class Histogram:
+    """Histograma de latências (segundos) com células por thread, como o Counter."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._cells = []
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        cell = getattr(self._local, 'cell', None)
+        if cell is None:
+            cell = self._local.cell = [[0] * _BUCKETS, 0.0]
+            with self._lock:
+                self._cells.append(cell)
+        cell[0][_bucket(max(int(seconds * 1e6), 0))] += 1
+        cell[1] += seconds
+
+    def _merged(self):
+        counts = [0] * _BUCKETS
+        total = 0.0
+        with self._lock:
+            cells = list(self._cells)
+        for cell_counts, cell_sum in cells:
+            for index, count in enumerate(cell_counts):
+                if count:
+                    counts[index] += count
+            total += cell_sum
+        return counts, total
+
+    def snapshot(self):
+        """Retorna count, sum e os percentis 50/90/99 (limite superior da subfaixa, em segundos)."""
+        counts, total = self._merged()
+        observed = sum(counts)
+        result = {'count': observed, 'sum': total}
+        if observed:
+            for name, quantile in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+                rank, seen = quantile * observed, 0
+                for index, count in enumerate(counts):
+                    seen += count
+                    if count and seen >= rank:
+                        result[name] = _bucket_upper(index) / 1e6
+                        break
+        return result
+
+    def _export(self):
+        counts, total = self._merged()
+        cumulative, index, buckets = 0, 0, []
+        for bound in _EXPORT_BOUNDS:
+            while index < _BUCKETS and _bucket_upper(index) <= bound:
+                cumulative += counts[index]
+                index += 1
+            buckets.append((bound / 1e6, cumulative))
+        return buckets, sum(counts), total
+
+class Registry:
+    """Métricas do processo, identificadas por nome e rótulos; o mesmo par devolve a mesma instância."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text, **labels):
+        return self._get(name, help_text, labels, Counter)
+
+    def histogram(self, name, help_text, **labels):
+        return self._get(name, help_text, labels, Histogram)
+
+    def _get(self, name, help_text, labels, kind):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = kind()
+                    self._help[name] = help_text
+        return metric
+
+    def render(self):
+        """Todas as métricas no formato de texto do Prometheus."""
+        with self._lock:
+            metrics = sorted(self._metrics.items(), key=lambda item: item[0])
+        lines = []
+        current = None
+        for (name, labels), metric in metrics:
+            kind = 'counter' if isinstance(metric, Counter) else 'histogram'
+            if name != current:
+                current = name
+                lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+            if kind == 'counter':
+                lines.append(f"{name}{_labels(labels)} {metric.value()}")
+                continue
+            buckets, count, total = metric._export()
+            for bound, cumulative in buckets:
+                lines.append(f"{name}_bucket{_labels(labels + (('le', repr(bound)),))} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {total}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+REGISTRY = Registry()
+
+def counter(name, help_text, **labels):
+    return REGISTRY.counter(name, help_text, **labels)
+
+def histogram(name, help_text, **labels):
+    return REGISTRY.histogram(name, help_text, **labels)
+
+# --- Rastreamento amostrado ---
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, key, value):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+_spans = deque(maxlen=TRACE_BUFFER)
+_sample_rate = TRACE_SAMPLE_RATE
+
+class Span:
+    """Trecho cronometrado com etiquetas; o tempo de Lamport ordena trechos de nós diferentes."""
+
+    __slots__ = ('name', 'tags', 'started', 'wall')
+
+    def __init__(self, name, tags):
+        self.name = name
+        self.tags = tags
+        self.started = time.perf_counter()
+        self.wall = time.time()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record = {'name': self.name, 'start': self.wall, 'duration': time.perf_counter() - self.started, **self.tags}
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        _spans.append(record)
+        return False
+
+    def set(self, key, value):
+        self.tags[key] = value
+
+def span(name, lamport_time=None, **tags):
+    """Abre um trecho amostrado com probabilidade TRACE_SAMPLE_RATE; fora da amostra, não custa nada além do sorteio."""
+    if _sample_rate <= 0.0 or random.random() >= _sample_rate:
+        return _NOOP_SPAN
+    tags['lamport_time'] = lamport_time
+    return Span(name, tags)
+
+def set_trace_sample_rate(rate):
+    global _sample_rate
+    _sample_rate = rate
+
+def recent_spans():
+    return list(_spans)
+
+# --- Log ---
+_log_queue = queue.SimpleQueue()
+_log_listener = None
+_log_lock = threading.Lock()
+
+def get_logger(name):
+    """Logger com nível configurável; as mensagens passam por uma fila e são escritas por uma única thread."""
+    global _log_listener
+    with _log_lock:
+        if _log_listener is None:
+            root = logging.getLogger('simula')
+            root.setLevel(LOG_LEVEL)
+            root.propagate = False
+            root.addHandler(logging.handlers.QueueHandler(_log_queue))
+            output = logging.StreamHandler(sys.stdout)
+            output.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+            _log_listener = logging.handlers.QueueListener(_log_queue, output)
+            _log_listener.start()
+            atexit.register(_log_listener.stop) # Escreve o que ainda estiver na fila
+    return logging.getLogger(f'simula.{name}')
+
+# --- Endpoint HTTP ---
+def _metrics_handler():
+    # http.server e json custam dezenas de ms de importação; só os processos que publicam métricas pagam por eles
+    import json
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                body, content_type = REGISTRY.render().encode(), 'text/plain; version=0.0.4'
+            elif self.path == '/traces':
+                body, content_type = "".join(json.dumps(record) + "\n" for record in recent_spans()).encode(), 'application/x-ndjson'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass # Cada coleta do Prometheus não deve virar uma linha de log
+
+    return MetricsHandler
+
+def start_metrics_server(port, host='127.0.0.1'):
+    """Publica /metrics (Prometheus) e /traces (JSON por linha) em host:port; retorna o servidor ou None."""
+    from http.server import ThreadingHTTPServer
+    try:
+        server = ThreadingHTTPServer((host, port), _metrics_handler())
+    except OSError as e:
+        get_logger('metrics').warning("Metrics endpoint unavailable on %s:%s: %s", host, port, e)
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    get_logger('metrics').info("Metrics at http://%s:%s/metrics", host, port)
+    return server
@@ -1,5 +1,9 @@
 import threading
 
+from src.common.instrumentation import counter
+
+_UPDATES = counter('simula_lamport_updates_total', "Tempos de Lamport recebidos e incorporados ao relógio local.")
+
 class LamportClock:
     def __init__(self):
         self.time = 0
@@ -11,10 +15,25 @@ class LamportClock:
             return self.time
 
     def update(self, received_time):
+        _UPDATES.inc()
         with self._lock:
             self.time = max(self.time, received_time) + 1
             return self.time
 
+    def update_and_increment(self, received_time):
+        """Recebe uma mensagem e já carimba a resposta, adquirindo o lock uma única vez."""
+        _UPDATES.inc()
+        with self._lock:
+            self.time = max(self.time, received_time) + 2
+            return self.time
+
+    def merge(self, received_time):
+        """Incorpora um tempo vindo do envelope da mensagem (metadados), sem contar um novo evento."""
+        with self._lock:
+            if received_time > self.time:
+                self.time = received_time
+            return self.time
+
     def get_time(self):
         with self._lock:
             return self.time
@@ -0,0 +1,153 @@
+import threading
+import time
+
+class LeaderLease:
+    """Arrendamento (lease) do líder, independente do transporte.
+
+    Cada seguidor renova o arrendamento com o líder a cada `renew_interval` segundos por
+    `renew(leader_id, timeout, callback)`, onde callback(ok, granted) informa se o líder respondeu e se
+    concedeu a renovação. O arrendamento vale `duration` segundos a partir do envio da última renovação
+    concedida; enquanto vale, o líder é considerado vivo e suspeitas não devem iniciar eleições.
+    Ao expirar, `on_expired(leader_id, refused)` é chamado uma vez; refused=True indica que o nó respondeu,
+    mas recusou a renovação por não ser mais o líder.
+
+    No líder, `grant(follower_id)` registra as renovações; seguidores que ficam `duration` segundos sem
+    renovar são entregues a `on_follower_expired(follower_id)`. Com duration=0 os arrendamentos ficam desligados.
+
+    O tráfego da aplicação entre líder e seguidor (`observe`) faz as vezes da renovação: o seguidor só
+    renova explicitamente se não trocou mensagens com resposta com o líder no último meio intervalo.
+    """
+
+    def __init__(self, node_id, renew, on_expired=None, on_follower_expired=None, duration=5.0, renew_interval=1.0,
+                 renew_timeout=0.5, clock=time.monotonic):
+        self.node_id = node_id
+        self.renew = renew
+        self.on_expired = on_expired
+        self.on_follower_expired = on_follower_expired
+        self.duration = duration
+        self.renew_interval = renew_interval
+        self.renew_timeout = renew_timeout
+        self.clock = clock
+        self.leader_id = None
+        self.stats = {'renewals': 0, 'granted': 0, 'refused': 0, 'failed': 0, 'skipped': 0, 'expirations': 0,
+                      'follower_expirations': 0}
+        self._expires_at = 0.0
+        self._expired = False
+        self._renewing = False
+        self._exchanged_at = None
+        self._epoch = 0
+        self._followers = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.duration > 0
+
+    def follow(self, leader_id, followers=()):
+        """Passa a seguir `leader_id`; no próprio líder, `followers` recebem um prazo inicial para a primeira renovação."""
+        now = self.clock()
+        with self._lock:
+            self._epoch += 1
+            self.leader_id = leader_id
+            self._renewing = False
+            self._expired = False
+            self._exchanged_at = None
+            # O anúncio do coordenador é uma prova de vida recente: vale como a primeira concessão
+            self._expires_at = now + self.duration
+            self._followers = {nid: now for nid in followers if nid != self.node_id} if leader_id == self.node_id else {}
+
+    def holds(self):
+        """True se este nó é seguidor e seu arrendamento com o líder ainda vale."""
+        return (self.enabled and self.leader_id is not None and self.leader_id != self.node_id
+                and self.clock() < self._expires_at)
+
+    def grant(self, follower_id):
+        """Trata a renovação de um seguidor; retorna False se este nó não é o líder."""
+        with self._lock:
+            if self.leader_id != self.node_id:
+                return False
+            self._followers[follower_id] = self.clock()
+            return True
+
+    def observe(self, node_id, two_way=True):
+        """Registra tráfego da aplicação com `node_id`: uma chamada recebida dele ou uma resposta sua.
+
+        No líder, vale como renovação do seguidor. No seguidor, qualquer mensagem do líder prova que ele está
+        vivo e estende o arrendamento; só uma troca com resposta (two_way) dispensa a próxima renovação, pois
+        numa mensagem oneway o líder não fica sabendo deste nó.
+        """
+        if not self.enabled:
+            return
+        now = self.clock()
+        with self._lock:
+            if self.leader_id == self.node_id:
+                if node_id in self._followers:
+                    self._followers[node_id] = now
+            elif node_id == self.leader_id and self.leader_id is not None and not self._expired:
+                if not self._renewing:
+                    # Com uma renovação em trânsito, a concessão estende o prazo a partir do envio, mais cedo que `now`
+                    self._expires_at = max(self._expires_at, now + self.duration)
+                if two_way:
+                    self._exchanged_at = now
+
+    def tick(self):
+        """Executa um intervalo: o seguidor renova ou detecta a expiração; o líder recolhe seguidores expirados."""
+        if not self.enabled:
+            return
+        now = self.clock()
+        expired = None
+        lapsed = []
+        renew = None
+        with self._lock:
+            if self.leader_id is None:
+                return
+            if self.leader_id == self.node_id:
+                lapsed = [nid for nid, renewed_at in self._followers.items() if now - renewed_at > self.duration]
+                for nid in lapsed:
+                    del self._followers[nid]
+                self.stats['follower_expirations'] += len(lapsed)
+            elif self._expired:
+                return # Sem líder válido: espera a eleição trazer um novo (follow)
+            elif now >= self._expires_at:
+                expired = self._expire()
+            elif self._exchanged_at is not None and now - self._exchanged_at < self.renew_interval / 2:
+                # Meio intervalo: a resposta da própria renovação anterior não adia a próxima
+                self.stats['skipped'] += 1
+            elif not self._renewing:
+                self._renewing = True
+                self.stats['renewals'] += 1
+                renew = (self.leader_id, self._epoch, now)
+        for nid in lapsed:
+            if self.on_follower_expired:
+                self.on_follower_expired(nid)
+        if expired is not None and self.on_expired:
+            self.on_expired(expired, False)
+        if renew is not None:
+            leader_id, epoch, sent_at = renew
+            self.renew(leader_id, self.renew_timeout, lambda ok, granted: self._on_renewed(epoch, sent_at, ok, granted))
+
+    def _on_renewed(self, epoch, sent_at, ok, granted):
+        expired = None
+        with self._lock:
+            if epoch != self._epoch:
+                return # O líder mudou enquanto a renovação estava em trânsito
+            self._renewing = False
+            if not ok:
+                self.stats['failed'] += 1
+            elif granted:
+                self.stats['granted'] += 1
+                # Medido a partir do envio: o líder estava vivo pelo menos até ali
+                self._expires_at = max(self._expires_at, sent_at + self.duration)
+            else:
+                # O nó que este seguidor toma por líder diz que não é: não há por que esperar o prazo
+                self.stats['refused'] += 1
+                if not self._expired:
+                    expired = self._expire()
+        if expired is not None and self.on_expired:
+            self.on_expired(expired, True)
+
+    def _expire(self):
+        self._expired = True
+        self._expires_at = 0.0
+        self.stats['expirations'] += 1
+        return self.leader_id
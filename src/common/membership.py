@@ -0,0 +1,391 @@
+import math
+import random
+import threading
+import time
+from collections import deque
+
+# Estados de um membro (mesma ordem do enum MemberUpdate.Status em service.proto)
+ALIVE = 0
+SUSPECT = 1
+DEAD = 2
+
+class PhiAccrualDetector:
+    """Detector phi-accrual: converte o tempo desde o último sinal de vida em um nível de suspeita adaptativo."""
+
+    def __init__(self, window_size=100, min_std_dev=0.1, acceptable_pause=0.0, bootstrap_interval=1.0):
+        self.window_size = window_size
+        self.min_std_dev = min_std_dev
+        self.acceptable_pause = acceptable_pause
+        self.bootstrap_interval = bootstrap_interval
+        self._windows = {}
+        self._sums = {}
+        self._last = {}
+
+    def heartbeat(self, node_id, now):
+        """Registra um sinal de vida do nó no instante `now`."""
+        last = self._last.get(node_id)
+        self._last[node_id] = now
+        if last is None:
+            return
+        interval = now - last
+        window = self._windows.get(node_id)
+        if window is None:
+            window = self._windows[node_id] = deque()
+            self._sums[node_id] = [0.0, 0.0]
+        sums = self._sums[node_id]
+        # Somas acumuladas mantêm média e variância em O(1) por amostra
+        if len(window) == self.window_size:
+            old = window.popleft()
+            sums[0] -= old
+            sums[1] -= old * old
+        window.append(interval)
+        sums[0] += interval
+        sums[1] += interval * interval
+
+    def phi(self, node_id, now):
+        """Retorna -log10 da probabilidade de um sinal de vida ainda chegar após o tempo decorrido."""
+        last = self._last.get(node_id)
+        if last is None:
+            return 0.0
+        window = self._windows.get(node_id)
+        if window:
+            count = len(window)
+            mean = self._sums[node_id][0] / count
+            variance = max(self._sums[node_id][1] / count - mean * mean, 0.0)
+            std_dev = max(math.sqrt(variance), self.min_std_dev)
+        else:
+            mean = self.bootstrap_interval
+            std_dev = max(mean / 4, self.min_std_dev)
+        y = (now - last - mean - self.acceptable_pause) / std_dev
+        p_later = 0.5 * math.erfc(y / math.sqrt(2))
+        if p_later <= 0.0:
+            return float('inf')
+        return -math.log10(p_later)
+
+    def elapsed(self, node_id, now):
+        """Segundos desde o último sinal de vida do nó, ou None se nunca houve um."""
+        last = self._last.get(node_id)
+        return None if last is None else now - last
+
+    def remove(self, node_id):
+        self._windows.pop(node_id, None)
+        self._sums.pop(node_id, None)
+        self._last.pop(node_id, None)
+
+class SwimMembership:
+    """Membership no estilo SWIM: sondagem aleatória com pings indiretos, disseminação por piggyback
+    e suspeita confirmada pelo detector phi-accrual.
+
+    Mensagens da aplicação também contam como sinal de vida (`observe`): um membro ouvido há menos de um
+    período não é sondado, a menos que haja atualizações a disseminar por piggyback.
+
+    O transporte é injetado por duas funções assíncronas:
+      ping(target, updates, timeout, callback) e ping_req(helper, target, updates, timeout, callback),
+    onde callback(ok, updates) recebe se o alvo respondeu e as atualizações devolvidas.
+    """
+
+    def __init__(self, node_id, peer_ids, ping, ping_req, on_dead=None, on_alive=None,
+                 protocol_period=1.0, ack_timeout=0.5, indirect_probes=2, max_piggyback=6,
+                 retransmit_mult=3, phi_threshold=8.0, reconnect_periods=10, clock=time.monotonic, rng=None):
+        self.node_id = node_id
+        self.ping = ping
+        self.ping_req = ping_req
+        self.on_dead = on_dead
+        self.on_alive = on_alive
+        self.ack_timeout = ack_timeout
+        self.indirect_probes = indirect_probes
+        self.max_piggyback = max_piggyback
+        self.retransmit_mult = retransmit_mult
+        self.phi_threshold = phi_threshold
+        self.reconnect_periods = reconnect_periods
+        self.protocol_period = protocol_period
+        # Tempo mínimo de suspeita para que a refutação do membro tenha chance de se espalhar
+        self.min_suspicion = protocol_period * max(2, math.ceil(math.log2(len(peer_ids) + 1)))
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.incarnation = 0
+        self.detector = PhiAccrualDetector(acceptable_pause=protocol_period, bootstrap_interval=protocol_period * max(len(peer_ids), 1))
+        self._members = {nid: [ALIVE, 0] for nid in peer_ids if nid != node_id}
+        self._updates = {}
+        self._suspected_at = {}
+        self._probe_order = []
+        self._periods = 0
+        self._lock = threading.Lock()
+        self.stats = {'probes': 0, 'indirect_probes': 0, 'suspicions': 0, 'failures': 0, 'refutations': 0, 'reconnects': 0,
+                      'skipped': 0}
+        now = self.clock()
+        for nid in self._members:
+            self.detector.heartbeat(nid, now)
+
+    # --- Visão de membros ---
+    def alive_members(self):
+        with self._lock:
+            return [nid for nid, (status, _) in self._members.items() if status != DEAD]
+
+    def status(self, node_id):
+        with self._lock:
+            member = self._members.get(node_id)
+            return member[0] if member else None
+
+    # --- Protocolo ---
+    def probe(self):
+        """Executa um período do protocolo: sonda um membro escolhido em round-robin aleatório.
+
+        A cada `reconnect_periods` períodos também tenta um membro morto, para que os dois lados de uma
+        partição reparada voltem a se enxergar.
+        """
+        with self._lock:
+            self._periods += 1
+            target = self._next_target()
+            if target is not None and not self._updates and self._heard_recently(target, self.clock()):
+                # O tráfego da aplicação já mostrou que o membro está vivo e não há boatos a espalhar
+                self.stats['skipped'] += 1
+                target = None
+            revisit = self._reconnect_target()
+            if target is None and revisit is None:
+                return
+            updates = self._collect_updates()
+            if target is not None:
+                self.stats['probes'] += 1
+            if revisit is not None:
+                self.stats['reconnects'] += 1
+        if target is not None:
+            self.ping(target, updates, self.ack_timeout, lambda ok, received: self._on_ack(target, ok, received))
+        if revisit is not None:
+            self.ping(revisit, updates, self.ack_timeout, lambda ok, received: self._on_reconnect(revisit, ok, received))
+
+    def check(self):
+        """Declara mortos os membros suspeitos cujo nível phi ultrapassou o limiar."""
+        now = self.clock()
+        failed = []
+        with self._lock:
+            for nid, member in self._members.items():
+                if member[0] != SUSPECT or now - self._suspected_at.get(nid, now) < self.min_suspicion:
+                    continue
+                if self.detector.phi(nid, now) >= self.phi_threshold:
+                    member[0] = DEAD
+                    self._enqueue(nid, DEAD, member[1])
+                    self.stats['failures'] += 1
+                    failed.append(nid)
+        for nid in failed:
+            if self.on_dead:
+                self.on_dead(nid)
+
+    def reconnect(self):
+        """A cada `reconnect_periods` chamadas, tenta um membro morto; usado quando as sondagens do SWIM estão desligadas."""
+        with self._lock:
+            self._periods += 1
+            revisit = self._reconnect_target()
+            if revisit is None:
+                return
+            updates = self._collect_updates()
+            self.stats['reconnects'] += 1
+        self.ping(revisit, updates, self.ack_timeout, lambda ok, received: self._on_reconnect(revisit, ok, received))
+
+    def declare_dead(self, node_id):
+        """Declara o membro morto por decisão de outro detector (ex.: arrendamento expirado) e dissemina a notícia.
+
+        Retorna False se o membro já estava morto ou é desconhecido; nesse caso on_dead não é chamado.
+        """
+        with self._lock:
+            member = self._members.get(node_id)
+            if member is None or member[0] == DEAD:
+                return False
+            member[0] = DEAD
+            self._suspected_at.pop(node_id, None)
+            self._enqueue(node_id, DEAD, member[1])
+            self.stats['failures'] += 1
+        if self.on_dead:
+            self.on_dead(node_id)
+        return True
+
+    def record_reply(self, node_id, updates):
+        """Processa a resposta de `node_id` a uma mensagem deste nó fora das sondagens (ex.: renovação de arrendamento)."""
+        self._merge(updates)
+        self._record_alive(node_id)
+
+    def observe(self, node_id):
+        """Sinal de vida vindo do tráfego da aplicação (chamada recebida de `node_id` ou resposta dele).
+
+        Conta no máximo uma vez por período: tráfego intenso não encolhe os intervalos aprendidos pelo
+        phi-accrual, e no caso comum a chamada não toma o lock.
+        """
+        member = self._members.get(node_id)
+        if member is not None and member[0] == ALIVE and self._heard_recently(node_id, self.clock()):
+            return
+        self._record_alive(node_id)
+
+    def receive(self, sender_id, updates):
+        """Processa uma mensagem recebida de `sender_id` e retorna as atualizações a devolver por piggyback."""
+        self._record_alive(sender_id)
+        self._merge(updates)
+        with self._lock:
+            return self._collect_updates()
+
+    def piggyback(self):
+        with self._lock:
+            return self._collect_updates()
+
+    def _on_ack(self, target, ok, received):
+        self._merge(received)
+        if ok:
+            self._record_alive(target)
+            return
+
+        with self._lock:
+            candidates = [nid for nid, (status, _) in self._members.items() if status == ALIVE and nid != target]
+            helpers = self.rng.sample(candidates, min(self.indirect_probes, len(candidates)))
+            updates = self._collect_updates()
+            self.stats['indirect_probes'] += len(helpers)
+        if not helpers:
+            self._suspect(target)
+            return
+
+        state = {'pending': len(helpers), 'acked': False}
+        state_lock = threading.Lock()
+
+        def on_indirect_ack(ok, received):
+            self._merge(received)
+            with state_lock:
+                state['pending'] -= 1
+                first_ack = ok and not state['acked']
+                if ok:
+                    state['acked'] = True
+                gave_up = state['pending'] == 0 and not state['acked']
+            if first_ack:
+                self._record_alive(target)
+            elif gave_up:
+                self._suspect(target)
+
+        for helper in helpers:
+            self.ping_req(helper, target, updates, self.ack_timeout * 2, on_indirect_ack)
+
+    def _on_reconnect(self, target, ok, received):
+        # Sem pings indiretos: um membro morto que não responde continua morto
+        if ok:
+            self._merge(received)
+            self._record_alive(target)
+
+    # --- Estado interno ---
+    def _reconnect_target(self):
+        if not self.reconnect_periods or self._periods % self.reconnect_periods:
+            return None
+        dead = [nid for nid, (status, _) in self._members.items() if status == DEAD]
+        return self.rng.choice(dead) if dead else None
+
+    def _heard_recently(self, node_id, now):
+        elapsed = self.detector.elapsed(node_id, now)
+        return elapsed is not None and elapsed < self.protocol_period
+
+    def _next_target(self):
+        # Percorre uma permutação aleatória dos membros: cada um é sondado em no máximo N períodos
+        while self._probe_order:
+            nid = self._probe_order.pop()
+            if nid in self._members and self._members[nid][0] != DEAD:
+                return nid
+        live = [nid for nid, (status, _) in self._members.items() if status != DEAD]
+        if not live:
+            return None
+        self.rng.shuffle(live)
+        self._probe_order = live
+        return self._probe_order.pop()
+
+    def _record_alive(self, node_id):
+        if node_id == self.node_id:
+            return
+        revived = False
+        with self._lock:
+            self.detector.heartbeat(node_id, self.clock())
+            member = self._members.get(node_id)
+            if member is None:
+                self._members[node_id] = [ALIVE, 0]
+                self._enqueue(node_id, ALIVE, 0)
+                revived = True
+            elif member[0] == SUSPECT:
+                # Evidência direta de vida encerra a suspeita local; a refutação oficial vem do próprio membro
+                member[0] = ALIVE
+                self._suspected_at.pop(node_id, None)
+            elif member[0] == DEAD:
+                # Um nó declarado morto voltou a responder: volta com uma incarnation maior
+                member[0] = ALIVE
+                member[1] += 1
+                self._enqueue(node_id, ALIVE, member[1])
+                revived = True
+        if revived and self.on_alive:
+            self.on_alive(node_id)
+
+    def _suspect(self, node_id):
+        with self._lock:
+            member = self._members.get(node_id)
+            if member is None or member[0] != ALIVE:
+                return
+            member[0] = SUSPECT
+            self._suspected_at[node_id] = self.clock()
+            self._enqueue(node_id, SUSPECT, member[1])
+            self.stats['suspicions'] += 1
+
+    def _merge(self, updates):
+        died = []
+        revived = []
+        with self._lock:
+            for node_id, status, incarnation in updates or ():
+                if node_id == self.node_id:
+                    if status != ALIVE and incarnation >= self.incarnation:
+                        # Refuta a suspeita sobre si mesmo anunciando uma incarnation maior
+                        self.incarnation = incarnation + 1
+                        self._enqueue(self.node_id, ALIVE, self.incarnation)
+                        self.stats['refutations'] += 1
+                    continue
+                member = self._members.get(node_id)
+                if member is None:
+                    if status != DEAD:
+                        self._members[node_id] = [status, incarnation]
+                        self._suspected_at[node_id] = self.clock()
+                        self.detector.heartbeat(node_id, self.clock())
+                        self._enqueue(node_id, status, incarnation)
+                        revived.append(node_id)
+                    continue
+                current, current_inc = member
+                if status == ALIVE:
+                    applies = incarnation > current_inc
+                elif status == SUSPECT:
+                    applies = current != DEAD and (incarnation > current_inc or (incarnation == current_inc and current == ALIVE))
+                else:
+                    applies = current != DEAD and incarnation >= current_inc
+                if not applies:
+                    continue
+                member[0], member[1] = status, incarnation
+                self._enqueue(node_id, status, incarnation)
+                if status == SUSPECT and current != SUSPECT:
+                    self._suspected_at[node_id] = self.clock()
+                    self.stats['suspicions'] += 1
+                if status == ALIVE:
+                    self.detector.heartbeat(node_id, self.clock())
+                    if current == DEAD:
+                        revived.append(node_id)
+                elif status == DEAD:
+                    self.stats['failures'] += 1
+                    died.append(node_id)
+        for node_id in died:
+            if self.on_dead:
+                self.on_dead(node_id)
+        for node_id in revived:
+            if self.on_alive:
+                self.on_alive(node_id)
+
+    def _enqueue(self, node_id, status, incarnation):
+        # Cada atualização é retransmitida ~lambda*log(N) vezes antes de sair do buffer
+        limit = self.retransmit_mult * max(1, math.ceil(math.log2(len(self._members) + 2)))
+        self._updates[node_id] = [status, incarnation, limit]
+
+    def _collect_updates(self):
+        if not self._updates:
+            return []
+        chosen = sorted(self._updates.items(), key=lambda item: -item[1][2])[:self.max_piggyback]
+        updates = []
+        for node_id, entry in chosen:
+            updates.append((node_id, entry[0], entry[1]))
+            entry[2] -= 1
+            if entry[2] <= 0:
+                del self._updates[node_id]
+        return updates
@@ -0,0 +1,211 @@
+import os
+import socket
+import struct
+import threading
+import time
+
+# Layout fixo dos datagramas (big-endian):
+#   cabeçalho: magic(2s) versão(B) nº de mensagens(B) remetente(H) grupo(c) pad(x) sessão(I)
+#   mensagem:  sequência(I) lamport(Q) tipo(B) tamanho do payload(H) seguido do payload
+DATAGRAM_HEADER = struct.Struct('!2sBBHcxI')
+MESSAGE_HEADER = struct.Struct('!IQBH')
+MAGIC = b'SD'
+VERSION = 1
+MAX_MESSAGES_PER_DATAGRAM = 255
+
+# Tipos de mensagem intergrupos
+MSG_LEADER_ANNOUNCE = 1
+MSG_STATE = 2
+MSG_SUPER_COORDINATOR = 3
+
+# Payloads de tamanho fixo dos tipos acima
+LEADER_PAYLOAD = struct.Struct('!H')  # id do líder
+STATE_PAYLOAD = struct.Struct('!HH')  # id do líder, nº de nós ativos
+
+class _SenderState:
+    __slots__ = ('session', 'group', 'next_seq', 'held', 'held_since')
+
+    def __init__(self, session, group, first_seq):
+        self.session = session
+        self.group = group
+        self.next_seq = first_seq
+        self.held = {}
+        self.held_since = None
+
+class MulticastCommunicator:
+    """Barramento UDP multicast entre grupos com quadros binários, agregação e entrega ordenada por remetente.
+
+    Mensagens pequenas enviadas com send() são agregadas em um único datagrama por intervalo de flush.
+    Na recepção, duplicatas são descartadas e mensagens fora de ordem aguardam até `reorder_timeout`; o prazo é
+    verificado a cada flush, para todos os remetentes, mesmo que o remetente da lacuna tenha ficado quieto.
+    O payload entregue a `on_message(sender_id, group_id, msg_type, lamport_time, payload)` é uma
+    memoryview sobre o buffer de recepção: copie-o com bytes() se precisar guardá-lo.
+    """
+
+    def __init__(self, node_id, group_id, clock, on_message, multicast_group, multicast_port,
+                 flush_interval=0.005, max_datagram=1400, reorder_timeout=0.2):
+        self.node_id = node_id
+        self.group_id = group_id.encode('ascii')
+        self.clock = clock
+        self.on_message = on_message
+        self.address = (multicast_group, multicast_port)
+        self.flush_interval = flush_interval
+        self.max_datagram = max_datagram
+        self.reorder_timeout = reorder_timeout
+        self.session = struct.unpack('!I', os.urandom(4))[0]
+        self.stats = {'messages_sent': 0, 'datagrams_sent': 0, 'messages_received': 0, 'duplicates': 0, 'reordered': 0, 'gaps': 0}
+        self._seq = 0
+        self._pending = []
+        self._pending_size = DATAGRAM_HEADER.size
+        self._senders = {}
+        self._lock = threading.Lock()
+        self._recv_lock = threading.Lock() # Estado dos remetentes: thread de recepção e expiração das lacunas
+        self._running = False
+        self._stopped = False
+        self._lifecycle_lock = threading.Lock() # start() e stop() podem vir de threads diferentes do nó
+        self._send_sock = None
+        self._recv_sock = None
+
+    def start(self):
+        with self._lifecycle_lock:
+            if not self._stopped:
+                self._open()
+
+    def _open(self):
+        self._send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self._send_sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+        self._send_sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+
+        self._recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self._recv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            # Vários nós do mesmo host escutam a mesma porta
+            self._recv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self._recv_sock.bind(('', self.address[1]))
+        membership = struct.pack('4sl', socket.inet_aton(self.address[0]), socket.INADDR_ANY)
+        self._recv_sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self._recv_sock.settimeout(0.5)
+
+        self._running = True
+        threading.Thread(target=self._receive_loop, daemon=True).start()
+        threading.Thread(target=self._flush_loop, daemon=True).start()
+
+    def stop(self):
+        with self._lifecycle_lock:
+            self._stopped = True
+            self._running = False
+            self.flush()
+            for sock in (self._send_sock, self._recv_sock):
+                if sock is not None:
+                    sock.close()
+
+    # --- Envio ---
+    def send(self, msg_type, payload=b''):
+        """Enfileira uma mensagem carimbada com o tempo de Lamport; ela sai no próximo flush."""
+        size = MESSAGE_HEADER.size + len(payload)
+        with self._lock:
+            if len(self._pending) >= MAX_MESSAGES_PER_DATAGRAM or self._pending_size + size > self.max_datagram:
+                self._flush_locked()
+            self._seq += 1
+            self._pending.append(MESSAGE_HEADER.pack(self._seq, self.clock.increment(), msg_type, len(payload)) + payload)
+            self._pending_size += size
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending or self._send_sock is None:
+            return
+        header = DATAGRAM_HEADER.pack(MAGIC, VERSION, len(self._pending), self.node_id, self.group_id, self.session)
+        try:
+            self._send_sock.sendto(header + b''.join(self._pending), self.address)
+            self.stats['datagrams_sent'] += 1
+            self.stats['messages_sent'] += len(self._pending)
+        except OSError:
+            pass # UDP: a perda é tratada como qualquer outra perda de datagrama
+        self._pending = []
+        self._pending_size = DATAGRAM_HEADER.size
+
+    def _flush_loop(self):
+        while self._running:
+            time.sleep(self.flush_interval)
+            self.flush()
+            self._expire_gaps()
+
+    # --- Recepção ---
+    def _receive_loop(self):
+        buffer = bytearray(65535)
+        view = memoryview(buffer)
+        while self._running:
+            try:
+                size = self._recv_sock.recv_into(buffer)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self._parse(view[:size])
+
+    def _parse(self, view):
+        if len(view) < DATAGRAM_HEADER.size:
+            return
+        magic, version, count, sender_id, group_id, session = DATAGRAM_HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION or sender_id == self.node_id:
+            return
+        group = group_id.decode('ascii')
+        with self._recv_lock:
+            state = self._senders.get(sender_id)
+            offset = DATAGRAM_HEADER.size
+            for _ in range(count):
+                if offset + MESSAGE_HEADER.size > len(view):
+                    return
+                seq, lamport_time, msg_type, length = MESSAGE_HEADER.unpack_from(view, offset)
+                offset += MESSAGE_HEADER.size
+                payload = view[offset:offset + length]
+                offset += length
+                if state is None or state.session != session:
+                    # Primeiro contato (ou o remetente reiniciou): a sequência começa aqui
+                    state = self._senders[sender_id] = _SenderState(session, group, seq)
+                self._accept(sender_id, group, state, seq, lamport_time, msg_type, payload)
+            self._expire_gap(sender_id, state)
+
+    def _accept(self, sender_id, group, state, seq, lamport_time, msg_type, payload):
+        if seq < state.next_seq or seq in state.held:
+            self.stats['duplicates'] += 1
+            return
+        if seq > state.next_seq:
+            # Fora de ordem: guarda uma cópia, pois o buffer de recepção será reutilizado
+            state.held[seq] = (lamport_time, msg_type, bytes(payload))
+            if state.held_since is None:
+                state.held_since = time.monotonic()
+            self.stats['reordered'] += 1
+            return
+        self._deliver(sender_id, group, lamport_time, msg_type, payload)
+        state.next_seq += 1
+        self._drain(sender_id, group, state)
+
+    def _drain(self, sender_id, group, state):
+        while state.next_seq in state.held:
+            lamport_time, msg_type, payload = state.held.pop(state.next_seq)
+            self._deliver(sender_id, group, lamport_time, msg_type, memoryview(payload))
+            state.next_seq += 1
+        state.held_since = time.monotonic() if state.held else None
+
+    def _expire_gaps(self):
+        """Entrega o que está retido atrás de lacunas vencidas, de todos os remetentes."""
+        with self._recv_lock:
+            for sender_id, state in list(self._senders.items()):
+                self._expire_gap(sender_id, state)
+
+    def _expire_gap(self, sender_id, state):
+        if state is None or state.held_since is None or time.monotonic() - state.held_since < self.reorder_timeout:
+            return
+        # A mensagem que falta se perdeu: pula a lacuna e entrega o que estava retido
+        self.stats['gaps'] += 1
+        state.next_seq = min(state.held)
+        self._drain(sender_id, state.group, state)
+
+    def _deliver(self, sender_id, group, lamport_time, msg_type, payload):
+        self.clock.update(lamport_time)
+        self.stats['messages_received'] += 1
+        self.on_message(sender_id, group, msg_type, lamport_time, payload)
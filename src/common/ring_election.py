@@ -0,0 +1,176 @@
+import threading
+import time
+
+from src.common.timers import call_later
+from src.common.instrumentation import histogram
+
+_DURATION = histogram('simula_election_duration_seconds', "Duração das eleições, do início até o líder ser conhecido.",
+                      algorithm='ring')
+
+class RingElection:
+    """Motor de eleição em anel no estilo Chang-Roberts, independente do transporte.
+
+    As mensagens têm tamanho constante ({'type', 'candidate' ou 'leader', 'hops'}) e eleições
+    concorrentes de candidatos menores são extintas no caminho. `send(target, message)` retorna
+    True se a mensagem foi entregue; sucessores inalcançáveis ou mortos segundo `is_alive` são pulados.
+    """
+
+    def __init__(self, node_id, ring_ids, send, is_alive, on_leader=None, election_timeout=5.0,
+                 unreachable_ttl=5.0, schedule=call_later, clock=time.monotonic):
+        self.node_id = node_id
+        self.ring = sorted(ring_ids)
+        self.send = send
+        self.is_alive = is_alive
+        self.on_leader = on_leader
+        self.election_timeout = election_timeout
+        self.unreachable_ttl = unreachable_ttl
+        self.schedule = schedule
+        self.clock = clock
+        self.participant = False
+        self.leader_id = None
+        self.last_election = None
+        self.stats = {'elections': 0, 'suppressed': 0, 'extinguished': 0, 'skipped': 0, 'restarts': 0, 'messages': 0}
+        self._epoch = 0
+        self._started_at = None
+        self._messages = 0
+        self._unreachable = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_progress(self):
+        return self.participant
+
+    def successors(self):
+        """Retorna os sucessores no anel, na ordem, pulando os que estão mortos ou inalcançáveis."""
+        now = self.clock()
+        index = self.ring.index(self.node_id)
+        ordered = self.ring[index + 1:] + self.ring[:index]
+        return [nid for nid in ordered if self.is_alive(nid) and self._unreachable.get(nid, 0) <= now]
+
+    def next_node(self):
+        successors = self.successors()
+        return successors[0] if successors else None
+
+    def start(self):
+        """Inicia uma eleição; retorna False se este nó já participa de uma."""
+        with self._lock:
+            if self.participant:
+                self.stats['suppressed'] += 1
+                return False
+            self._participate()
+        self._forward_or_elect({'type': 'ELECTION', 'candidate': self.node_id, 'hops': 0})
+        return True
+
+    def on_message(self, message):
+        if message['hops'] > len(self.ring):
+            # Já deu uma volta completa sem encontrar o destino (ex.: o nó de origem falhou)
+            return
+        if message['type'] == 'ELECTION':
+            self._on_election(message)
+        elif message['type'] == 'COORDINATOR':
+            self._on_coordinator(message)
+
+    # --- Fases internas ---
+    def _on_election(self, message):
+        candidate = message['candidate']
+        forward = dict(message, hops=message['hops'] + 1)
+        with self._lock:
+            if candidate == self.node_id:
+                if not self.participant:
+                    return # Cópia antiga de uma candidatura já concluída
+                # A própria candidatura deu a volta no anel: este é o maior nó vivo
+                ring_hops = message['hops']
+                won = True
+            else:
+                won = False
+                if candidate < self.node_id or not self.is_alive(candidate):
+                    if self.participant and self.is_alive(candidate):
+                        # Candidatura menor concorrente com a nossa: é extinta aqui
+                        self.stats['extinguished'] += 1
+                        return
+                    forward['candidate'] = self.node_id
+                    forward['hops'] = 0 # Nova candidatura: conta uma volta a partir daqui
+                if not self.participant:
+                    self._participate()
+        if won:
+            self._elected(ring_hops)
+        else:
+            self._forward_or_elect(forward)
+
+    def _on_coordinator(self, message):
+        leader_id = message['leader']
+        with self._lock:
+            if leader_id == self.node_id:
+                # O anúncio fechou o anel
+                if self.last_election and self.last_election['leader'] == self.node_id:
+                    self.last_election['ring_hops'] += message['hops']
+                return
+            self._epoch += 1
+            self.participant = False
+            self.leader_id = leader_id
+            self._finish(leader_id)
+        if self.on_leader:
+            self.on_leader(leader_id)
+        self._forward(dict(message, hops=message['hops'] + 1))
+
+    def _elected(self, ring_hops):
+        with self._lock:
+            self._epoch += 1
+            self.participant = False
+            self.leader_id = self.node_id
+            self._finish(self.node_id)
+            if self.last_election:
+                self.last_election['ring_hops'] = ring_hops
+        if self.on_leader:
+            self.on_leader(self.node_id)
+        self._forward({'type': 'COORDINATOR', 'leader': self.node_id, 'hops': 0})
+
+    def _participate(self):
+        self.participant = True
+        self._epoch += 1
+        epoch = self._epoch
+        if self._started_at is None:
+            self._started_at = self.clock()
+            self._messages = 0
+            self.stats['elections'] += 1
+        self.schedule(self.election_timeout, lambda: self._on_timeout(epoch))
+
+    def _on_timeout(self, epoch):
+        with self._lock:
+            if epoch != self._epoch or not self.participant:
+                return
+            # A mensagem se perdeu com um nó que falhou no meio do caminho
+            self.participant = False
+            self.stats['restarts'] += 1
+        self.start()
+
+    def _forward(self, message):
+        """Entrega a mensagem ao primeiro sucessor alcançável; retorna False se nenhum estiver vivo."""
+        for successor in self.successors():
+            if self.send(successor, message):
+                with self._lock:
+                    self._messages += 1
+                    self.stats['messages'] += 1
+                return True
+            with self._lock:
+                self._unreachable[successor] = self.clock() + self.unreachable_ttl
+                self.stats['skipped'] += 1
+        return False
+
+    def _forward_or_elect(self, message):
+        """Repassa a candidatura; sem sucessor alcançável, este nó é o único vivo do anel e se elege."""
+        if not self._forward(message):
+            self._elected(message['hops'])
+
+    def _finish(self, leader_id):
+        if self._started_at is None:
+            return
+        duration = self.clock() - self._started_at
+        _DURATION.observe(duration)
+        self.last_election = {
+            'leader': leader_id,
+            'duration': duration,
+            'messages': self._messages,
+            'ring_hops': 0,
+        }
+        self._started_at = None
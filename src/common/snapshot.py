@@ -0,0 +1,193 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from src.common.timers import call_later
+from src.common.instrumentation import get_logger
+
+log = get_logger('snapshot')
+
+class _Channel:
+    """Estado de um canal de entrada enquanto o snapshot grava: mensagens anteriores ao corte e o próprio corte."""
+
+    __slots__ = ('received', 'cutoff', 'pending')
+
+    def __init__(self, received):
+        self.received = received # Mensagens do remetente enviadas antes do seu snapshot que já chegaram
+        self.cutoff = None # Quantas mensagens o remetente enviou antes do snapshot; vem no marcador
+        self.pending = [] # (seq, registro) recebidos sem o corte: ainda não se sabe se estavam em trânsito
+
+    @property
+    def closed(self):
+        return self.cutoff is not None and self.received >= self.cutoff
+
+class _Recording:
+    def __init__(self, path, channels, started_at):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+        self.channels = channels
+        self.started_at = started_at
+        self.bytes = 0
+        self.messages = 0
+
+    @property
+    def open_channels(self):
+        return [nid for nid, channel in self.channels.items() if not channel.closed]
+
+    def write(self, record):
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        self.file.write(line)
+        self.bytes += len(line)
+
+    def record(self, channel, record):
+        self.write(record)
+        self.messages += 1
+        channel.received += 1
+
+class SnapshotManager:
+    """Algoritmo de Chandy-Lamport: grava o estado local e as mensagens em trânsito sem pausar o nó.
+
+    Cada parte do snapshot é escrita em um arquivo append-only (uma linha JSON por registro) à medida que
+    chega, então o estado global nunca é montado em memória. `send_markers(snapshot_id, cutoffs)` deve
+    enviar os marcadores de forma assíncrona, com o corte {nó: mensagens enviadas} de cada canal;
+    `local_state()` retorna o estado local a gravar.
+
+    Os transportes (futures do gRPC, proxies do Pyro5) não garantem FIFO entre marcadores e mensagens. Por
+    isso cada mensagem de aplicação leva o carimbo de stamp(): a sequência no canal e os snapshots que o
+    remetente está gravando. Uma mensagem com um snapshot desconhecido inicia a gravação antes de ser
+    processada (faz o papel do marcador que ainda não chegou), e as mensagens com sequência até o corte
+    do marcador são as que estavam em trânsito, cheguem antes ou depois dele.
+    """
+
+    def __init__(self, node_id, peers, send_markers, local_state, output_dir='snapshots', timeout=10.0, history=32,
+                 schedule=call_later, clock=time.monotonic):
+        self.node_id = node_id
+        self.peers = peers
+        self.send_markers = send_markers
+        self.local_state = local_state
+        self.output_dir = output_dir
+        self.timeout = timeout
+        self.history = history
+        self.schedule = schedule
+        self.clock = clock
+        self.completed = OrderedDict() # Só os `history` snapshots mais recentes
+        self._active = {}
+        self._sent = {}
+        self._received = {}
+        self._lock = threading.Lock()
+
+    def initiate(self, snapshot_id):
+        """Inicia um snapshot como iniciador; os demais nós entram ao receber o marcador."""
+        self._begin(snapshot_id)
+        return snapshot_id
+
+    def stamp(self, peer_id):
+        """Carimbo (seq, snapshots em gravação) de uma mensagem de aplicação enviada a peer_id."""
+        with self._lock:
+            seq = self._sent[peer_id] = self._sent.get(peer_id, 0) + 1
+            return seq, list(self._active)
+
+    def on_marker(self, snapshot_id, sender_id, sent=None):
+        """Marcador de sender_id; `sent` é o corte do canal (None: canal FIFO, fecha na chegada)."""
+        self._begin(snapshot_id)
+        with self._lock:
+            recording = self._active.get(snapshot_id)
+            channel = recording and recording.channels.get(sender_id)
+            if channel is None or channel.cutoff is not None:
+                return
+            channel.cutoff = channel.received if sent is None else sent
+            for seq, record in channel.pending:
+                if seq <= channel.cutoff:
+                    recording.record(channel, record)
+            channel.pending = []
+        self._finish_if_done(snapshot_id)
+
+    def on_message(self, sender_id, kind, payload, stamp=None):
+        """Registra uma mensagem de aplicação recebida; deve ser chamado antes de a mensagem ser processada."""
+        seq, snapshots = stamp or (None, ())
+        for snapshot_id in snapshots:
+            # O remetente já gravou este snapshot: este nó grava o seu antes de processar a mensagem
+            self._begin(snapshot_id)
+        finished = []
+        with self._lock:
+            self._received[sender_id] = self._received.get(sender_id, 0) + 1
+            for snapshot_id, recording in self._active.items():
+                channel = recording.channels.get(sender_id)
+                if channel is None or channel.closed or snapshot_id in snapshots:
+                    continue # Canal já fechado ou mensagem enviada depois do snapshot do remetente
+                record = {'k': 'msg', 'ch': sender_id, 'type': kind, 'm': payload}
+                if seq is None or (channel.cutoff is not None and seq <= channel.cutoff):
+                    recording.record(channel, record)
+                elif channel.cutoff is None:
+                    channel.pending.append((seq, record))
+                if not recording.open_channels:
+                    finished.append(snapshot_id)
+        for snapshot_id in finished:
+            self._finish(snapshot_id, complete=True)
+
+    def on_peer_failed(self, node_id):
+        # Um canal de um nó morto nunca receberá o marcador
+        for snapshot_id in list(self._active):
+            self._close_channel(snapshot_id, node_id)
+
+    def _begin(self, snapshot_id):
+        with self._lock:
+            if snapshot_id in self._active or snapshot_id in self.completed:
+                return False
+            peers = [nid for nid in self.peers() if nid != self.node_id]
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f"snapshot-{snapshot_id}-node-{self.node_id}.jsonl")
+            # Toda mensagem recebida até aqui foi enviada antes do snapshot do remetente
+            channels = {nid: _Channel(self._received.get(nid, 0)) for nid in peers}
+            recording = _Recording(path, channels, self.clock())
+            # O estado local é gravado antes de enviar os marcadores, como exige o algoritmo
+            recording.write({'k': 'state', 'node': self.node_id, 'state': self.local_state()})
+            self._active[snapshot_id] = recording
+            # Sob o mesmo lock do stamp(): mensagens anteriores têm seq até o corte, as seguintes levam o snapshot_id
+            cutoffs = {nid: self._sent.get(nid, 0) for nid in peers}
+        self.send_markers(snapshot_id, cutoffs)
+        self.schedule(self.timeout, lambda: self._finish(snapshot_id, complete=False))
+        self._finish_if_done(snapshot_id)
+        return True
+
+    def _close_channel(self, snapshot_id, sender_id):
+        with self._lock:
+            recording = self._active.get(snapshot_id)
+            if recording is None:
+                return
+            recording.channels.pop(sender_id, None)
+        self._finish_if_done(snapshot_id)
+
+    def _finish_if_done(self, snapshot_id):
+        recording = self._active.get(snapshot_id)
+        if recording is not None and not recording.open_channels:
+            self._finish(snapshot_id, complete=True)
+
+    def _finish(self, snapshot_id, complete):
+        with self._lock:
+            recording = self._active.pop(snapshot_id, None)
+            if recording is None:
+                return
+            open_channels = sorted(recording.open_channels)
+            for nid in open_channels:
+                channel = recording.channels[nid]
+                if channel.cutoff is not None:
+                    # Mensagens que não chegaram até o prazo são dadas como perdidas, para o próximo snapshot
+                    # não esperar por elas
+                    self._received[nid] = self._received.get(nid, 0) + channel.cutoff - channel.received
+            latency = self.clock() - recording.started_at
+            recording.write({'k': 'done', 'complete': complete, 'latency': latency, 'open_channels': open_channels})
+            recording.file.close()
+            self.completed[snapshot_id] = {
+                'complete': complete,
+                'latency': latency,
+                'bytes': recording.bytes,
+                'channel_messages': recording.messages,
+                'path': recording.path,
+            }
+            while len(self.completed) > self.history:
+                self.completed.popitem(last=False)
+        log.info("Node %s finished snapshot %s in %.1f ms (%s bytes, %s in-flight messages, complete=%s).",
+                 self.node_id, snapshot_id, latency * 1000, recording.bytes, recording.messages, complete)
@@ -0,0 +1,267 @@
+import itertools
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+
+from src.common.timers import call_later
+
+# Operações replicadas do líder para os seguidores
+OP_ADD = 'add'
+OP_DONE = 'done'
+
+class _Load:
+    __slots__ = ('in_flight', 'queue_depth', 'latency', 'blocked_until', 'dispatched')
+
+    def __init__(self):
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.latency = None
+        self.blocked_until = 0
+        self.dispatched = 0
+
+class TaskScheduler:
+    """Distribui tarefas entre os membros vivos do grupo; só despacha enquanto este nó é o líder.
+
+    A escolha do executor segue power-of-two-choices: sorteia dois membros e fica com o de menor custo,
+    (tarefas em andamento + fila reportada + 1) × latência média recente. `dispatch(target_id, task_id,
+    task_name, callback)` envia a tarefa de forma assíncrona e chama callback(ok, status, queue_depth).
+    `replicate(stream, seq, ops)` envia aos seguidores um lote de operações (op, task_id, task_name), para
+    que um novo líder retome as tarefas pendentes; as operações de `replication_delay` segundos saem juntas,
+    e um ADD concluído antes do envio nem chega a sair. O seguidor aplica os lotes em ordem de `seq` com
+    apply(). A entrega é pelo menos uma vez: uma tarefa em andamento quando o líder ou o executor falha
+    volta para a fila e pode ser executada de novo.
+    """
+
+    def __init__(self, node_id, members, dispatch, replicate, max_in_flight=8, latency_alpha=0.2, retry_delay=1.0,
+                 max_results=1024, replication_delay=0.05, gap_timeout=1.0, schedule=call_later, clock=time.monotonic,
+                 rng=None):
+        self.node_id = node_id
+        self.members = members
+        self.dispatch = dispatch
+        self.replicate = replicate
+        self.max_in_flight = max_in_flight
+        self.latency_alpha = latency_alpha
+        self.retry_delay = retry_delay
+        self.max_results = max_results
+        self.replication_delay = replication_delay
+        self.gap_timeout = gap_timeout
+        self.schedule = schedule
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.active = False
+        self.results = OrderedDict()  # últimos status por task_id, limitado a max_results
+        self.stats = {'submitted': 0, 'completed': 0, 'requeued': 0, 'failed_dispatches': 0}
+        self._tasks = {}
+        self._pending = deque()
+        self._owner = {}
+        self._load = {}
+        self._mean_latency = None # Média móvel de todo o grupo, custo de quem ainda não tem latência própria
+        self._ids = itertools.count(1)
+        self._outbox = OrderedDict() # task_id -> (op, task_name) ainda não replicados
+        self._flush_scheduled = False
+        # Sequência dos lotes deste nó; o fluxo muda quando o processo reinicia e a sequência volta a 1
+        self._stream = self.rng.getrandbits(32)
+        self._seq = 0
+        self._inbox = {} # remetente -> [fluxo, próximo seq, {seq: ops} fora de ordem]
+        self._lock = threading.Lock()
+
+    # --- Fila de tarefas ---
+    def submit(self, task_name, task_id=None):
+        """Enfileira uma tarefa e retorna seu identificador."""
+        with self._lock:
+            if task_id is None:
+                task_id = f"{self.node_id}.{next(self._ids)}"
+            self._tasks[task_id] = task_name
+            self._pending.append(task_id)
+            self.stats['submitted'] += 1
+        self._replicate(OP_ADD, task_id, task_name)
+        self._pump()
+        return task_id
+
+    def pending(self):
+        """Número de tarefas ainda não concluídas, na fila ou em andamento."""
+        return len(self._tasks)
+
+    def apply(self, sender_id, stream, seq, ops):
+        """Aplica um lote replicado pelo líder (lado do seguidor), na ordem de seq.
+
+        Um lote adiantado espera os anteriores; se a lacuna não fecha em `gap_timeout` segundos, o lote
+        que faltou é dado como perdido e os seguintes são aplicados.
+        """
+        with self._lock:
+            inbox = self._inbox.get(sender_id)
+            if inbox is None or inbox[0] != stream:
+                inbox = self._inbox[sender_id] = [stream, 1, {}] # Fluxo novo: um lote adiantado espera os anteriores
+            if seq < inbox[1]:
+                return # Lote repetido
+            inbox[2][seq] = ops
+            self._drain(inbox)
+            gap = bool(inbox[2])
+        if gap:
+            self.schedule(self.gap_timeout, lambda: self._skip_gap(sender_id, stream, seq))
+
+    # --- Liderança ---
+    def activate(self):
+        """Assume o despacho: tudo o que ainda não terminou volta para a fila, inclusive o que estava em andamento."""
+        with self._lock:
+            if self.active:
+                return
+            self.active = True
+            self._owner.clear()
+            self._load.clear()
+            self._pending = deque(self._tasks)
+            self.stats['requeued'] += len(self._pending)
+        self._pump()
+
+    def deactivate(self):
+        """Para de despachar; as tarefas continuam conhecidas para o caso de voltar a liderar."""
+        with self._lock:
+            self.active = False
+            self._pending.clear()
+            self._owner.clear()
+
+    def on_member_failed(self, node_id):
+        """Devolve à frente da fila as tarefas que estavam com um nó declarado morto."""
+        with self._lock:
+            orphans = [task_id for task_id, owner in self._owner.items() if owner == node_id]
+            for task_id in orphans:
+                del self._owner[task_id]
+                self._pending.appendleft(task_id)
+            self._load.pop(node_id, None)
+            self.stats['requeued'] += len(orphans)
+        if orphans:
+            self._pump()
+
+    def _drain(self, inbox):
+        while inbox[1] in inbox[2]:
+            for op, task_id, task_name in inbox[2].pop(inbox[1]):
+                if op == OP_ADD:
+                    self._tasks[task_id] = task_name
+                elif op == OP_DONE:
+                    self._tasks.pop(task_id, None)
+            inbox[1] += 1
+
+    def _skip_gap(self, sender_id, stream, seq):
+        with self._lock:
+            inbox = self._inbox.get(sender_id)
+            if inbox is None or inbox[0] != stream or seq not in inbox[2]:
+                return # A lacuna já fechou
+            inbox[1] = min(inbox[2])
+            self._drain(inbox)
+
+    # --- Replicação (lado do líder) ---
+    def _replicate(self, op, task_id, task_name):
+        with self._lock:
+            if op == OP_DONE and self._outbox.get(task_id, (None,))[0] == OP_ADD:
+                del self._outbox[task_id] # Os seguidores nunca souberam da tarefa
+                return
+            self._outbox.pop(task_id, None)
+            self._outbox[task_id] = (op, task_name)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self.schedule(self.replication_delay, self._flush)
+
+    def _flush(self):
+        with self._lock:
+            self._flush_scheduled = False
+            if not self._outbox:
+                return
+            ops = [(op, task_id, task_name) for task_id, (op, task_name) in self._outbox.items()]
+            self._outbox.clear()
+            self._seq += 1
+            seq = self._seq
+        self.replicate(self._stream, seq, ops)
+
+    # --- Despacho ---
+    def _pump(self):
+        assignments = []
+        with self._lock:
+            if not self.active:
+                return
+            now = self.clock()
+            members = self.members()
+            while self._pending:
+                target_id = self._choose(members, now)
+                if target_id is None:
+                    break
+                task_id = self._pending.popleft()
+                if task_id not in self._tasks:
+                    continue # Concluída enquanto esperava na fila (reexecução após falha)
+                load = self._load[target_id]
+                load.in_flight += 1
+                load.dispatched += 1
+                self._owner[task_id] = target_id
+                assignments.append((target_id, task_id, self._tasks[task_id]))
+        for target_id, task_id, task_name in assignments:
+            self.dispatch(target_id, task_id, task_name, self._callback(target_id, task_id, self.clock()))
+
+    def _choose(self, members, now):
+        # Sorteia os dois candidatos direto dos membros; só percorre o grupo se os dois estiverem ocupados
+        candidates = [nid for nid in self.rng.sample(members, min(2, len(members))) if self._available(nid, now)]
+        if not candidates:
+            available = [nid for nid in members if self._available(nid, now)]
+            candidates = self.rng.sample(available, min(2, len(available)))
+        if not candidates:
+            return None
+        default_latency = self._mean_latency if self._mean_latency is not None else 1.0
+        return min(candidates, key=lambda nid: self._cost(self._load[nid], default_latency))
+
+    def _available(self, nid, now):
+        load = self._load.get(nid)
+        if load is None:
+            load = self._load[nid] = _Load()
+        return load.in_flight < self.max_in_flight and load.blocked_until <= now
+
+    @staticmethod
+    def _cost(load, default_latency):
+        latency = load.latency if load.latency is not None else default_latency
+        return (load.in_flight + load.queue_depth + 1) * latency
+
+    def _callback(self, target_id, task_id, started):
+        def on_done(ok, status=None, queue_depth=0):
+            self._on_done(target_id, task_id, started, ok, status, queue_depth)
+        return on_done
+
+    def _on_done(self, target_id, task_id, started, ok, status, queue_depth):
+        elapsed = self.clock() - started
+        replicate = retry = False
+        with self._lock:
+            load = self._load.get(target_id)
+            if load is not None:
+                load.in_flight = max(0, load.in_flight - 1)
+            if self._owner.get(task_id) != target_id:
+                return # Já foi redistribuída (executor morto ou troca de líder)
+            del self._owner[task_id]
+            if ok:
+                if load is not None:
+                    load.queue_depth = queue_depth or 0
+                    load.latency = self._average(load.latency, elapsed)
+                self._mean_latency = self._average(self._mean_latency, elapsed)
+                if self._tasks.pop(task_id, None) is not None:
+                    self.results[task_id] = status
+                    if len(self.results) > self.max_results:
+                        self.results.popitem(last=False)
+                    self.stats['completed'] += 1
+                    replicate = True
+            else:
+                # Falha de envio: a tarefa volta para a fila e o nó fica de fora até o próximo retry
+                self._pending.appendleft(task_id)
+                self.stats['failed_dispatches'] += 1
+                if load is not None:
+                    load.blocked_until = self.clock() + self.retry_delay
+                retry = True
+        if replicate:
+            self._replicate(OP_DONE, task_id, '')
+        if retry:
+            self.schedule(self.retry_delay, self._pump)
+        self._pump()
+
+    def _average(self, mean, sample):
+        return sample if mean is None else (1 - self.latency_alpha) * mean + self.latency_alpha * sample
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, pending=len(self._tasks),
+                        dispatched={nid: load.dispatched for nid, load in self._load.items()})
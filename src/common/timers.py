@@ -0,0 +1,239 @@
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent import futures
+
+from src.config import (TIMER_TICK, TIMER_WHEEL_SLOTS, TIMER_WHEEL_LEVELS, TIMER_WORKERS, TIMER_CALLBACK_WORKERS,
+                        TIMER_LAG_WINDOW)
+from src.common.instrumentation import histogram, get_logger
+
+log = get_logger('timers')
+_LAG = histogram('simula_timer_lag_seconds', "Atraso entre o prazo de um temporizador e o início do seu callback.")
+
+class _Timer:
+    __slots__ = ('deadline', 'tick', 'callback', 'cancelled')
+
+    def __init__(self, deadline, tick, callback):
+        self.deadline = deadline
+        self.tick = tick
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class TimerWheel:
+    """Agendador compartilhado pelos nós de um processo: roda de temporizadores hierárquica.
+
+    O nível 0 tem `slots` posições de `tick` segundos; cada nível seguinte cobre `slots` voltas do anterior,
+    e seus temporizadores descem de nível conforme o prazo se aproxima. Agendar e cancelar custam O(1).
+    Uma única thread avança a roda e entrega os vencidos a um pool fixo de workers, compartilhado por todos os
+    nós do processo. Os callbacks não devem bloquear: um RPC lento ocuparia um worker e atrasaria os temporizadores
+    de todos os nós. O Node agenda por aqui só a entrega à sua SerialExecutor (Node._schedule_on_node).
+    """
+
+    def __init__(self, tick=0.01, slots=256, levels=4, workers=4, lag_window=1024, clock=time.monotonic):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._overflow = []
+        self._origin = clock()
+        self._current = 0
+        self._pending = 0
+        self._condition = threading.Condition()
+        self._ready = queue.SimpleQueue()
+        self._lags = deque(maxlen=lag_window)
+        self._stats_lock = threading.Lock()
+        self.stats = {'scheduled': 0, 'fired': 0, 'cancelled': 0, 'errors': 0, 'max_lag': 0.0}
+        self._running = True
+        self._driver = threading.Thread(target=self._run, name='timer-wheel', daemon=True)
+        self._workers = [threading.Thread(target=self._work, name=f'timer-worker-{i}', daemon=True) for i in range(workers)]
+        self._driver.start()
+        for worker in self._workers:
+            worker.start()
+
+    def call_later(self, delay, callback):
+        """Agenda callback para daqui a `delay` segundos; retorna um handle com cancel()."""
+        deadline = self.clock() + max(delay, 0.0)
+        with self._condition:
+            if not self._pending:
+                # Roda ociosa: salta para o tick atual em vez de percorrer os ticks vazios
+                self._current = max(self._current, int((self.clock() - self._origin) / self.tick) - 1)
+            timer = _Timer(deadline, max(math.ceil((deadline - self._origin) / self.tick), self._current + 1), callback)
+            self._insert(timer)
+            self._pending += 1
+            self.stats['scheduled'] += 1
+            if self._pending == 1:
+                self._condition.notify() # A thread da roda dorme sem prazo enquanto não há temporizadores
+        return timer
+
+    def get_stats(self):
+        """Contadores e o atraso (segundos) entre o prazo de cada temporizador e o início do callback."""
+        with self._stats_lock:
+            lags = sorted(self._lags)
+            stats = dict(self.stats)
+        stats['pending'] = self._pending
+        if lags:
+            stats['mean_lag'] = sum(lags) / len(lags)
+            stats['p99_lag'] = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+        return stats
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        for _ in self._workers:
+            self._ready.put(None)
+
+    # --- Roda ---
+    def _insert(self, timer):
+        delta = timer.tick - self._current
+        span = self.slots
+        for level in range(self.levels):
+            if delta < span:
+                self._wheels[level][(timer.tick // (span // self.slots)) % self.slots].append(timer)
+                return
+            span *= self.slots
+        self._overflow.append(timer)
+
+    def _advance(self):
+        """Avança um tick e devolve os temporizadores vencidos; chamado com o lock da condição."""
+        self._current += 1
+        # Ao completar uma volta de um nível, o slot correspondente do nível acima desce para os níveis menores
+        span = 1
+        for level in range(1, self.levels):
+            span *= self.slots
+            if self._current % span:
+                break
+            bucket = self._wheels[level][(self._current // span) % self.slots]
+            self._wheels[level][(self._current // span) % self.slots] = []
+            for timer in bucket:
+                self._insert(timer)
+        else:
+            overflow, self._overflow = self._overflow, []
+            for timer in overflow:
+                self._insert(timer)
+        index = self._current % self.slots
+        due, self._wheels[0][index] = self._wheels[0][index], []
+        self._pending -= len(due)
+        return due
+
+    def _run(self):
+        with self._condition:
+            while self._running:
+                if not self._pending:
+                    self._condition.wait()
+                    continue
+                wait = self._origin + (self._current + 1) * self.tick - self.clock()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                # Sem espera enquanto houver ticks vencidos: uma thread atrasada alcança o relógio tick a tick
+                for timer in self._advance():
+                    self._ready.put(timer)
+
+    def _work(self):
+        while True:
+            timer = self._ready.get()
+            if timer is None:
+                return
+            if timer.cancelled:
+                with self._stats_lock:
+                    self.stats['cancelled'] += 1
+                continue
+            lag = max(self.clock() - timer.deadline, 0.0)
+            with self._stats_lock:
+                self.stats['fired'] += 1
+                self.stats['max_lag'] = max(self.stats['max_lag'], lag)
+                self._lags.append(lag)
+            _LAG.observe(lag)
+            try:
+                timer.callback()
+            except Exception:
+                with self._stats_lock:
+                    self.stats['errors'] += 1
+                log.exception("Timer callback %r failed", timer.callback)
+
+class SerialExecutor:
+    """Fila de callbacks de um dono (um nó) sobre um executor compartilhado: um de cada vez, na ordem de chegada.
+
+    Um nó cujos callbacks bloqueiam em RPCs ocupa no máximo uma thread do executor, e depois de cada callback
+    volta para o fim da fila dele: os outros nós do processo continuam sendo atendidos pelas demais threads.
+    """
+
+    def __init__(self, executor):
+        self.executor = executor
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._active = False
+        self._closed = False
+
+    def submit(self, callback):
+        with self._lock:
+            if self._closed:
+                return
+            self._queue.append(callback)
+            if self._active:
+                return
+            self._active = True
+        self._schedule()
+
+    def close(self):
+        """Descarta os callbacks ainda na fila; o que já está rodando termina normalmente."""
+        with self._lock:
+            self._closed = True
+            self._queue.clear()
+
+    def _schedule(self):
+        try:
+            self.executor.submit(self._run_next)
+        except RuntimeError:
+            # O executor foi encerrado (fim do processo): nada mais vai rodar
+            with self._lock:
+                self._active = False
+                self._queue.clear()
+
+    def _run_next(self):
+        with self._lock:
+            callback = self._queue.popleft() if self._queue else None
+        try:
+            if callback is not None:
+                callback()
+        except Exception:
+            log.exception("Timer callback %r failed", callback)
+        finally:
+            with self._lock:
+                more = bool(self._queue)
+                self._active = more
+        if more:
+            self._schedule()
+
+_shared = None
+_shared_executor = None
+_shared_lock = threading.Lock()
+
+def shared_wheel():
+    """A roda de temporizadores do processo, criada no primeiro uso."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = TimerWheel(tick=TIMER_TICK, slots=TIMER_WHEEL_SLOTS, levels=TIMER_WHEEL_LEVELS,
+                                 workers=TIMER_WORKERS, lag_window=TIMER_LAG_WINDOW)
+        return _shared
+
+def shared_executor():
+    """As threads do processo que executam os callbacks dos nós (podem bloquear em RPCs), criadas no primeiro uso."""
+    global _shared_executor
+    with _shared_lock:
+        if _shared_executor is None:
+            _shared_executor = futures.ThreadPoolExecutor(max_workers=TIMER_CALLBACK_WORKERS,
+                                                          thread_name_prefix='timer-callbacks')
+        return _shared_executor
+
+def call_later(delay, callback):
+    """Agenda callback para daqui a `delay` segundos na roda compartilhada, sem bloquear quem chamou."""
+    return shared_wheel().call_later(delay, callback)
@@ -1,12 +1,28 @@
-import jwt
 import time
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from src.config import TOKEN_SECRET_KEY, TOKEN_EXPIRATION_SECONDS
+from src.config import (TOKEN_SECRET_KEY, TOKEN_EXPIRATION_SECONDS, TOKEN_CACHE_SIZE, TOKEN_NEGATIVE_CACHE_SIZE,
+                        TOKEN_NEGATIVE_CACHE_TTL)
+from src.common.instrumentation import counter, histogram, get_logger
+
+log = get_logger('token_manager')
+_VERIFY_SECONDS = histogram('simula_token_verify_seconds', "Tempo de verificação da assinatura JWT (falhas de cache).")
+_LOOKUPS = {result: counter('simula_token_lookups_total', "Consultas ao cache de tokens verificados, por resultado.",
+                            result=result)
+            for result in ('hit', 'miss', 'negative_hit', 'expired')}
 
 class TokenManager:
+    # Cache LRU de tokens já verificados (token -> (payload, exp)) e cache negativo (token -> válido até)
+    _verified = OrderedDict()
+    _rejected = OrderedDict()
+    _cache_lock = threading.Lock()
+    stats = {'hits': 0, 'misses': 0, 'negative_hits': 0, 'expired_evictions': 0}
+
     @staticmethod
     def generate_token(node_id):
         """Gera um token para um nó específico."""
+        import jwt # Importado no primeiro uso: custa ~90 ms e a simulação em memória não usa tokens
         payload = {
             'node_id': node_id,
             'exp': datetime.now(timezone.utc) + timedelta(seconds=TOKEN_EXPIRATION_SECONDS)
@@ -16,23 +32,89 @@ class TokenManager:
     @staticmethod
     def validate_token(token):
         """Valida um token. Retorna o payload se válido, None caso contrário."""
+        cached, payload = TokenManager._lookup(token, time.time())
+        if cached:
+            return payload
+        return TokenManager._verify(token)
+
+    @staticmethod
+    def validate_tokens(tokens):
+        """Valida vários tokens de uma vez; retorna a lista de payloads (None para os inválidos)."""
+        now = time.time()
+        results = []
+        for token in tokens:
+            cached, payload = TokenManager._lookup(token, now)
+            results.append(payload if cached else TokenManager._verify(token))
+        return results
+
+    @staticmethod
+    def _lookup(token, now):
+        """Consulta os caches; retorna (encontrado, payload)."""
+        with TokenManager._cache_lock:
+            entry = TokenManager._verified.get(token)
+            if entry is not None:
+                if entry[1] > now:
+                    TokenManager._verified.move_to_end(token)
+                    TokenManager.stats['hits'] += 1
+                    _LOOKUPS['hit'].inc()
+                    return True, entry[0]
+                # O token expirou desde que foi verificado: sai do cache positivo e passa a ser rejeitado
+                del TokenManager._verified[token]
+                TokenManager.stats['expired_evictions'] += 1
+                _LOOKUPS['expired'].inc()
+                TokenManager._reject(token, now)
+                return True, None
+            rejected_until = TokenManager._rejected.get(token)
+            if rejected_until is not None and rejected_until > now:
+                TokenManager.stats['negative_hits'] += 1
+                _LOOKUPS['negative_hit'].inc()
+                return True, None
+            TokenManager.stats['misses'] += 1
+            _LOOKUPS['miss'].inc()
+            return False, None
+
+    @staticmethod
+    def _verify(token):
+        import jwt
+        started = time.perf_counter()
         try:
             payload = jwt.decode(token, TOKEN_SECRET_KEY, algorithms=["HS256"])
-            return payload
         except jwt.ExpiredSignatureError:
-            print("Token has expired.")
+            _VERIFY_SECONDS.observe(time.perf_counter() - started)
+            log.debug("Token has expired.")
+            TokenManager._remember_rejection(token)
             return None
         except jwt.InvalidTokenError:
-            print("Invalid token.")
+            _VERIFY_SECONDS.observe(time.perf_counter() - started)
+            log.debug("Invalid token.")
+            TokenManager._remember_rejection(token)
             return None
+        _VERIFY_SECONDS.observe(time.perf_counter() - started)
+        with TokenManager._cache_lock:
+            TokenManager._verified[token] = (payload, payload.get('exp', float('inf')))
+            if len(TokenManager._verified) > TOKEN_CACHE_SIZE:
+                TokenManager._verified.popitem(last=False)
+        return payload
+
+    @staticmethod
+    def _remember_rejection(token):
+        with TokenManager._cache_lock:
+            TokenManager._reject(token, time.time())
+
+    @staticmethod
+    def _reject(token, now):
+        TokenManager._rejected[token] = now + TOKEN_NEGATIVE_CACHE_TTL
+        TokenManager._rejected.move_to_end(token)
+        if len(TokenManager._rejected) > TOKEN_NEGATIVE_CACHE_SIZE:
+            TokenManager._rejected.popitem(last=False)
 
     @staticmethod
     def access_sensitive_data(token):
         """Simula o acesso a um recurso protegido."""
         payload = TokenManager.validate_token(token)
         if payload:
-            print(f"Node {payload['node_id']} accessed sensitive data.")
+            log.info("Node %s accessed sensitive data.", payload['node_id'])
             return True
         else:
-            print("Access to sensitive data denied.")
+            log.warning("Access to sensitive data denied.")
             return False
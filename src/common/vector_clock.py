@@ -0,0 +1,103 @@
+import threading
+from array import array
+
+from src.config import GROUP_A_NODES, GROUP_B_NODES
+
+BEFORE = 'before'
+AFTER = 'after'
+EQUAL = 'equal'
+CONCURRENT = 'concurrent'
+
+class VectorClock:
+    """Relógio vetorial indexado pelos ids de GROUP_A_NODES/GROUP_B_NODES, com envio diferencial.
+
+    Segue a técnica de Singhal-Kshemkalyani: cada entrada guarda o valor do relógio local quando mudou
+    pela última vez (LU), e cada par guarda o valor local no último envio (LS). Uma mensagem leva apenas
+    as entradas com LU > LS, em pares (índice, valor).
+
+    Diferente do original, LS só avança com acknowledge(), depois que o par confirmou a entrega: um envio
+    perdido ou sem resposta não esconde entradas dos envios seguintes. Assim não é preciso canal FIFO
+    (futures concorrentes do gRPC, proxies por thread do Pyro5): toda mensagem em trânsito leva tudo o que
+    mudou desde o último envio confirmado, e a fusão por máximo tolera entregas repetidas ou fora de ordem.
+    """
+
+    __slots__ = ('node_id', 'node_ids', '_index', '_position', '_clock', '_last_update', '_last_sent', '_lock')
+
+    def __init__(self, node_id, node_ids=None):
+        self.node_id = node_id
+        self.node_ids = sorted(node_ids if node_ids is not None else set(GROUP_A_NODES) | set(GROUP_B_NODES))
+        self._index = {nid: i for i, nid in enumerate(self.node_ids)}
+        self._position = self._index[node_id]
+        self._clock = array('Q', bytes(8 * len(self.node_ids)))
+        self._last_update = array('Q', bytes(8 * len(self.node_ids)))
+        self._last_sent = {}
+        self._lock = threading.Lock()
+
+    def tick(self):
+        """Registra um evento local."""
+        with self._lock:
+            return self._tick()
+
+    def prepare_send(self, peer_id):
+        """Registra um envio para peer_id e retorna só as entradas que mudaram desde o último envio confirmado a ele."""
+        with self._lock:
+            self._tick()
+            since = self._last_sent.get(peer_id, 0)
+            clock, last_update = self._clock, self._last_update
+            return [(i, clock[i]) for i in range(len(clock)) if last_update[i] > since]
+
+    def acknowledge(self, peer_id, delta):
+        """Registra que peer_id recebeu um delta de prepare_send; só então essas entradas deixam de ir a ele."""
+        # A entrada local está em todo delta e identifica o momento do envio
+        sent_at = next(value for i, value in delta if i == self._position)
+        with self._lock:
+            if sent_at > self._last_sent.get(peer_id, 0):
+                self._last_sent[peer_id] = sent_at
+
+    def merge_and_tick(self, delta):
+        """Registra uma recepção em uma única operação: avança a entrada local e incorpora o delta recebido."""
+        with self._lock:
+            now = self._tick()
+            clock, last_update = self._clock, self._last_update
+            for i, value in delta or ():
+                if value > clock[i]:
+                    clock[i] = value
+                    last_update[i] = now
+            return now
+
+    def to_dict(self):
+        """Retorna o vetor completo como {node_id: valor}, omitindo entradas zeradas."""
+        with self._lock:
+            return {self.node_ids[i]: value for i, value in enumerate(self._clock) if value}
+
+    def _tick(self):
+        self._clock[self._position] += 1
+        now = self._clock[self._position]
+        self._last_update[self._position] = now
+        return now
+
+    def __repr__(self):
+        return f"VectorClock({self.to_dict()})"
+
+def compare(a, b):
+    """Compara dois vetores {node_id: valor}: BEFORE, AFTER, EQUAL ou CONCURRENT."""
+    less = greater = False
+    for node_id in a.keys() | b.keys():
+        x, y = a.get(node_id, 0), b.get(node_id, 0)
+        if x < y:
+            less = True
+        elif x > y:
+            greater = True
+        if less and greater:
+            return CONCURRENT
+    if less:
+        return BEFORE
+    if greater:
+        return AFTER
+    return EQUAL
+
+def happens_before(a, b):
+    return compare(a, b) == BEFORE
+
+def concurrent(a, b):
+    return compare(a, b) == CONCURRENT
@@ -1,8 +1,60 @@
 # Configurações de Rede
 MULTICAST_GROUP = '224.1.1.1'
 MULTICAST_PORT = 5007
+MULTICAST_FLUSH_INTERVAL = 0.005  # segundos entre envios de datagramas agregados
+MULTICAST_MAX_DATAGRAM = 1400  # bytes, abaixo da MTU típica
+MULTICAST_REORDER_TIMEOUT = 0.2  # segundos de espera por uma mensagem fora de ordem
+INTERGROUP_ANNOUNCE_INTERVAL = 1.0  # segundos entre anúncios dos líderes
+INTERGROUP_LEADER_TTL = 3.0  # segundos sem anúncio até um líder de outro grupo ser esquecido
 HEARTBEAT_INTERVAL = 2  # segundos
 HEARTBEAT_TIMEOUT = 3 * HEARTBEAT_INTERVAL
+HEARTBEAT_ROUND_DEADLINE = 1  # prazo único (segundos) para uma rodada de heartbeats
+HEARTBEAT_FANOUT_WORKERS = 32  # máximo de heartbeats simultâneos no Grupo B
+TASK_WORKERS = 8  # tarefas de um lote executadas em paralelo por nó
+
+# Roda de temporizadores compartilhada pelos nós de um processo
+TIMER_TICK = 0.01  # resolução (segundos) dos temporizadores
+TIMER_WHEEL_SLOTS = 256  # posições por nível da roda
+TIMER_WHEEL_LEVELS = 4  # níveis hierárquicos; o último cobre TIMER_TICK * SLOTS**LEVELS segundos
+TIMER_WORKERS = 4  # threads que entregam os callbacks vencidos aos executores dos nós
+TIMER_CALLBACK_WORKERS = 16  # threads do processo que executam os callbacks dos nós (podem bloquear em RPCs); um nó usa uma por vez
+TIMER_LAG_WINDOW = 1024  # atrasos recentes usados nas estatísticas
+
+# Inicialização: a primeira eleição sai quando uma maioria do grupo responde, sem esperar um tempo fixo
+ELECTION_STARTUP_DELAY = 5  # prazo máximo (segundos) até a primeira eleição, mesmo sem maioria
+STARTUP_PROBE_INTERVAL = 0.1  # segundos entre sondagens dos nós que ainda não responderam
+STARTUP_PROBE_TIMEOUT = 0.1  # segundos
+STARTUP_RETRY_MAX = 2.0  # maior intervalo (segundos) entre tentativas de resolver o próximo nó do anel
+NAME_SERVER_START_TIMEOUT = 10  # segundos esperando o Name Server do Pyro5 responder
+
+# Escalonador de tarefas do líder
+SCHEDULER_MAX_IN_FLIGHT = 8  # tarefas despachadas e ainda sem resposta, por nó
+SCHEDULER_LATENCY_ALPHA = 0.2  # peso da amostra mais recente na média móvel de latência
+SCHEDULER_RETRY_DELAY = 1.0  # segundos que um nó fica fora do despacho após uma falha de envio
+SCHEDULER_DISPATCH_TIMEOUT = 5.0  # prazo (segundos) da resposta de uma tarefa despachada; sem ela, a tarefa volta à fila
+SCHEDULER_REPLICATION_DELAY = 0.05  # segundos em que as operações da fila se acumulam em um único lote para os seguidores
+SCHEDULER_SYNC_GAP_TIMEOUT = 1.0  # segundos que um seguidor espera por um lote que faltou antes de aplicar os seguintes
+
+# Membership: 'lease' (seguidores renovam com o líder, O(N) por intervalo), 'swim' (sondagem aleatória
+# + phi-accrual) ou 'heartbeat' (todos-para-todos)
+MEMBERSHIP_PROTOCOL = 'lease'
+SWIM_PROTOCOL_PERIOD = 1.0  # segundos entre sondagens
+SWIM_ACK_TIMEOUT = 0.5  # segundos
+SWIM_INDIRECT_PROBES = 2  # nós usados para pings indiretos
+SWIM_MAX_RELAYS = 4  # pings indiretos atendidos ao mesmo tempo por nó; os excedentes são recusados
+SWIM_MAX_PIGGYBACK = 6  # atualizações por mensagem
+SWIM_RECONNECT_PERIODS = 10  # períodos entre tentativas de recontatar um membro declarado morto
+PHI_THRESHOLD = 8.0
+
+# Arrendamento do líder: enquanto vale, suspeitas sobre o líder não iniciam eleições
+LEASE_DURATION = 5.0  # segundos; maior que as pausas transitórias toleradas (0 desliga os arrendamentos)
+LEASE_RENEW_INTERVAL = 1.0  # segundos entre renovações de cada seguidor
+LEASE_RENEW_TIMEOUT = 0.5  # segundos
+
+# Eleição
+ELECTION_TIMEOUT = 1.0  # prazo (segundos) para as respostas OK de uma rodada de ELECTION/COORDINATOR
+COORDINATOR_TIMEOUT = 3.0  # espera pelo COORDINATOR depois de receber um OK
+RING_ELECTION_TIMEOUT = 5.0  # prazo para uma eleição em anel concluir antes de recomeçar
 
 # Configurações dos Grupos
 GROUP_A_NODES = {
@@ -17,10 +69,39 @@ GROUP_B_NODES = {
     6: {'host': 'localhost', 'port': 9093},
 }
 
+# Topologia gerada (main.py --nodes-a/--nodes-b): ids consecutivos, portas a partir das bases abaixo
+CLUSTER_HOST = 'localhost'
+GROUP_A_BASE_PORT = 50051
+GROUP_B_BASE_PORT = 9091
+
+# Lançador multiprocesso
+LAUNCHER_STATUS_INTERVAL = 10  # segundos entre relatórios de estado dos processos de trabalho
+LAUNCHER_STOP_TIMEOUT = 5  # segundos de espera por um processo antes de forçar o término
+
 # Nomes para o Pyro5
 def get_pyro_name(node_id):
     return f"Simula.NodeB.{node_id}"
 
+NAME_CACHE_TTL = 60  # segundos que uma URI resolvida permanece em cache
+PYRO_PROXY_TIMEOUT = 2  # segundos
+
+# Snapshot (Chandy-Lamport)
+SNAPSHOT_DIR = 'snapshots'  # cada nó grava sua parte em snapshot-<id>-node-<id>.jsonl
+SNAPSHOT_TIMEOUT = 10.0  # segundos até um snapshot ser fechado como incompleto
+SNAPSHOT_HISTORY = 32  # snapshots concluídos lembrados por nó (marcadores atrasados deles são ignorados)
+
+# Observabilidade
+LOG_LEVEL = 'INFO'  # DEBUG mostra também cada tarefa recebida, heartbeat falho e salto de eleição
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 9464  # /metrics (Prometheus) e /traces; no modo multiprocesso, cada processo usa a porta seguinte
+TRACE_SAMPLE_RATE = 0.0  # fração das operações rastreadas (0 desliga o rastreamento)
+TRACE_BUFFER = 1024  # trechos recentes mantidos em memória para /traces
+
 # Configurações de Autenticação
 TOKEN_SECRET_KEY = "uma-chave-secreta-muito-forte"
 TOKEN_EXPIRATION_SECONDS = 3600 # 1 hora
+TOKEN_CACHE_SIZE = 4096  # tokens verificados mantidos no cache LRU
+TOKEN_NEGATIVE_CACHE_SIZE = 1024  # tokens rejeitados lembrados
+TOKEN_NEGATIVE_CACHE_TTL = 30  # segundos que uma rejeição permanece em cache
+TOKEN_RENEW_MARGIN = 60  # segundos antes da expiração em que o nó gera um novo token
+AUTH_PROTECTED_METHODS = ('ExecuteTask', 'ExecuteTasks', 'TaskSync')  # métodos gRPC que exigem token
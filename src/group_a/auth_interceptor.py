@@ -0,0 +1,40 @@
+import grpc
+
+from src.common.token_manager import TokenManager
+
+AUTH_METADATA_KEY = 'authorization'
+
+def auth_metadata(token):
+    """Metadados gRPC que carregam o token do chamador."""
+    return ((AUTH_METADATA_KEY, f"Bearer {token}"),)
+
+def _deny(request, context):
+    context.abort(grpc.StatusCode.UNAUTHENTICATED, "Invalid or expired token.")
+
+def _deny_stream(request_iterator, context):
+    _deny(request_iterator, context)
+    yield # Nunca alcançado: abort() encerra a chamada, mas o handler precisa ser um gerador
+
+class AuthInterceptor(grpc.ServerInterceptor):
+    """Exige um token válido nos métodos protegidos; a validação usa o cache do TokenManager."""
+
+    def __init__(self, protected_methods):
+        self.protected_methods = set(protected_methods)
+        self._deny_unary = grpc.unary_unary_rpc_method_handler(_deny)
+        self._deny_stream = grpc.stream_stream_rpc_method_handler(_deny_stream)
+
+    def intercept_service(self, continuation, handler_call_details):
+        method = handler_call_details.method.rsplit('/', 1)[-1]
+        if method not in self.protected_methods:
+            return continuation(handler_call_details)
+        for key, value in handler_call_details.invocation_metadata or ():
+            if key == AUTH_METADATA_KEY:
+                token = value[7:] if value.startswith("Bearer ") else value
+                if TokenManager.validate_token(token) is not None:
+                    return continuation(handler_call_details)
+                break
+        # A negação precisa ter a mesma cardinalidade do método protegido
+        handler = continuation(handler_call_details)
+        if handler is not None and handler.request_streaming:
+            return self._deny_stream
+        return self._deny_unary
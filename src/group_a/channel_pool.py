@@ -0,0 +1,140 @@
+import grpc
+import time
+import threading
+
+from src.common.timers import call_later
+from src.group_a import service_pb2_grpc
+from src.group_a.peer_interceptor import PeerStampInterceptor
+from src.common.instrumentation import histogram, counter
+
+# O gRPC vigia o estado de um canal assinado com esperas de 0,2 s; fechar o canal antes de a thread de vigilância
+# notar que não há mais assinantes a derruba com "Cannot monitor channel state: Channel closed!"
+_CONNECTIVITY_POLL = 0.2
+
+# Opções de keepalive para manter os canais HTTP/2 abertos entre heartbeats
+CHANNEL_OPTIONS = [
+    ('grpc.keepalive_time_ms', 10000),
+    ('grpc.keepalive_timeout_ms', 2000),
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.http2.max_pings_without_data', 0),
+]
+
+class ChannelPoolClosed(grpc.RpcError):
+    """Levantada ao pedir um stub depois que o pool foi fechado."""
+
+class RpcMetricsInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """Mede a latência e conta as falhas de cada chamada unária, inclusive as assíncronas (.future)."""
+
+    def __init__(self):
+        self._latency = {}
+        self._errors = {}
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        method = client_call_details.method.rsplit('/', 1)[-1]
+        latency = self._latency.get(method)
+        if latency is None:
+            latency = self._latency[method] = histogram('simula_rpc_latency_seconds', "Latência das chamadas a outros nós.",
+                                                        method=method, transport='grpc')
+            self._errors[method] = counter('simula_rpc_errors_total', "Chamadas a outros nós que falharam.",
+                                           method=method, transport='grpc')
+        errors = self._errors[method]
+        started = time.perf_counter()
+        call = continuation(client_call_details, request)
+
+        def done(future):
+            latency.observe(time.perf_counter() - started)
+            if future.code() != grpc.StatusCode.OK:
+                errors.inc()
+        call.add_done_callback(done)
+        return call
+
+_RPC_METRICS = RpcMetricsInterceptor()
+
+class _PooledChannel:
+    def __init__(self, address, interceptors=()):
+        self.address = address
+        self.interceptors = interceptors
+        self.channel = grpc.insecure_channel(address, options=CHANNEL_OPTIONS)
+        self.stub = service_pb2_grpc.NodeAServiceStub(grpc.intercept_channel(self.channel, _RPC_METRICS, *interceptors))
+        self.state = grpc.ChannelConnectivity.IDLE
+        self.channel.subscribe(self._on_state_change, try_to_connect=False)
+
+    def _on_state_change(self, state):
+        self.state = state
+
+    def is_broken(self):
+        return self.state in (grpc.ChannelConnectivity.TRANSIENT_FAILURE, grpc.ChannelConnectivity.SHUTDOWN)
+
+    def close(self):
+        self.channel.unsubscribe(self._on_state_change)
+        call_later(2 * _CONNECTIVITY_POLL, self.channel.close)
+
+class ChannelPool:
+    """Mantém um canal gRPC persistente por par, reconectando com backoff exponencial.
+
+    Com `stamp`, toda chamada leva nos metadados o (id, tempo de Lamport) retornado por stamp(), e
+    on_reply(peer_id) é chamado a cada resposta do par.
+    """
+
+    def __init__(self, nodes_config, base_backoff=0.5, max_backoff=8.0, stamp=None, on_reply=None):
+        self.nodes_config = nodes_config
+        self.stamp = stamp
+        self.on_reply = on_reply
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._entries = {}
+        self._backoff = {}
+        self._next_retry = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {'hits': 0, 'misses': 0, 'reconnects': 0}
+
+    def _address(self, peer_id):
+        return f"{self.nodes_config[peer_id]['host']}:{self.nodes_config[peer_id]['port']}"
+
+    def _interceptors(self, peer_id):
+        if self.stamp is None:
+            return ()
+        return (PeerStampInterceptor(peer_id, self.stamp, self.on_reply),)
+
+    def get_stub(self, peer_id):
+        """Retorna o stub do canal reutilizável para o par, criando-o se necessário."""
+        with self._lock:
+            if self._closed:
+                raise ChannelPoolClosed("Channel pool is closed.")
+            entry = self._entries.get(peer_id)
+            if entry is None:
+                self.stats['misses'] += 1
+                entry = self._entries[peer_id] = _PooledChannel(self._address(peer_id), self._interceptors(peer_id))
+                return entry.stub
+
+            if entry.is_broken():
+                now = time.monotonic()
+                if now >= self._next_retry.get(peer_id, 0):
+                    # Recria o canal e dobra o intervalo até a próxima tentativa
+                    backoff = self._backoff.get(peer_id, self.base_backoff)
+                    self._backoff[peer_id] = min(backoff * 2, self.max_backoff)
+                    self._next_retry[peer_id] = now + backoff
+                    self.stats['reconnects'] += 1
+                    entry.close()
+                    entry = self._entries[peer_id] = _PooledChannel(entry.address, entry.interceptors)
+                    return entry.stub
+            elif entry.state == grpc.ChannelConnectivity.READY:
+                self._backoff.pop(peer_id, None)
+                self._next_retry.pop(peer_id, None)
+
+            self.stats['hits'] += 1
+            return entry.stub
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def close(self):
+        """Fecha todos os canais do pool."""
+        with self._lock:
+            self._closed = True
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry.close()
@@ -1,142 +1,447 @@
 import grpc
 import time
+import queue
 import threading
+import functools
 from concurrent import futures
 
 from src.node import Node
-from src.config import GROUP_A_NODES, HEARTBEAT_INTERVAL, HEARTBEAT_TIMEOUT
+from src.config import (GROUP_A_NODES, HEARTBEAT_ROUND_DEADLINE, SWIM_ACK_TIMEOUT, ELECTION_TIMEOUT, COORDINATOR_TIMEOUT,
+                        AUTH_PROTECTED_METHODS, TASK_WORKERS, SCHEDULER_DISPATCH_TIMEOUT)
+from src.common.bully_election import BullyElection
+from src.common.task_scheduler import OP_ADD, OP_DONE
+from src.common.instrumentation import span, get_logger
 from src.group_a import service_pb2, service_pb2_grpc
+from src.group_a.channel_pool import ChannelPool
+from src.group_a.auth_interceptor import AuthInterceptor, auth_metadata
+from src.group_a.peer_interceptor import PeerInterceptor
 
-class NodeA(Node, service_pb2_grpc.NodeAServicer):
-    def __init__(self, node_id):
-        super().__init__(node_id, 'A', GROUP_A_NODES)
+log = get_logger('node_a')
+
+class NodeA(Node, service_pb2_grpc.NodeAServiceServicer):
+    def __init__(self, node_id, nodes_config=None, cluster_ids=None):
+        super().__init__(node_id, 'A', nodes_config or GROUP_A_NODES, cluster_ids)
         self.server = None
-        self.active_nodes = {nid: time.time() for nid in self.all_nodes_config if nid != self.node_id}
-        self.election_in_progress = False
+        self.active_nodes = {nid: self.now() for nid in self.all_nodes_config if nid != self.node_id}
+        self.election = BullyElection(self.node_id, self._election_candidates, self._broadcast_election,
+                                      on_leader=self._on_leader_elected, election_timeout=ELECTION_TIMEOUT,
+                                      coordinator_timeout=COORDINATOR_TIMEOUT, schedule=self.schedule, clock=self.now)
+        # Toda chamada leva o remetente e o relógio nos metadados; toda resposta conta como sinal de vida do par
+        self.channel_pool = ChannelPool(self.all_nodes_config, stamp=self._peer_stamp, on_reply=self._heard_from)
+        self.task_executor = futures.ThreadPoolExecutor(max_workers=TASK_WORKERS, thread_name_prefix=f"tasks-{node_id}")
+        self.peer_rtt = {}
+        self.last_heartbeat_round = None
+        self.membership = self._create_membership(self._swim_ping, self._swim_ping_req)
+        self.lease = self._create_lease(self._renew_lease)
+        self.snapshots = self._create_snapshot_manager(self._send_markers)
+        self.scheduler = self._create_scheduler(self._dispatch_task, self._replicate_tasks)
 
     # --- gRPC Service Implementation ---
     def ExecuteTask(self, request, context):
-        self.clock.update(request.lamport_time)
-        print(f"Node {self.node_id} (Clock: {self.clock.get_time()}) received task: {request.task_name}")
-        return service_pb2.TaskResponse(status="Task completed", lamport_time=self.clock.increment())
+        reply_time = self.clock.update_and_increment(request.lamport_time)
+        self.vector_clock.merge_and_tick(zip(request.vc_index, request.vc_value))
+        self.snapshots.on_message(request.sender_id, 'task', request.task_name, _snapshot_stamp(request))
+        log.debug("Node %s (Clock: %s) received task: %s", self.node_id, reply_time, request.task_name)
+        with span('ExecuteTask', reply_time, node=self.node_id, sender=request.sender_id):
+            status = self._run_task(request.task_name)
+        vc_index, vc_value = _split_delta(self.vector_clock.prepare_send(request.sender_id))
+        return service_pb2.TaskResponse(status=status, lamport_time=reply_time, vc_index=vc_index, vc_value=vc_value,
+                                        task_id=request.task_id, queue_depth=self.tasks_in_progress)
+
+    def ExecuteTasks(self, request_iterator, context):
+        """Executa as tarefas do stream em paralelo e devolve cada resultado assim que termina."""
+        done = queue.Queue()
+
+        def read_requests():
+            count = 0
+            try:
+                for request in request_iterator:
+                    # A recepção é registrada na ordem do stream; só a execução é paralela
+                    self.clock.update(request.lamport_time)
+                    self.vector_clock.merge_and_tick(zip(request.vc_index, request.vc_value))
+                    self.snapshots.on_message(request.sender_id, 'task', request.task_name, _snapshot_stamp(request))
+                    self.task_executor.submit(self._run_streamed_task, request, done)
+                    count += 1
+            except grpc.RpcError:
+                pass # O cliente cancelou o stream; devolve o que já foi aceito
+            finally:
+                done.put((None, count))
+
+        threading.Thread(target=read_requests, daemon=True).start()
+        sent, expected = 0, None
+        while expected is None or sent < expected:
+            request, status = done.get()
+            if request is None:
+                expected = status
+                continue
+            # O carimbo de Lamport sai na ordem de envio
+            vc_index, vc_value = _split_delta(self.vector_clock.prepare_send(request.sender_id))
+            yield service_pb2.TaskResponse(task_id=request.task_id, status=status, lamport_time=self.clock.increment(),
+                                           vc_index=vc_index, vc_value=vc_value, queue_depth=self.tasks_in_progress)
+            sent += 1
+
+    def _run_streamed_task(self, request, done):
+        try:
+            status = self._run_task(request.task_name)
+        except Exception as e:
+            status = f"Task failed: {e}"
+        done.put((request, status))
+
+    def TaskSync(self, request, context):
+        reply_time = self.clock.update_and_increment(request.lamport_time)
+        self.scheduler.apply(request.sender_id, request.stream, request.seq,
+                             [(_TASK_OPS[op.op], op.task_id, op.task_name) for op in request.ops])
+        return service_pb2.TaskSyncResponse(lamport_time=reply_time)
 
     def Heartbeat(self, request, context):
+        reply_time = self.clock.update_and_increment(request.lamport_time)
+        updates = self.membership.receive(request.sender_id, _decode_updates(request.updates))
+        return service_pb2.HeartbeatResponse(status=service_pb2.HeartbeatResponse.ALIVE, lamport_time=reply_time,
+                                             updates=_encode_updates(updates))
+
+    def RenewLease(self, request, context):
+        reply_time = self.clock.update_and_increment(request.lamport_time)
+        granted, updates = self._grant_lease(request.sender_id, _decode_updates(request.updates))
+        return service_pb2.LeaseResponse(granted=granted, lamport_time=reply_time, updates=_encode_updates(updates))
+
+    def PingReq(self, request, context):
         self.clock.update(request.lamport_time)
-        self.active_nodes[request.sender_id] = time.time()
-        return service_pb2.HeartbeatResponse(status=service_pb2.HeartbeatResponse.ALIVE, lamport_time=self.clock.increment())
+        updates = self.membership.receive(request.sender_id, _decode_updates(request.updates))
+        status = service_pb2.HeartbeatResponse.UNREACHABLE
+        if self._relay_slots.acquire(blocking=False):
+            try:
+                status = self._relay_ping(request.target_id, context)
+            finally:
+                self._relay_slots.release()
+        return service_pb2.HeartbeatResponse(status=status, lamport_time=self.clock.increment(), updates=_encode_updates(updates))
+
+    def _relay_ping(self, target_id, context):
+        """Sonda o alvo em nome de quem pediu o ping indireto, no máximo pelo tempo que ele ainda espera."""
+        remaining = context.time_remaining()
+        timeout = SWIM_ACK_TIMEOUT if remaining is None else max(0.0, min(SWIM_ACK_TIMEOUT, remaining))
+        ping = service_pb2.HeartbeatMessage(sender_id=self.node_id, lamport_time=self.clock.increment(),
+                                            updates=_encode_updates(self.membership.piggyback()))
+        try:
+            response = self._create_stub(target_id).Heartbeat.future(ping, timeout=timeout).result()
+        except grpc.RpcError:
+            return service_pb2.HeartbeatResponse.UNREACHABLE
+        self.clock.update(response.lamport_time)
+        self.membership.receive(target_id, _decode_updates(response.updates))
+        return service_pb2.HeartbeatResponse.ALIVE
 
     def HandleElection(self, request, context):
-        self.clock.update(request.lamport_time)
+        reply_time = self.clock.update_and_increment(request.lamport_time)
+        with span('HandleElection', reply_time, node=self.node_id, sender=request.sender_id, type=request.type):
+            return self._handle_election(request, reply_time)
+
+    def _handle_election(self, request, reply_time):
         sender_id = request.sender_id
+        self.snapshots.on_message(sender_id, 'election', service_pb2.ElectionMessage.MessageType.Name(request.type),
+                                  _snapshot_stamp(request))
         
         if request.type == service_pb2.ElectionMessage.ELECTION:
-            print(f"Node {self.node_id} received ELECTION from {sender_id}")
-            if self.node_id > sender_id:
-                self._send_election_response(sender_id, 'OK')
-                if not self.election_in_progress:
-                    self.start_election()
-            return service_pb2.ElectionResponse(status="Handled", lamport_time=self.clock.increment())
+            log.debug("Node %s received ELECTION from %s", self.node_id, sender_id)
+            # A resposta do próprio RPC carrega o OK, sem uma mensagem extra
+            status = "OK" if self.election.on_election(sender_id) else "Handled"
+            return service_pb2.ElectionResponse(status=status, lamport_time=reply_time)
+
+        elif request.type == service_pb2.ElectionMessage.OK:
+            self.election.on_ok(sender_id)
+            return service_pb2.ElectionResponse(status="Acknowledged", lamport_time=reply_time)
 
         elif request.type == service_pb2.ElectionMessage.COORDINATOR:
-            print(f"Node {self.node_id} received COORDINATOR from {sender_id}")
-            self.leader_id = sender_id
-            self.election_in_progress = False
-            return service_pb2.ElectionResponse(status="Acknowledged", lamport_time=self.clock.increment())
+            log.debug("Node %s received COORDINATOR from %s", self.node_id, sender_id)
+            self.election.on_coordinator(sender_id)
+            return service_pb2.ElectionResponse(status="Acknowledged", lamport_time=reply_time)
         
-        return service_pb2.ElectionResponse(status="Unknown type", lamport_time=self.clock.increment())
+        return service_pb2.ElectionResponse(status="Unknown type", lamport_time=reply_time)
+
+    def Marker(self, request, context):
+        reply_time = self.clock.update_and_increment(request.lamport_time)
+        self.snapshots.on_marker(request.snapshot_id, request.sender_id, request.sent)
+        return service_pb2.MarkerResponse(lamport_time=reply_time)
 
     # --- Bully Algorithm & Communication ---
-    def _send_election_response(self, target_id, message_type):
-        # Esta é uma simplificação. Em uma implementação real, o nó que recebe 'ELECTION'
-        # responderia 'OK' ao remetente. Aqui, a lógica está focada no iniciador.
-        pass
+    @property
+    def election_in_progress(self):
+        return self.election.in_progress
 
     def start_election(self):
-        if self.election_in_progress:
+        if self.election.start():
+            log.info("Node %s starts an ELECTION.", self.node_id)
+
+    def _election_candidates(self):
+        # Nós já declarados mortos não atrasam a eleição esperando o prazo
+        return [nid for nid in self.all_nodes_config if nid == self.node_id or nid in self.active_nodes]
+
+    def _on_leader_elected(self, leader_id):
+        self.leader_id = leader_id
+        self._on_leadership_change()
+        if leader_id == self.node_id:
+            log.info("Node %s is the new LEADER.", self.node_id)
+
+    def _broadcast_election(self, targets, message_type, timeout, callback):
+        """Envia ELECTION/COORDINATOR a todos os alvos em paralelo e entrega quem respondeu quando todos terminarem."""
+        if not targets:
+            callback(set())
             return
-        self.election_in_progress = True
-        print(f"Node {self.node_id} starts an ELECTION.")
-        
-        higher_nodes = [nid for nid in self.all_nodes_config if nid > self.node_id]
-        responses = 0
-        
-        for nid in higher_nodes:
+        msg_type = service_pb2.ElectionMessage.ELECTION if message_type == 'ELECTION' else service_pb2.ElectionMessage.COORDINATOR
+        state = {'pending': len(targets), 'responders': set()}
+        lock = threading.Lock()
+
+        def on_done(nid, future):
+            responded = False
+            if future is not None and future.code() == grpc.StatusCode.OK:
+                response = future.result()
+                self.clock.update(response.lamport_time)
+                responded = message_type != 'ELECTION' or response.status == "OK"
+            elif message_type == 'COORDINATOR':
+                log.warning("Node %s could not announce leadership to %s.", self.node_id, nid)
+            with lock:
+                if responded:
+                    state['responders'].add(nid)
+                state['pending'] -= 1
+                finished = state['pending'] == 0
+            if finished:
+                callback(state['responders'])
+
+        for nid in targets:
+            request = service_pb2.ElectionMessage(type=msg_type, sender_id=self.node_id, lamport_time=self.clock.increment(),
+                                                  **self._channel_stamp(nid))
             try:
-                with self._create_stub(nid) as stub:
-                    request = service_pb2.ElectionMessage(type=service_pb2.ElectionMessage.ELECTION, sender_id=self.node_id, lamport_time=self.clock.increment())
-                    stub.HandleElection(request, timeout=1)
-                    responses += 1 # Resposta 'OK' implícita
+                future = self._create_stub(nid).HandleElection.future(request, timeout=timeout)
             except grpc.RpcError:
-                pass # Nó não respondeu, considerado inativo
+                on_done(nid, None)
+                continue
+            future.add_done_callback(functools.partial(on_done, nid))
 
-        if responses == 0:
-            self.announce_coordinator()
+    def send_task(self, target_id, task_name):
+        """Envia uma tarefa autenticada para outro nó do grupo pelo canal persistente."""
+        delta = self.vector_clock.prepare_send(target_id)
+        vc_index, vc_value = _split_delta(delta)
+        request = service_pb2.TaskRequest(task_name=task_name, lamport_time=self.clock.increment(), sender_id=self.node_id,
+                                          vc_index=vc_index, vc_value=vc_value, **self._channel_stamp(target_id))
+        response = self._create_stub(target_id).ExecuteTask(request, metadata=auth_metadata(self._auth_token()))
+        self.clock.update(response.lamport_time)
+        self.vector_clock.merge_and_tick(zip(response.vc_index, response.vc_value))
+        self.vector_clock.acknowledge(target_id, delta)
+        return response.status
 
-    def announce_coordinator(self):
-        self.leader_id = self.node_id
-        self.election_in_progress = False
-        print(f"Node {self.node_id} is the new LEADER.")
-        
-        for nid in self.all_nodes_config:
-            if nid != self.node_id:
-                try:
-                    with self._create_stub(nid) as stub:
-                        request = service_pb2.ElectionMessage(type=service_pb2.ElectionMessage.COORDINATOR, sender_id=self.node_id, lamport_time=self.clock.increment())
-                        stub.HandleElection(request)
-                except grpc.RpcError:
-                    print(f"Node {self.node_id} could not announce leadership to {nid}.")
+    def send_tasks(self, target_id, tasks, timeout=None):
+        """Envia várias tarefas (task_id, task_name) em um único stream; gera (task_id, status) conforme terminam."""
+        sent = {} # task_id -> delta enviado, confirmado quando a resposta da tarefa chega
+
+        def requests():
+            for task_id, task_name in tasks:
+                delta = sent[str(task_id)] = self.vector_clock.prepare_send(target_id)
+                vc_index, vc_value = _split_delta(delta)
+                yield service_pb2.TaskRequest(task_id=str(task_id), task_name=task_name, lamport_time=self.clock.increment(),
+                                              sender_id=self.node_id, vc_index=vc_index, vc_value=vc_value,
+                                              **self._channel_stamp(target_id))
+
+        responses = self._create_stub(target_id).ExecuteTasks(requests(), timeout=timeout,
+                                                               metadata=auth_metadata(self._auth_token()))
+        for response in responses:
+            self.clock.update(response.lamport_time)
+            self.vector_clock.merge_and_tick(zip(response.vc_index, response.vc_value))
+            self.vector_clock.acknowledge(target_id, sent.pop(response.task_id))
+            yield response.task_id, response.status
+
+    # --- Task Scheduling (líder) ---
+    def _dispatch_task(self, target_id, task_id, task_name, callback):
+        if target_id == self.node_id:
+            self.task_executor.submit(lambda: callback(True, self._run_task(task_name), self.tasks_in_progress))
+            return
+        delta = self.vector_clock.prepare_send(target_id)
+        vc_index, vc_value = _split_delta(delta)
+        request = service_pb2.TaskRequest(task_id=task_id, task_name=task_name, lamport_time=self.clock.increment(),
+                                          sender_id=self.node_id, vc_index=vc_index, vc_value=vc_value,
+                                          **self._channel_stamp(target_id))
+        try:
+            future = self._create_stub(target_id).ExecuteTask.future(request, timeout=SCHEDULER_DISPATCH_TIMEOUT,
+                                                                     metadata=auth_metadata(self._auth_token()))
+        except grpc.RpcError:
+            callback(False)
+            return
+        future.add_done_callback(functools.partial(self._on_task_done, target_id, delta, callback))
+
+    def _on_task_done(self, target_id, delta, callback, future):
+        if future.code() != grpc.StatusCode.OK:
+            callback(False) # Sem confirmação: o próximo delta para target_id repete estas entradas
+            return
+        response = future.result()
+        self.clock.update(response.lamport_time)
+        self.vector_clock.merge_and_tick(zip(response.vc_index, response.vc_value))
+        self.vector_clock.acknowledge(target_id, delta)
+        callback(True, response.status, response.queue_depth)
+
+    def _replicate_tasks(self, stream, seq, ops):
+        ops = [service_pb2.TaskOp(op=_TASK_OP_CODES[op], task_id=task_id, task_name=task_name) for op, task_id, task_name in ops]
+        for nid in list(self.active_nodes):
+            request = service_pb2.TaskSyncMessage(sender_id=self.node_id, lamport_time=self.clock.increment(), ops=ops,
+                                                  stream=stream, seq=seq)
+            try:
+                # Assíncrono: a fila replicada só é lida por um novo líder
+                self._create_stub(nid).TaskSync.future(request, timeout=ELECTION_TIMEOUT,
+                                                       metadata=auth_metadata(self._auth_token()))
+            except grpc.RpcError:
+                pass
 
     # --- Heartbeat & Failure Detection ---
-    def _send_heartbeats(self):
-        while self.is_running:
-            time.sleep(HEARTBEAT_INTERVAL)
-            for nid in list(self.active_nodes.keys()):
-                try:
-                    with self._create_stub(nid) as stub:
-                        request = service_pb2.HeartbeatMessage(sender_id=self.node_id, lamport_time=self.clock.increment())
-                        response = stub.Heartbeat(request, timeout=1)
-                        self.clock.update(response.lamport_time)
-                except grpc.RpcError:
-                    print(f"Heartbeat to Node {nid} failed.")
-                    # A falha é tratada no _check_failures
-
-    def _check_failures(self):
-        while self.is_running:
-            time.sleep(HEARTBEAT_INTERVAL)
-            now = time.time()
-            for nid, last_seen in list(self.active_nodes.items()):
-                if now - last_seen > HEARTBEAT_TIMEOUT:
-                    print(f"Node {self.node_id} detected failure of Node {nid}.")
-                    del self.active_nodes[nid]
-                    if nid == self.leader_id:
-                        print(f"LEADER {nid} failed! Starting new election.")
-                        self.start_election()
+    def _heartbeat_round(self):
+        """Envia heartbeats em paralelo aos nós ativos que estão quietos, sob um único prazo para a rodada.
+
+        Não bloqueia: a rodada é fechada pelo callback da última resposta, no máximo no prazo do RPC.
+        """
+        # O laço de envio conta como uma pendência, para a rodada não fechar antes de todos os envios
+        round_state = {'started': time.monotonic(), 'pending': 1, 'peers': 0, 'failed': [], 'rtt': {},
+                       'lock': threading.Lock()}
+        for nid in self._quiet_peers():
+            try:
+                request = service_pb2.HeartbeatMessage(sender_id=self.node_id, lamport_time=self.clock.increment())
+                # As chamadas assíncronas são multiplexadas no canal persistente de cada par
+                future = self._create_stub(nid).Heartbeat.future(request, timeout=HEARTBEAT_ROUND_DEADLINE)
+            except grpc.RpcError:
+                continue
+            with round_state['lock']:
+                round_state['pending'] += 1
+                round_state['peers'] += 1
+            future.add_done_callback(functools.partial(self._on_heartbeat_done, nid, time.monotonic(), round_state))
+        self._settle_heartbeat(round_state)
+
+    def _on_heartbeat_done(self, nid, sent_at, round_state, future):
+        ok = future.code() == grpc.StatusCode.OK
+        if ok:
+            self.clock.update(future.result().lamport_time)
+        else:
+            log.debug("Heartbeat to Node %s failed.", nid) # A falha é tratada no _check_failures
+        with round_state['lock']:
+            if ok:
+                round_state['rtt'][nid] = self.peer_rtt[nid] = time.monotonic() - sent_at
+                self.heartbeat_rtt.observe(round_state['rtt'][nid])
+            else:
+                round_state['failed'].append(nid)
+        self._settle_heartbeat(round_state)
+
+    def _settle_heartbeat(self, round_state):
+        with round_state['lock']:
+            round_state['pending'] -= 1
+            if round_state['pending']:
+                return
+        self.last_heartbeat_round = {
+            'duration': time.monotonic() - round_state['started'],
+            'peers': round_state['peers'],
+            'failed': round_state['failed'],
+            'rtt': round_state['rtt'],
+        }
+
+    # --- Snapshot Transport ---
+    def _channel_stamp(self, target_id):
+        # Campos do carimbo do snapshot em TaskRequest/ElectionMessage: os canais não são FIFO
+        seq, snapshots = self.snapshots.stamp(target_id)
+        return {'channel_seq': seq, 'snapshots': snapshots}
+
+    def _send_markers(self, snapshot_id, cutoffs):
+        for nid, sent in cutoffs.items():
+            request = service_pb2.MarkerMessage(snapshot_id=snapshot_id, sender_id=self.node_id, lamport_time=self.clock.increment(),
+                                                sent=sent)
+            try:
+                # Fire-and-forget: o snapshot não espera a entrega para seguir processando tarefas
+                self._create_stub(nid).Marker.future(request, timeout=ELECTION_TIMEOUT)
+            except grpc.RpcError:
+                log.warning("Node %s could not send snapshot marker to %s.", self.node_id, nid)
+
+    # --- SWIM Transport ---
+    def _swim_ping(self, target_id, updates, timeout, callback):
+        request = service_pb2.HeartbeatMessage(sender_id=self.node_id, lamport_time=self.clock.increment(),
+                                               updates=_encode_updates(updates))
+        try:
+            future = self._create_stub(target_id).Heartbeat.future(request, timeout=timeout)
+        except grpc.RpcError:
+            callback(False, [])
+            return
+        future.add_done_callback(functools.partial(self._on_swim_reply, callback))
+
+    def _swim_ping_req(self, helper_id, target_id, updates, timeout, callback):
+        request = service_pb2.PingReqMessage(sender_id=self.node_id, target_id=target_id, lamport_time=self.clock.increment(),
+                                             updates=_encode_updates(updates))
+        try:
+            future = self._create_stub(helper_id).PingReq.future(request, timeout=timeout)
+        except grpc.RpcError:
+            callback(False, [])
+            return
+        future.add_done_callback(functools.partial(self._on_swim_reply, callback))
+
+    def _on_swim_reply(self, callback, future):
+        if future.code() != grpc.StatusCode.OK:
+            callback(False, [])
+            return
+        response = future.result()
+        self.clock.update(response.lamport_time)
+        callback(response.status == service_pb2.HeartbeatResponse.ALIVE, _decode_updates(response.updates))
+
+    # --- Lease Transport ---
+    def _renew_lease(self, leader_id, timeout, callback):
+        request = service_pb2.LeaseRequest(sender_id=self.node_id, lamport_time=self.clock.increment(),
+                                           updates=_encode_updates(self.membership.piggyback()))
+        try:
+            future = self._create_stub(leader_id).RenewLease.future(request, timeout=timeout)
+        except grpc.RpcError:
+            callback(False, False)
+            return
+        future.add_done_callback(functools.partial(self._on_lease_reply, leader_id, callback))
+
+    def _on_lease_reply(self, leader_id, callback, future):
+        if future.code() != grpc.StatusCode.OK:
+            callback(False, False)
+            return
+        response = future.result()
+        self.clock.update(response.lamport_time)
+        self.membership.record_reply(leader_id, _decode_updates(response.updates))
+        callback(True, response.granted)
 
     # --- Helper & Lifecycle Methods ---
     def _create_stub(self, target_id):
-        channel = grpc.insecure_channel(f"{self.all_nodes_config[target_id]['host']}:{self.all_nodes_config[target_id]['port']}")
-        return service_pb2_grpc.NodeAServiceStub(channel)
+        # Reutiliza o canal persistente do pool em vez de abrir uma conexão por chamada
+        return self.channel_pool.get_stub(target_id)
 
     def run(self):
-        print(f"Starting Node {self.node_id} (Group A) on port {self.all_nodes_config[self.node_id]['port']}")
-        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-        service_pb2_grpc.add_NodeAServicer_to_server(self, self.server)
+        log.info("Starting Node %s (Group A) on port %s", self.node_id, self.all_nodes_config[self.node_id]['port'])
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=10),
+                                  # A autenticação vem primeiro: só chamadas aceitas contam como sinal de vida
+                                  interceptors=[AuthInterceptor(AUTH_PROTECTED_METHODS), PeerInterceptor(self._heard_from)])
+        service_pb2_grpc.add_NodeAServiceServicer_to_server(self, self.server)
         self.server.add_insecure_port(f"[::]:{self.all_nodes_config[self.node_id]['port']}")
         self.server.start()
+        self.ready.set()
 
-        threading.Thread(target=self._send_heartbeats, daemon=True).start()
-        threading.Thread(target=self._check_failures, daemon=True).start()
-        
-        time.sleep(5) # Espera para que outros nós iniciem
-        self.start_election()
-
-        try:
-            while self.is_running:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            self.stop()
+        self._start_failure_detection()
+        # A partir daqui o nó vive nos temporizadores e no servidor gRPC
+        self._start_election_on_quorum(self._swim_ping)
 
     def stop(self):
         super().stop()
         if self.server:
             self.server.stop(0)
+        self.channel_pool.close()
+        self.task_executor.shutdown(wait=False)
+        log.info("Node %s channel pool stats: %s", self.node_id, self.channel_pool.get_stats())
+        log.info("Node %s election stats: %s, last: %s", self.node_id, self.election.stats, self.election.last_election)
+        log.info("Node %s scheduler stats: %s", self.node_id, self.scheduler.get_stats())
+
+_TASK_OP_CODES = {OP_ADD: service_pb2.TaskOp.ADD, OP_DONE: service_pb2.TaskOp.DONE}
+_TASK_OPS = {code: op for op, code in _TASK_OP_CODES.items()}
+
+def _encode_updates(updates):
+    return [service_pb2.MemberUpdate(node_id=nid, status=status, incarnation=incarnation) for nid, status, incarnation in updates]
+
+def _decode_updates(updates):
+    return [(u.node_id, u.status, u.incarnation) for u in updates]
+
+def _snapshot_stamp(request):
+    # channel_seq = 0: remetente sem carimbo, tratado como canal FIFO
+    return (request.channel_seq, list(request.snapshots)) if request.channel_seq else None
+
+def _split_delta(delta):
+    # Pares (índice, valor) viram dois campos repeated empacotados no protobuf
+    return [i for i, _ in delta], [value for _, value in delta]
@@ -0,0 +1,82 @@
+import collections
+import functools
+
+import grpc
+
+PEER_METADATA_KEY = 'x-simula-peer'
+
+def peer_metadata(node_id, lamport_time):
+    """Metadado gRPC com o remetente e o seu tempo de Lamport, no formato '<id>:<tempo>'."""
+    return (PEER_METADATA_KEY, f"{node_id}:{lamport_time}")
+
+def read_peer(metadata):
+    """Retorna (node_id, lamport_time) do metadado do remetente, ou None se ausente ou malformado."""
+    for key, value in metadata or ():
+        if key == PEER_METADATA_KEY:
+            node_id, _, lamport_time = value.partition(':')
+            try:
+                return int(node_id), int(lamport_time)
+            except ValueError:
+                return None
+    return None
+
+class _CallDetails(collections.namedtuple('_CallDetails', ('method', 'timeout', 'metadata', 'credentials',
+                                                            'wait_for_ready', 'compression')),
+                   grpc.ClientCallDetails):
+    pass
+
+class PeerStampInterceptor(grpc.UnaryUnaryClientInterceptor, grpc.StreamStreamClientInterceptor):
+    """Lado cliente, um por canal: carimba cada chamada ao par com o id e o relógio deste nó (`stamp()`)
+    e chama on_reply(peer_id) quando o par responde com sucesso."""
+
+    def __init__(self, peer_id, stamp, on_reply=None):
+        self.peer_id = peer_id
+        self.stamp = stamp
+        self.on_reply = on_reply
+
+    def _details(self, details):
+        metadata = list(details.metadata or ())
+        metadata.append(peer_metadata(*self.stamp()))
+        return _CallDetails(details.method, details.timeout, metadata, details.credentials,
+                            getattr(details, 'wait_for_ready', None), getattr(details, 'compression', None))
+
+    def _done(self, call):
+        if call.code() == grpc.StatusCode.OK:
+            self.on_reply(self.peer_id)
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        call = continuation(self._details(client_call_details), request)
+        if self.on_reply is not None:
+            call.add_done_callback(self._done)
+        return call
+
+    def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        call = continuation(self._details(client_call_details), request_iterator)
+        if self.on_reply is not None:
+            call.add_done_callback(self._done)
+        return call
+
+def _notify_first(behavior, notify):
+    def wrapper(request, context):
+        notify()
+        return behavior(request, context)
+    return wrapper
+
+class PeerInterceptor(grpc.ServerInterceptor):
+    """Lado servidor: entrega on_peer(node_id, lamport_time) de toda chamada carimbada, logo antes do handler.
+
+    O aviso sai de dentro do handler, e não da interceptação: uma chamada negada por um interceptor
+    anterior (autenticação) nunca chega ao handler e não conta como sinal de vida.
+    """
+
+    def __init__(self, on_peer):
+        self.on_peer = on_peer
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        peer = read_peer(handler_call_details.invocation_metadata)
+        if handler is None or peer is None:
+            return handler
+        notify = functools.partial(self.on_peer, *peer)
+        kind = ('stream' if handler.request_streaming else 'unary') + '_' + ('stream' if handler.response_streaming else 'unary')
+        return handler._replace(**{kind: _notify_first(getattr(handler, kind), notify)})
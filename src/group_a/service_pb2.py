@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: src/group_a/service.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'src/group_a/service.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x19src/group_a/service.proto\x12\x07group_a\"\xa6\x01\n\x0bTaskRequest\x12\x11\n\ttask_name\x18\x01 \x01(\t\x12\x14\n\x0clamport_time\x18\x02 \x01(\x05\x12\x11\n\tsender_id\x18\x03 \x01(\x05\x12\x10\n\x08vc_index\x18\x04 \x03(\r\x12\x10\n\x08vc_value\x18\x05 \x03(\x04\x12\x0f\n\x07task_id\x18\x06 \x01(\t\x12\x13\n\x0b\x63hannel_seq\x18\x07 \x01(\x04\x12\x11\n\tsnapshots\x18\x08 \x03(\t\"~\n\x0cTaskResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x14\n\x0clamport_time\x18\x02 \x01(\x05\x12\x10\n\x08vc_index\x18\x03 \x03(\r\x12\x10\n\x08vc_value\x18\x04 \x03(\x04\x12\x0f\n\x07task_id\x18\x05 \x01(\t\x12\x13\n\x0bqueue_depth\x18\x06 \x01(\x05\"e\n\x06TaskOp\x12\x1e\n\x02op\x18\x01 \x01(\x0e\x32\x12.group_a.TaskOp.Op\x12\x0f\n\x07task_id\x18\x02 \x01(\t\x12\x11\n\ttask_name\x18\x03 \x01(\t\"\x17\n\x02Op\x12\x07\n\x03\x41\x44\x44\x10\x00\x12\x08\n\x04\x44ONE\x10\x01\"u\n\x0fTaskSyncMessage\x12\x11\n\tsender_id\x18\x01 \x01(\x05\x12\x14\n\x0clamport_time\x18\x02 \x01(\x05\x12\x1c\n\x03ops\x18\x03 \x03(\x0b\x32\x0f.group_a.TaskOp\x12\x0e\n\x06stream\x18\x04 \x01(\r\x12\x0b\n\x03seq\x18\x05 \x01(\x04\"(\n\x10TaskSyncResponse\x12\x14\n\x0clamport_time\x18\x01 \x01(\x05\"\xcc\x01\n\x0f\x45lectionMessage\x12\x32\n\x04type\x18\x01 \x01(\x0e\x32$.group_a.ElectionMessage.MessageType\x12\x11\n\tsender_id\x18\x02 \x01(\x05\x12\x14\n\x0clamport_time\x18\x03 \x01(\x05\x12\x13\n\x0b\x63hannel_seq\x18\x04 \x01(\x04\x12\x11\n\tsnapshots\x18\x05 \x03(\t\"4\n\x0bMessageType\x12\x0c\n\x08\x45LECTION\x10\x00\x12\x06\n\x02OK\x10\x01\x12\x0f\n\x0b\x43OORDINATOR\x10\x02\"8\n\x10\x45lectionResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x14\n\x0clamport_time\x18\x02 \x01(\x05\"\x8e\x01\n\x0cMemberUpdate\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12,\n\x06status\x18\x02 \x01(\x0e\x32\x1c.group_a.MemberUpdate.Status\x12\x13\n\x0bincarnation\x18\x03 \x01(\x05\"*\n\x06Status\x12\t\n\x05\x41LIVE\x10\x00\x12\x0b\n\x07SUSPECT\x10\x01\x12\x08\n\x04\x44\x45\x41\x44\x10\x02\"c\n\x10HeartbeatMessage\x12\x11\n\tsender_id\x18\x01 \x01(\x05\x12\x14\n\x0clamport_time\x18\x02 \x01(\x05\x12&\n\x07updates\x18\x03 \x03(\x0b\x32\x15.group_a.MemberUpdate\"\xaa\x01\n\x11HeartbeatResponse\x12\x31\n\x06status\x18\x01 \x01(\x0e\x32!.group_a.HeartbeatResponse.Status\x12\x14\n\x0clamport_time\x18\x02 \x01(\x05\x12&\n\x07updates\x18\x03 \x03(\x0b\x32\x15.group_a.MemberUpdate\"$\n\x06Status\x12\t\n\x05\x41LIVE\x10\x00\x12\x0f\n\x0bUNREACHABLE\x10\x01\"t\n\x0ePingReqMessage\x12\x11\n\tsender_id\x18\x01 \x01(\x05\x12\x11\n\ttarget_id\x18\x02 \x01(\x05\x12\x14\n\x0clamport_time\x18\x03 \x01(\x05\x12&\n\x07updates\x18\x04 \x03(\x0b\x32\x15.group_a.MemberUpdate\"_\n\x0cLeaseRequest\x12\x11\n\tsender_id\x18\x01 \x01(\x05\x12\x14\n\x0clamport_time\x18\x02 \x01(\x05\x12&\n\x07updates\x18\x03 \x03(\x0b\x32\x15.group_a.MemberUpdate\"^\n\rLeaseResponse\x12\x0f\n\x07granted\x18\x01 \x01(\x08\x12\x14\n\x0clamport_time\x18\x02 \x01(\x05\x12&\n\x07updates\x18\x03 \x03(\x0b\x32\x15.group_a.MemberUpdate\"[\n\rMarkerMessage\x12\x13\n\x0bsnapshot_id\x18\x01 \x01(\t\x12\x11\n\tsender_id\x18\x02 \x01(\x05\x12\x14\n\x0clamport_time\x18\x03 \x01(\x05\x12\x0c\n\x04sent\x18\x04 \x01(\x04\"&\n\x0eMarkerResponse\x12\x14\n\x0clamport_time\x18\x01 \x01(\x05\x32\x9f\x04\n\x0cNodeAService\x12<\n\x0b\x45xecuteTask\x12\x14.group_a.TaskRequest\x1a\x15.group_a.TaskResponse\"\x00\x12\x41\n\x0c\x45xecuteTasks\x12\x14.group_a.TaskRequest\x1a\x15.group_a.TaskResponse\"\x00(\x01\x30\x01\x12\x41\n\x08TaskSync\x12\x18.group_a.TaskSyncMessage\x1a\x19.group_a.TaskSyncResponse\"\x00\x12G\n\x0eHandleElection\x12\x18.group_a.ElectionMessage\x1a\x19.group_a.ElectionResponse\"\x00\x12\x44\n\tHeartbeat\x12\x19.group_a.HeartbeatMessage\x1a\x1a.group_a.HeartbeatResponse\"\x00\x12@\n\x07PingReq\x12\x17.group_a.PingReqMessage\x1a\x1a.group_a.HeartbeatResponse\"\x00\x12=\n\nRenewLease\x12\x15.group_a.LeaseRequest\x1a\x16.group_a.LeaseResponse\"\x00\x12;\n\x06Marker\x12\x16.group_a.MarkerMessage\x1a\x17.group_a.MarkerResponse\"\x00\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'src.group_a.service_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_TASKREQUEST']._serialized_start=39
+  _globals['_TASKREQUEST']._serialized_end=205
+  _globals['_TASKRESPONSE']._serialized_start=207
+  _globals['_TASKRESPONSE']._serialized_end=333
+  _globals['_TASKOP']._serialized_start=335
+  _globals['_TASKOP']._serialized_end=436
+  _globals['_TASKOP_OP']._serialized_start=413
+  _globals['_TASKOP_OP']._serialized_end=436
+  _globals['_TASKSYNCMESSAGE']._serialized_start=438
+  _globals['_TASKSYNCMESSAGE']._serialized_end=555
+  _globals['_TASKSYNCRESPONSE']._serialized_start=557
+  _globals['_TASKSYNCRESPONSE']._serialized_end=597
+  _globals['_ELECTIONMESSAGE']._serialized_start=600
+  _globals['_ELECTIONMESSAGE']._serialized_end=804
+  _globals['_ELECTIONMESSAGE_MESSAGETYPE']._serialized_start=752
+  _globals['_ELECTIONMESSAGE_MESSAGETYPE']._serialized_end=804
+  _globals['_ELECTIONRESPONSE']._serialized_start=806
+  _globals['_ELECTIONRESPONSE']._serialized_end=862
+  _globals['_MEMBERUPDATE']._serialized_start=865
+  _globals['_MEMBERUPDATE']._serialized_end=1007
+  _globals['_MEMBERUPDATE_STATUS']._serialized_start=965
+  _globals['_MEMBERUPDATE_STATUS']._serialized_end=1007
+  _globals['_HEARTBEATMESSAGE']._serialized_start=1009
+  _globals['_HEARTBEATMESSAGE']._serialized_end=1108
+  _globals['_HEARTBEATRESPONSE']._serialized_start=1111
+  _globals['_HEARTBEATRESPONSE']._serialized_end=1281
+  _globals['_HEARTBEATRESPONSE_STATUS']._serialized_start=1245
+  _globals['_HEARTBEATRESPONSE_STATUS']._serialized_end=1281
+  _globals['_PINGREQMESSAGE']._serialized_start=1283
+  _globals['_PINGREQMESSAGE']._serialized_end=1399
+  _globals['_LEASEREQUEST']._serialized_start=1401
+  _globals['_LEASEREQUEST']._serialized_end=1496
+  _globals['_LEASERESPONSE']._serialized_start=1498
+  _globals['_LEASERESPONSE']._serialized_end=1592
+  _globals['_MARKERMESSAGE']._serialized_start=1594
+  _globals['_MARKERMESSAGE']._serialized_end=1685
+  _globals['_MARKERRESPONSE']._serialized_start=1687
+  _globals['_MARKERRESPONSE']._serialized_end=1725
+  _globals['_NODEASERVICE']._serialized_start=1728
+  _globals['_NODEASERVICE']._serialized_end=2271
+# @@protoc_insertion_point(module_scope)
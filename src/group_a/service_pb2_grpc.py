@@ -0,0 +1,402 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from src.group_a import service_pb2 as src_dot_group__a_dot_service__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in src/group_a/service_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class NodeAServiceStub:
+    """Definição do serviço
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ExecuteTask = channel.unary_unary(
+                '/group_a.NodeAService/ExecuteTask',
+                request_serializer=src_dot_group__a_dot_service__pb2.TaskRequest.SerializeToString,
+                response_deserializer=src_dot_group__a_dot_service__pb2.TaskResponse.FromString,
+                _registered_method=True)
+        self.ExecuteTasks = channel.stream_stream(
+                '/group_a.NodeAService/ExecuteTasks',
+                request_serializer=src_dot_group__a_dot_service__pb2.TaskRequest.SerializeToString,
+                response_deserializer=src_dot_group__a_dot_service__pb2.TaskResponse.FromString,
+                _registered_method=True)
+        self.TaskSync = channel.unary_unary(
+                '/group_a.NodeAService/TaskSync',
+                request_serializer=src_dot_group__a_dot_service__pb2.TaskSyncMessage.SerializeToString,
+                response_deserializer=src_dot_group__a_dot_service__pb2.TaskSyncResponse.FromString,
+                _registered_method=True)
+        self.HandleElection = channel.unary_unary(
+                '/group_a.NodeAService/HandleElection',
+                request_serializer=src_dot_group__a_dot_service__pb2.ElectionMessage.SerializeToString,
+                response_deserializer=src_dot_group__a_dot_service__pb2.ElectionResponse.FromString,
+                _registered_method=True)
+        self.Heartbeat = channel.unary_unary(
+                '/group_a.NodeAService/Heartbeat',
+                request_serializer=src_dot_group__a_dot_service__pb2.HeartbeatMessage.SerializeToString,
+                response_deserializer=src_dot_group__a_dot_service__pb2.HeartbeatResponse.FromString,
+                _registered_method=True)
+        self.PingReq = channel.unary_unary(
+                '/group_a.NodeAService/PingReq',
+                request_serializer=src_dot_group__a_dot_service__pb2.PingReqMessage.SerializeToString,
+                response_deserializer=src_dot_group__a_dot_service__pb2.HeartbeatResponse.FromString,
+                _registered_method=True)
+        self.RenewLease = channel.unary_unary(
+                '/group_a.NodeAService/RenewLease',
+                request_serializer=src_dot_group__a_dot_service__pb2.LeaseRequest.SerializeToString,
+                response_deserializer=src_dot_group__a_dot_service__pb2.LeaseResponse.FromString,
+                _registered_method=True)
+        self.Marker = channel.unary_unary(
+                '/group_a.NodeAService/Marker',
+                request_serializer=src_dot_group__a_dot_service__pb2.MarkerMessage.SerializeToString,
+                response_deserializer=src_dot_group__a_dot_service__pb2.MarkerResponse.FromString,
+                _registered_method=True)
+
+
+class NodeAServiceServicer:
+    """Definição do serviço
+    """
+
+    def ExecuteTask(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExecuteTasks(self, request_iterator, context):
+        """Tarefas em lote: as respostas saem na ordem em que terminam, não na ordem de envio
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TaskSync(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def HandleElection(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Heartbeat(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PingReq(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RenewLease(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Marker(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_NodeAServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ExecuteTask': grpc.unary_unary_rpc_method_handler(
+                    servicer.ExecuteTask,
+                    request_deserializer=src_dot_group__a_dot_service__pb2.TaskRequest.FromString,
+                    response_serializer=src_dot_group__a_dot_service__pb2.TaskResponse.SerializeToString,
+            ),
+            'ExecuteTasks': grpc.stream_stream_rpc_method_handler(
+                    servicer.ExecuteTasks,
+                    request_deserializer=src_dot_group__a_dot_service__pb2.TaskRequest.FromString,
+                    response_serializer=src_dot_group__a_dot_service__pb2.TaskResponse.SerializeToString,
+            ),
+            'TaskSync': grpc.unary_unary_rpc_method_handler(
+                    servicer.TaskSync,
+                    request_deserializer=src_dot_group__a_dot_service__pb2.TaskSyncMessage.FromString,
+                    response_serializer=src_dot_group__a_dot_service__pb2.TaskSyncResponse.SerializeToString,
+            ),
+            'HandleElection': grpc.unary_unary_rpc_method_handler(
+                    servicer.HandleElection,
+                    request_deserializer=src_dot_group__a_dot_service__pb2.ElectionMessage.FromString,
+                    response_serializer=src_dot_group__a_dot_service__pb2.ElectionResponse.SerializeToString,
+            ),
+            'Heartbeat': grpc.unary_unary_rpc_method_handler(
+                    servicer.Heartbeat,
+                    request_deserializer=src_dot_group__a_dot_service__pb2.HeartbeatMessage.FromString,
+                    response_serializer=src_dot_group__a_dot_service__pb2.HeartbeatResponse.SerializeToString,
+            ),
+            'PingReq': grpc.unary_unary_rpc_method_handler(
+                    servicer.PingReq,
+                    request_deserializer=src_dot_group__a_dot_service__pb2.PingReqMessage.FromString,
+                    response_serializer=src_dot_group__a_dot_service__pb2.HeartbeatResponse.SerializeToString,
+            ),
+            'RenewLease': grpc.unary_unary_rpc_method_handler(
+                    servicer.RenewLease,
+                    request_deserializer=src_dot_group__a_dot_service__pb2.LeaseRequest.FromString,
+                    response_serializer=src_dot_group__a_dot_service__pb2.LeaseResponse.SerializeToString,
+            ),
+            'Marker': grpc.unary_unary_rpc_method_handler(
+                    servicer.Marker,
+                    request_deserializer=src_dot_group__a_dot_service__pb2.MarkerMessage.FromString,
+                    response_serializer=src_dot_group__a_dot_service__pb2.MarkerResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'group_a.NodeAService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('group_a.NodeAService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class NodeAService:
+    """Definição do serviço
+    """
+
+    @staticmethod
+    def ExecuteTask(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/group_a.NodeAService/ExecuteTask',
+            src_dot_group__a_dot_service__pb2.TaskRequest.SerializeToString,
+            src_dot_group__a_dot_service__pb2.TaskResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExecuteTasks(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/group_a.NodeAService/ExecuteTasks',
+            src_dot_group__a_dot_service__pb2.TaskRequest.SerializeToString,
+            src_dot_group__a_dot_service__pb2.TaskResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TaskSync(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/group_a.NodeAService/TaskSync',
+            src_dot_group__a_dot_service__pb2.TaskSyncMessage.SerializeToString,
+            src_dot_group__a_dot_service__pb2.TaskSyncResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def HandleElection(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/group_a.NodeAService/HandleElection',
+            src_dot_group__a_dot_service__pb2.ElectionMessage.SerializeToString,
+            src_dot_group__a_dot_service__pb2.ElectionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Heartbeat(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/group_a.NodeAService/Heartbeat',
+            src_dot_group__a_dot_service__pb2.HeartbeatMessage.SerializeToString,
+            src_dot_group__a_dot_service__pb2.HeartbeatResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PingReq(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/group_a.NodeAService/PingReq',
+            src_dot_group__a_dot_service__pb2.PingReqMessage.SerializeToString,
+            src_dot_group__a_dot_service__pb2.HeartbeatResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RenewLease(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/group_a.NodeAService/RenewLease',
+            src_dot_group__a_dot_service__pb2.LeaseRequest.SerializeToString,
+            src_dot_group__a_dot_service__pb2.LeaseResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Marker(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/group_a.NodeAService/Marker',
+            src_dot_group__a_dot_service__pb2.MarkerMessage.SerializeToString,
+            src_dot_group__a_dot_service__pb2.MarkerResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,54 @@
+import threading
+
+import Pyro5.api
+import Pyro5.errors
+
+from src.common.token_manager import TokenManager
+from src.group_b.peer_annotations import clear_stamp, current_caller
+
+class AuthDaemon(Pyro5.api.Daemon):
+    """Daemon Pyro5 que só aceita conexões cujo handshake traz um token válido.
+
+    Com `on_peer`, cada chamada recebida com a anotação do remetente é informada como
+    on_peer(node_id, lamport_time, two_way), inclusive as oneway. Só contam as chamadas tratadas em
+    uma conexão autenticada cuja anotação traz o mesmo nó do token do handshake.
+
+    O `shutdown` também fecha as conexões já estabelecidas: no servidor de threads do Pyro5, cada uma
+    prende um worker que continuaria atendendo os proxies persistentes dos pares depois do shutdown.
+    """
+
+    def __init__(self, *args, on_peer=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_peer = on_peer
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+
+    def validateHandshake(self, conn, data):
+        payload = TokenManager.validate_token(data) if isinstance(data, str) else None
+        if payload is None:
+            raise Pyro5.errors.SecurityError("Invalid or expired token.")
+        conn.peer_node_id = payload['node_id'] # Identidade autenticada desta conexão
+        with self._connections_lock:
+            self._connections.add(conn)
+        return payload['node_id']
+
+    def clientDisconnect(self, conn):
+        with self._connections_lock:
+            self._connections.discard(conn)
+
+    def shutdown(self):
+        super().shutdown()
+        with self._connections_lock:
+            connections, self._connections = self._connections, set()
+        for conn in connections:
+            conn.close() # Acorda o worker bloqueado na leitura, que encerra a conexão
+
+    def handleRequest(self, conn):
+        if self.on_peer is None:
+            return super().handleRequest(conn)
+        # O Pyro5 não tem gancho antes da chamada; as anotações da mensagem ficam no contexto da thread
+        clear_stamp()
+        super().handleRequest(conn) # Erros de conexão ou segurança saem daqui sem contar como sinal de vida
+        caller = current_caller()
+        if caller is not None and caller[0] == getattr(conn, 'peer_node_id', None):
+            self.on_peer(*caller)
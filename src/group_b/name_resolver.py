@@ -0,0 +1,177 @@
+import Pyro5.api
+import Pyro5.errors
+import time
+import threading
+
+from src.config import get_pyro_name, NAME_CACHE_TTL
+from src.common.instrumentation import histogram, counter
+from src.group_b.peer_annotations import stamp_call, clear_stamp
+
+class NameResolver:
+    """Cache de resolução get_pyro_name -> URI com TTL e invalidação explícita."""
+
+    def __init__(self, ttl=NAME_CACHE_TTL):
+        self.ttl = ttl
+        self._cache = {}
+        self._ns = None
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'lookups': 0, 'invalidations': 0}
+
+    def resolve(self, node_id):
+        """Retorna a URI do nó, consultando o Name Server apenas se o cache expirou."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(node_id)
+            if cached and cached[1] > now:
+                self.stats['hits'] += 1
+                return cached[0]
+            self.stats['lookups'] += 1
+            # O proxy do NS só é usado com o lock adquirido, pois proxies não são thread-safe
+            try:
+                if self._ns is None:
+                    self._ns = Pyro5.api.locate_ns()
+                self._ns._pyroClaimOwnership()
+                uri = self._ns.lookup(get_pyro_name(node_id))
+            except Pyro5.errors.CommunicationError:
+                self._ns = None
+                raise
+            self._cache[node_id] = (uri, now + self.ttl)
+            return uri
+
+    def invalidate(self, node_id):
+        with self._lock:
+            if self._cache.pop(node_id, None) is not None:
+                self.stats['invalidations'] += 1
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+def wait_for_name_server(timeout):
+    """Sonda o Name Server até ele responder; retorna False se o prazo expirar."""
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while True:
+        try:
+            # Com o host explícito não há busca por broadcast, que levaria segundos para falhar
+            Pyro5.api.locate_ns(host=Pyro5.config.NS_HOST)
+            return True
+        except Pyro5.errors.NamingError:
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+
+class ProxyPool:
+    """Mantém um proxy Pyro5 por (thread, nó), já que proxies não podem ser compartilhados entre threads.
+
+    Com `stamp`, cada chamada leva nas anotações o (id, tempo de Lamport) retornado por stamp(), e
+    on_reply(node_id) é chamado a cada resposta (chamadas oneway não têm resposta).
+    """
+
+    def __init__(self, resolver, timeout=2, handshake=None, stamp=None, on_reply=None):
+        self.resolver = resolver
+        self.timeout = timeout
+        self.handshake = handshake
+        self.stamp = stamp
+        self.on_reply = on_reply
+        self._local = threading.local()
+        self._all_proxies = []
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _proxies(self):
+        proxies = getattr(self._local, 'proxies', None)
+        if proxies is None:
+            proxies = self._local.proxies = {}
+        return proxies
+
+    def get(self, node_id):
+        """Retorna o proxy da thread atual para o nó, criando-o a partir da URI em cache."""
+        proxies = self._proxies()
+        proxy = proxies.get(node_id)
+        if proxy is None:
+            proxy = Pyro5.api.Proxy(self.resolver.resolve(node_id))
+            proxy._pyroTimeout = self.timeout
+            if self.handshake is not None:
+                # Enviado uma vez por conexão e validado pelo AuthDaemon do nó remoto
+                proxy._pyroHandshake = self.handshake()
+            proxies[node_id] = proxy
+            with self._lock:
+                self._all_proxies.append(proxy)
+        return proxy
+
+    def invalidate(self, node_id):
+        """Descarta o proxy da thread atual e a URI em cache após uma falha de comunicação."""
+        proxy = self._proxies().pop(node_id, None)
+        if proxy is not None:
+            with self._lock:
+                if proxy in self._all_proxies:
+                    self._all_proxies.remove(proxy)
+            proxy._pyroRelease()
+        self.resolver.invalidate(node_id)
+
+    def _method_metrics(self, method):
+        metrics = self._metrics.get(method)
+        if metrics is None:
+            metrics = self._metrics[method] = (
+                histogram('simula_rpc_latency_seconds', "Latência das chamadas a outros nós.", method=method, transport='pyro'),
+                counter('simula_rpc_errors_total', "Chamadas a outros nós que falharam.", method=method, transport='pyro'),
+            )
+        return metrics
+
+    def call(self, node_id, method, *args, timeout=None):
+        """Invoca um método remoto no nó, invalidando o cache se a comunicação falhar."""
+        latency, errors = self._method_metrics(method)
+        started = time.perf_counter()
+        try:
+            proxy = self.get(node_id)
+            proxy._pyroTimeout = timeout or self.timeout
+            if self.stamp is not None:
+                stamp_call(*self.stamp())
+            result = getattr(proxy, method)(*args)
+            if self.on_reply is not None and method not in proxy._pyroOneway:
+                self.on_reply(node_id)
+            return result
+        except Pyro5.errors.CommunicationError:
+            errors.inc()
+            self.invalidate(node_id)
+            raise
+        finally:
+            if self.stamp is not None:
+                clear_stamp()
+            latency.observe(time.perf_counter() - started)
+
+    def batch(self, node_id, calls, timeout=None):
+        """Envia várias chamadas (método, args) em uma única requisição Pyro5; retorna um gerador com os resultados."""
+        latency, errors = self._method_metrics('batch')
+        started = time.perf_counter()
+        try:
+            proxy = self.get(node_id)
+            proxy._pyroTimeout = timeout or self.timeout
+            batch = Pyro5.api.BatchProxy(proxy)
+            for method, args in calls:
+                getattr(batch, method)(*args)
+            if self.stamp is not None:
+                stamp_call(*self.stamp())
+            results = batch()
+            if self.on_reply is not None:
+                self.on_reply(node_id)
+            return results
+        except Pyro5.errors.CommunicationError:
+            errors.inc()
+            self.invalidate(node_id)
+            raise
+        finally:
+            if self.stamp is not None:
+                clear_stamp()
+            latency.observe(time.perf_counter() - started)
+
+    def close(self):
+        with self._lock:
+            proxies, self._all_proxies = self._all_proxies, []
+        for proxy in proxies:
+            try:
+                proxy._pyroRelease()
+            except Exception:
+                pass
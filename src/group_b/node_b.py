@@ -1,131 +1,350 @@
 import Pyro5.api
 import time
 import threading
+from concurrent import futures
 
 from src.node import Node
-from src.config import GROUP_B_NODES, get_pyro_name, HEARTBEAT_INTERVAL, HEARTBEAT_TIMEOUT
+from src.config import (GROUP_B_NODES, get_pyro_name, PYRO_PROXY_TIMEOUT, HEARTBEAT_ROUND_DEADLINE,
+                        HEARTBEAT_FANOUT_WORKERS, SWIM_ACK_TIMEOUT, RING_ELECTION_TIMEOUT, TASK_WORKERS,
+                        STARTUP_PROBE_INTERVAL, STARTUP_RETRY_MAX)
+from src.common.ring_election import RingElection
+from src.group_b.name_resolver import NameResolver, ProxyPool
+from src.group_b.auth_daemon import AuthDaemon
+from src.common.instrumentation import span, get_logger
+
+log = get_logger('node_b')
 
 @Pyro5.api.expose
 class NodeB(Node):
-    def __init__(self, node_id):
-        super().__init__(node_id, 'B', GROUP_B_NODES)
-        self.active_nodes = {nid: time.time() for nid in self.all_nodes_config if nid != self.node_id}
-        self.election_in_progress = False
+    def __init__(self, node_id, nodes_config=None, cluster_ids=None):
+        super().__init__(node_id, 'B', nodes_config or GROUP_B_NODES, cluster_ids)
+        self.active_nodes = {nid: self.now() for nid in self.all_nodes_config if nid != self.node_id}
+        self.election = RingElection(self.node_id, self.all_nodes_config, self._send_ring_message, self._is_alive,
+                                     on_leader=self._on_leader_elected, election_timeout=RING_ELECTION_TIMEOUT,
+                                     unreachable_ttl=RING_ELECTION_TIMEOUT, schedule=self.schedule, clock=self.now)
         self.next_node_id = self._get_next_node_id()
-        self.next_node_proxy = None
+        self.next_node_uri = None
+        self.pyro_daemon = None
+        self.resolver = NameResolver()
+        # Toda chamada leva o remetente e o relógio nas anotações; toda resposta conta como sinal de vida do par
+        self.proxy_pool = ProxyPool(self.resolver, timeout=PYRO_PROXY_TIMEOUT, handshake=self._auth_token,
+                                    stamp=self._peer_stamp, on_reply=self._heard_from)
+        self.heartbeat_executor = futures.ThreadPoolExecutor(max_workers=HEARTBEAT_FANOUT_WORKERS, thread_name_prefix=f"heartbeat-{node_id}")
+        self.task_executor = futures.ThreadPoolExecutor(max_workers=TASK_WORKERS, thread_name_prefix=f"tasks-{node_id}")
+        self.peer_rtt = {}
+        self.last_heartbeat_round = None
+        self.membership = self._create_membership(self._swim_ping, self._swim_ping_req)
+        self.lease = self._create_lease(self._renew_lease)
+        self.snapshots = self._create_snapshot_manager(self._send_markers)
+        self.scheduler = self._create_scheduler(self._dispatch_task, self._replicate_tasks)
 
     def _get_next_node_id(self):
-        sorted_ids = sorted(self.all_nodes_config.keys())
-        my_index = sorted_ids.index(self.node_id)
-        next_index = (my_index + 1) % len(sorted_ids)
-        return sorted_ids[next_index]
+        # Primeiro sucessor vivo segundo a membership, e não apenas o próximo da configuração estática
+        return self.election.next_node()
 
-    def _connect_to_next_node(self):
-        while self.is_running and self.next_node_proxy is None:
-            try:
-                pyro_name = get_pyro_name(self.next_node_id)
-                self.next_node_proxy = Pyro5.api.Proxy(f"PYRONAME:{pyro_name}")
-                self.next_node_proxy._pyroTimeout = 2
-                print(f"Node {self.node_id} connected to next node {self.next_node_id}")
-            except Pyro5.errors.NamingError:
-                print(f"Node {self.node_id} waiting for next node {self.next_node_id}...")
-                time.sleep(2)
+    def _is_alive(self, nid):
+        return nid in self.active_nodes
+
+    def _connect_to_next_node(self, retry_delay=STARTUP_PROBE_INTERVAL):
+        if not self.is_running or self.next_node_uri is not None or self.next_node_id is None:
+            return
+        try:
+            # Aquece o cache do resolvedor; os proxies são criados por thread sob demanda
+            self.next_node_uri = self.resolver.resolve(self.next_node_id)
+            log.info("Node %s connected to next node %s", self.node_id, self.next_node_id)
+        except Pyro5.errors.NamingError:
+            log.info("Node %s waiting for next node %s...", self.node_id, self.next_node_id)
+            # Recuo exponencial: o próximo nó costuma se registrar em milissegundos
+            self.schedule(retry_delay, lambda: self._connect_to_next_node(min(retry_delay * 2, STARTUP_RETRY_MAX)))
 
     # --- Remote Methods (Pyro5) ---
-    def execute_task(self, task_name, lamport_time):
+    def _refuse_if_stopped(self):
+        # Uma chamada que chegue entre o stop() e o fechamento da conexão não pode parecer sinal de vida
+        if not self.is_running:
+            raise Pyro5.errors.CommunicationError(f"Node {self.node_id} is stopped.")
+
+    def execute_task(self, task_name, lamport_time, sender_id=None, vector_delta=None, channel=None):
+        self._refuse_if_stopped()
+        reply_time = self.clock.update_and_increment(lamport_time)
+        self.vector_clock.merge_and_tick(vector_delta)
+        self.snapshots.on_message(sender_id, 'task', task_name, channel)
+        log.debug("Node %s (Clock: %s) received task: %s", self.node_id, reply_time, task_name)
+        with span('execute_task', reply_time, node=self.node_id, sender=sender_id):
+            status = self._run_task(task_name)
+        return {
+            'status': status,
+            'lamport_time': reply_time,
+            'vector_delta': self.vector_clock.prepare_send(sender_id),
+            'queue_depth': self.tasks_in_progress,
+        }
+
+    @Pyro5.api.oneway
+    def submit_tasks(self, tasks, sender_id, vector_delta=None):
+        """Executa um lote de (task_name, lamport_time, carimbo) sem resposta; não há delta de volta para o remetente."""
+        self.vector_clock.merge_and_tick(vector_delta)
+        for task_name, lamport_time, channel in tasks:
+            self.clock.update(lamport_time)
+            self.snapshots.on_message(sender_id, 'task', task_name, channel)
+            self._run_task(task_name)
+
+    @Pyro5.api.oneway
+    def sync_tasks(self, ops, sender_id, lamport_time, stream, seq):
+        """Recebe um lote de operações (op, task_id, task_name) da fila replicada pelo líder."""
         self.clock.update(lamport_time)
-        print(f"Node {self.node_id} (Clock: {self.clock.get_time()}) received task: {task_name}")
-        return "Task completed", self.clock.increment()
+        self.scheduler.apply(sender_id, stream, seq, ops)
 
+    @Pyro5.api.oneway
     def handle_election_message(self, message):
-        self.clock.update(message['lamport_time'])
-        
-        if message['type'] == 'ELECTION':
-            if self.node_id in message['participants']:
-                # Eleição completou um ciclo
-                self.leader_id = max(message['participants'])
-                self.election_in_progress = False
-                print(f"Node {self.node_id} completed election. New leader is {self.leader_id}")
-                # Propaga a mensagem de COORDENADOR
-                self.pass_message({
-                    'type': 'COORDINATOR',
-                    'leader_id': self.leader_id,
-                    'lamport_time': self.clock.increment()
-                })
-            else:
-                # Adiciona a si mesmo e passa adiante
-                print(f"Node {self.node_id} participates in election.")
-                message['participants'].append(self.node_id)
-                message['lamport_time'] = self.clock.increment()
-                self.pass_message(message)
-        
-        elif message['type'] == 'COORDINATOR':
-            if self.leader_id != message['leader_id']:
-                self.leader_id = message['leader_id']
-                self.election_in_progress = False
-                print(f"Node {self.node_id} acknowledges new leader: {self.leader_id}")
-                self.pass_message(message) # Continua propagando para fechar o anel
-
-    def heartbeat(self, sender_id, lamport_time):
+        # Oneway: cada salto retorna imediatamente, sem encadear chamadas síncronas ao redor do anel
+        lamport_time = self.clock.update(message['lamport_time'])
+        self.snapshots.on_message(message.get('sender_id'), 'election', message, message.pop('channel', None))
+        with span('handle_election_message', lamport_time, node=self.node_id, sender=message.get('sender_id'),
+                  type=message.get('type')):
+            self.election.on_message(message)
+
+    @Pyro5.api.oneway
+    def receive_marker(self, snapshot_id, sender_id, lamport_time, sent=None):
         self.clock.update(lamport_time)
-        self.active_nodes[sender_id] = time.time()
-        return "ALIVE", self.clock.increment()
+        self.snapshots.on_marker(snapshot_id, sender_id, sent)
+
+    def heartbeat(self, sender_id, lamport_time, updates=None):
+        self._refuse_if_stopped()
+        reply_time = self.clock.update_and_increment(lamport_time)
+        piggyback = self.membership.receive(sender_id, _decode_updates(updates))
+        return "ALIVE", reply_time, piggyback
+
+    def renew_lease(self, sender_id, lamport_time, updates=None):
+        """Renovação do arrendamento de um seguidor; retorna (concedida, tempo de Lamport, atualizações)."""
+        self._refuse_if_stopped()
+        reply_time = self.clock.update_and_increment(lamport_time)
+        granted, piggyback = self._grant_lease(sender_id, _decode_updates(updates))
+        return granted, reply_time, piggyback
+
+    def ping_req(self, sender_id, target_id, lamport_time, updates=None):
+        """Sonda target_id em nome de sender_id (ping indireto do SWIM)."""
+        self._refuse_if_stopped() # Um nó parado não pode atestar que o alvo está vivo
+        self.clock.update(lamport_time)
+        piggyback = self.membership.receive(sender_id, _decode_updates(updates))
+        status = "UNREACHABLE"
+        if self._relay_slots.acquire(blocking=False):
+            try:
+                _, remote_time, received = self.proxy_pool.call(target_id, 'heartbeat', self.node_id, self.clock.increment(),
+                                                                self.membership.piggyback(), timeout=SWIM_ACK_TIMEOUT)
+                self.clock.update(remote_time)
+                self.membership.receive(target_id, _decode_updates(received))
+                status = "ALIVE"
+            except Exception:
+                pass
+            finally:
+                self._relay_slots.release()
+        return status, self.clock.increment(), piggyback
 
     # --- Ring Algorithm & Communication ---
+    @property
+    def election_in_progress(self):
+        return self.election.in_progress
+
     def start_election(self):
-        if self.election_in_progress:
-            return
-        self.election_in_progress = True
-        print(f"Node {self.node_id} starts an ELECTION.")
-        message = {
-            'type': 'ELECTION',
-            'participants': [self.node_id],
-            'lamport_time': self.clock.increment()
-        }
-        self.pass_message(message)
+        if self.election.start():
+            log.info("Node %s starts an ELECTION.", self.node_id)
 
-    def pass_message(self, message):
-        if not self.next_node_proxy:
-            print(f"Node {self.node_id}: Cannot pass message, no proxy to next node.")
-            return
+    def _on_leader_elected(self, leader_id):
+        self.leader_id = leader_id
+        self._on_leadership_change()
+        if leader_id == self.node_id:
+            log.info("Node %s completed election. New leader is %s", self.node_id, self.leader_id)
+        else:
+            log.info("Node %s acknowledges new leader: %s", self.node_id, self.leader_id)
 
+    def _send_ring_message(self, target_id, message):
+        message = dict(message, sender_id=self.node_id, lamport_time=self.clock.increment(),
+                       channel=self.snapshots.stamp(target_id))
         try:
-            self.next_node_proxy.handle_election_message(message)
-        except Pyro5.errors.CommunicationError:
-            print(f"Node {self.node_id} could not pass message to {self.next_node_id}. It may be down.")
-            # Em uma implementação completa, aqui se tentaria pular o nó falho.
-            # Por simplicidade, a detecção de falha do heartbeat irá tratar isso.
+            self.proxy_pool.call(target_id, 'handle_election_message', message)
+            return True
+        except Pyro5.errors.PyroError:
+            log.warning("Node %s could not pass message to %s. Skipping it.", self.node_id, target_id)
+            return False
+
+    def send_task(self, target_id, task_name):
+        """Envia uma tarefa para outro nó do grupo usando o pool de proxies."""
+        delta = self.vector_clock.prepare_send(target_id)
+        result = self.proxy_pool.call(target_id, 'execute_task', task_name, self.clock.increment(), self.node_id, delta,
+                                      self.snapshots.stamp(target_id))
+        self.clock.update(result['lamport_time'])
+        self.vector_clock.merge_and_tick(result['vector_delta'])
+        self.vector_clock.acknowledge(target_id, delta)
+        return result['status']
+
+    def send_tasks(self, target_id, tasks, timeout=None):
+        """Envia várias tarefas (task_id, task_name) em um único lote; gera (task_id, status) na ordem do lote.
+
+        Cada tarefa mantém seu próprio carimbo de Lamport e delta do relógio vetorial.
+        """
+        tasks = list(tasks)
+        calls = self._task_calls(target_id, tasks)
+        results = self.proxy_pool.batch(target_id, calls, timeout=timeout)
+        for (task_id, _), (_, args), result in zip(tasks, calls, results):
+            self.clock.update(result['lamport_time'])
+            self.vector_clock.merge_and_tick(result['vector_delta'])
+            self.vector_clock.acknowledge(target_id, args[3]) # O delta vetorial de execute_task
+            yield task_id, result['status']
+
+    def send_tasks_oneway(self, target_id, tasks):
+        """Como send_tasks, mas sem esperar resultados: o lote inteiro sai em uma única mensagem oneway.
+
+        Sem resposta não há confirmação, então o delta enviado não avança o LS do relógio vetorial.
+        """
+        stamped = [(task_name, self.clock.increment(), self.snapshots.stamp(target_id)) for _, task_name in tasks]
+        self.proxy_pool.call(target_id, 'submit_tasks', stamped, self.node_id, self.vector_clock.prepare_send(target_id))
+
+    def _task_calls(self, target_id, tasks):
+        return [('execute_task', (task_name, self.clock.increment(), self.node_id, self.vector_clock.prepare_send(target_id),
+                                  self.snapshots.stamp(target_id)))
+                for _, task_name in tasks]
+
+    # --- Task Scheduling (líder) ---
+    def _dispatch_task(self, target_id, task_id, task_name, callback):
+        def run():
+            if target_id == self.node_id:
+                callback(True, self._run_task(task_name), self.tasks_in_progress)
+                return
+            delta = self.vector_clock.prepare_send(target_id)
+            try:
+                result = self.proxy_pool.call(target_id, 'execute_task', task_name, self.clock.increment(), self.node_id, delta,
+                                              self.snapshots.stamp(target_id))
+            except Pyro5.errors.PyroError:
+                callback(False) # Sem confirmação: o próximo delta para target_id repete estas entradas
+                return
+            self.clock.update(result['lamport_time'])
+            self.vector_clock.merge_and_tick(result['vector_delta'])
+            self.vector_clock.acknowledge(target_id, delta)
+            callback(True, result['status'], result.get('queue_depth', 0))
+        self.task_executor.submit(run)
+
+    def _replicate_tasks(self, stream, seq, ops):
+        def send(nid):
+            try:
+                self.proxy_pool.call(nid, 'sync_tasks', ops, self.node_id, self.clock.increment(), stream, seq)
+            except Pyro5.errors.PyroError:
+                pass # A fila replicada só é lida por um novo líder
+        for nid in list(self.active_nodes):
+            self.heartbeat_executor.submit(send, nid)
 
     # --- Heartbeat & Failure Detection ---
-    def _send_heartbeats(self):
-        while self.is_running:
-            time.sleep(HEARTBEAT_INTERVAL)
-            for nid in list(self.active_nodes.keys()):
-                try:
-                    pyro_name = get_pyro_name(nid)
-                    with Pyro5.api.Proxy(f"PYRONAME:{pyro_name}") as proxy:
-                        proxy._pyroTimeout = 1
-                        _, remote_time = proxy.heartbeat(self.node_id, self.clock.increment())
-                        self.clock.update(remote_time)
-                except Exception:
-                    pass # Falha tratada no _check_failures
-
-    def _check_failures(self):
-        while self.is_running:
-            time.sleep(HEARTBEAT_INTERVAL)
-            now = time.time()
-            for nid, last_seen in list(self.active_nodes.items()):
-                if now - last_seen > HEARTBEAT_TIMEOUT:
-                    print(f"Node {self.node_id} detected failure of Node {nid}.")
-                    del self.active_nodes[nid]
-                    if nid == self.leader_id:
-                        print(f"LEADER {nid} failed! Starting new election.")
-                        self.start_election()
-                    if nid == self.next_node_id:
-                        print(f"Next node {nid} failed. Re-calculating ring.")
-                        self.next_node_proxy = None
-                        self.next_node_id = self._get_next_node_id() # Simplificação, assume que a lista de nós é estática
-                        self._connect_to_next_node()
+    def _heartbeat_round(self):
+        """Envia heartbeats aos nós ativos que estão quietos por um pool limitado de workers, sob um único prazo.
+
+        Não bloqueia: a rodada fecha quando o último ping termina ou quando o temporizador do prazo dispara.
+        """
+        started = time.monotonic()
+        pending = {self.heartbeat_executor.submit(self._ping_peer, nid): nid for nid in self._quiet_peers()}
+        round_state = {'remaining': len(pending), 'closed': False, 'lock': threading.Lock()}
+
+        def close():
+            with round_state['lock']:
+                if round_state['closed']:
+                    return
+                round_state['closed'] = True
+            deadline.cancel()
+            rtts = {}
+            failed = []
+            for future, nid in pending.items():
+                if not future.done():
+                    future.cancel() # Pings que nem começaram não atrasam a próxima rodada
+                    failed.append(nid)
+                elif future.cancelled() or future.exception() is not None:
+                    failed.append(nid) # Falha tratada no _check_failures
+                else:
+                    rtts[nid] = future.result()
+                    self.heartbeat_rtt.observe(rtts[nid])
+            self.peer_rtt.update(rtts)
+            self.last_heartbeat_round = {
+                'duration': time.monotonic() - started,
+                'peers': len(pending),
+                'failed': failed,
+                'rtt': rtts,
+            }
+
+        def on_done(_):
+            with round_state['lock']:
+                round_state['remaining'] -= 1
+                finished = round_state['remaining'] == 0
+            if finished:
+                close()
+
+        deadline = self.schedule(HEARTBEAT_ROUND_DEADLINE, close)
+        if not pending:
+            close()
+        for future in pending:
+            future.add_done_callback(on_done)
+
+    def _ping_peer(self, nid):
+        sent_at = time.monotonic()
+        _, remote_time, _ = self.proxy_pool.call(nid, 'heartbeat', self.node_id, self.clock.increment(), timeout=HEARTBEAT_ROUND_DEADLINE)
+        self.clock.update(remote_time)
+        return time.monotonic() - sent_at
+
+    def _handle_node_failure(self, nid):
+        self.resolver.invalidate(nid)
+        super()._handle_node_failure(nid)
+        if nid == self.next_node_id:
+            self.next_node_id = self._get_next_node_id()
+            log.info("Next node %s failed. Ring now continues at %s.", nid, self.next_node_id)
+
+    def _handle_node_recovery(self, nid):
+        super()._handle_node_recovery(nid)
+        self.next_node_id = self._get_next_node_id()
+
+    # --- Snapshot Transport ---
+    def _send_markers(self, snapshot_id, cutoffs):
+        def send(nid, sent):
+            try:
+                self.proxy_pool.call(nid, 'receive_marker', snapshot_id, self.node_id, self.clock.increment(), sent)
+            except Pyro5.errors.PyroError:
+                log.warning("Node %s could not send snapshot marker to %s.", self.node_id, nid)
+        for nid, sent in cutoffs.items():
+            # Os marcadores saem pelo pool de workers para não bloquear quem iniciou o snapshot
+            self.heartbeat_executor.submit(send, nid, sent)
+
+    # --- SWIM Transport ---
+    def _swim_ping(self, target_id, updates, timeout, callback):
+        def ping():
+            try:
+                _, remote_time, received = self.proxy_pool.call(target_id, 'heartbeat', self.node_id, self.clock.increment(),
+                                                                updates, timeout=timeout)
+            except Exception:
+                callback(False, [])
+                return
+            self.clock.update(remote_time)
+            callback(True, _decode_updates(received))
+        self.heartbeat_executor.submit(ping)
+
+    def _swim_ping_req(self, helper_id, target_id, updates, timeout, callback):
+        def ping_req():
+            try:
+                status, remote_time, received = self.proxy_pool.call(helper_id, 'ping_req', self.node_id, target_id,
+                                                                     self.clock.increment(), updates, timeout=timeout)
+            except Exception:
+                callback(False, [])
+                return
+            self.clock.update(remote_time)
+            callback(status == "ALIVE", _decode_updates(received))
+        self.heartbeat_executor.submit(ping_req)
+
+    # --- Lease Transport ---
+    def _renew_lease(self, leader_id, timeout, callback):
+        def renew():
+            try:
+                granted, remote_time, received = self.proxy_pool.call(leader_id, 'renew_lease', self.node_id, self.clock.increment(),
+                                                                      self.membership.piggyback(), timeout=timeout)
+            except Exception:
+                callback(False, False)
+                return
+            self.clock.update(remote_time)
+            self.membership.record_reply(leader_id, _decode_updates(received))
+            callback(True, granted)
+        self.heartbeat_executor.submit(renew)
 
     # --- Lifecycle Methods ---
     def run(self):
@@ -133,27 +352,35 @@ class NodeB(Node):
         port = self.all_nodes_config[self.node_id]['port']
         pyro_name = get_pyro_name(self.node_id)
         
-        daemon = Pyro5.api.Daemon(host=host, port=port)
-        uri = daemon.register(self, objectId=pyro_name)
-        ns = Pyro5.api.locate_ns()
-        ns.register(pyro_name, uri)
+        self.pyro_daemon = AuthDaemon(host=host, port=port, on_peer=self._heard_from)
+        uri = self.pyro_daemon.register(self, objectId=pyro_name)
+        Pyro5.api.locate_ns().register(pyro_name, uri)
 
-        print(f"Starting Node {self.node_id} (Group B) as {pyro_name}")
-        
-        threading.Thread(target=daemon.requestLoop, args=(lambda: self.is_running,), daemon=True).start()
+        log.info("Starting Node %s (Group B) as %s", self.node_id, pyro_name)
         
-        self._connect_to_next_node()
-        threading.Thread(target=self._send_heartbeats, daemon=True).start()
-        threading.Thread(target=self._check_failures, daemon=True).start()
-
-        time.sleep(5) # Espera para que outros nós iniciem
-        self.start_election()
+        # O laço do daemon é a única thread própria do nó; o resto roda nos temporizadores compartilhados
+        threading.Thread(target=self.pyro_daemon.requestLoop, args=(lambda: self.is_running,), daemon=True).start()
+        self.ready.set() # O socket do daemon já aceita conexões; chamadas esperam na fila até o laço atendê-las
 
-        while self.is_running:
-            time.sleep(1)
-        
-        ns.remove(pyro_name)
-        daemon.shutdown()
+        self._connect_to_next_node()
+        self._start_failure_detection()
+        self._start_election_on_quorum(self._swim_ping)
 
     def stop(self):
         super().stop()
+        if self.pyro_daemon is not None:
+            try:
+                Pyro5.api.locate_ns().remove(get_pyro_name(self.node_id))
+            except Pyro5.errors.PyroError:
+                pass # O Name Server pode já ter sido encerrado
+            self.pyro_daemon.shutdown()
+        self.heartbeat_executor.shutdown(wait=False, cancel_futures=True)
+        self.task_executor.shutdown(wait=False, cancel_futures=True)
+        self.proxy_pool.close()
+        log.info("Node %s resolver stats: %s", self.node_id, self.resolver.get_stats())
+        log.info("Node %s election stats: %s, last: %s", self.node_id, self.election.stats, self.election.last_election)
+        log.info("Node %s scheduler stats: %s", self.node_id, self.scheduler.get_stats())
+
+def _decode_updates(updates):
+    # O serializador do Pyro5 entrega as tuplas como listas
+    return [tuple(update) for update in updates or ()]
@@ -0,0 +1,22 @@
+import struct
+
+from Pyro5 import protocol
+from Pyro5.callcontext import current_context
+
+PEER_ANNOTATION = 'PEER' # O Pyro5 exige chaves de anotação com 4 caracteres
+_PEER = struct.Struct('!iq') # id do remetente, tempo de Lamport
+
+def stamp_call(node_id, lamport_time):
+    """Anexa remetente e relógio às próximas chamadas desta thread (as anotações do Pyro5 são por thread)."""
+    current_context.annotations = {PEER_ANNOTATION: _PEER.pack(node_id, lamport_time)}
+
+def clear_stamp():
+    current_context.annotations = {}
+
+def current_caller():
+    """No servidor, durante ou logo após tratar uma chamada: (node_id, lamport_time, two_way), ou None."""
+    data = current_context.annotations.get(PEER_ANNOTATION)
+    if data is None or len(data) != _PEER.size:
+        return None
+    node_id, lamport_time = _PEER.unpack(bytes(data))
+    return node_id, lamport_time, not current_context.msg_flags & protocol.FLAGS_ONEWAY
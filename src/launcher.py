@@ -0,0 +1,188 @@
+import multiprocessing
+import queue
+import signal
+import subprocess
+import sys
+import time
+
+from src.config import (LAUNCHER_STATUS_INTERVAL, LAUNCHER_STOP_TIMEOUT, METRICS_HOST, METRICS_PORT,
+                        NAME_SERVER_START_TIMEOUT)
+from src.topology import cluster_ids
+from src.common.instrumentation import start_metrics_server, get_logger
+
+log = get_logger('launcher')
+
+def start_pyro_ns():
+    """Inicia o Pyro Name Server em um processo separado e espera até ele responder; None se já estava rodando."""
+    from src.group_b.name_resolver import wait_for_name_server
+    # Tenta localizar um NS existente
+    if wait_for_name_server(timeout=0):
+        log.info("Pyro Name Server is already running.")
+        return None
+    log.info("Starting Pyro Name Server...")
+    # O comando pode variar dependendo do ambiente (ex: 'pyro5-ns')
+    process = subprocess.Popen([sys.executable, "-m", "Pyro5.nameserver"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if not wait_for_name_server(NAME_SERVER_START_TIMEOUT):
+        log.warning("Pyro Name Server did not answer within %ss.", NAME_SERVER_START_TIMEOUT)
+    return process
+
+def stop_pyro_ns(pyro_ns_process):
+    if pyro_ns_process:
+        pyro_ns_process.terminate()
+        pyro_ns_process.wait()
+
+def create_node(group_id, node_id, group_a, group_b):
+    """Instancia um NodeA ou NodeB para a topologia dada."""
+    # Importados aqui para que cada processo carregue só o que usa
+    if group_id == 'A':
+        from src.group_a.node_a import NodeA
+        return NodeA(node_id, group_a, cluster_ids(group_a, group_b))
+    from src.group_b.node_b import NodeB
+    return NodeB(node_id, group_b, cluster_ids(group_a, group_b))
+
+def wait_for_leaders(nodes, timeout, poll=0.01):
+    """Espera até os nós ativos de cada grupo concordarem sobre um líder ativo, ou até o prazo.
+
+    Retorna {grupo: {'leader_id', 'first_leader_at', 'agreed_at'}} com instantes de time.monotonic(); grupos
+    sem acordo no prazo não aparecem ou ficam sem 'agreed_at'.
+    """
+    groups = {}
+    for node in nodes:
+        groups.setdefault(node.group_id, []).append(node)
+    leaders = {}
+    deadline = time.monotonic() + timeout
+    while True:
+        now = time.monotonic()
+        for group_id, members in groups.items():
+            leader = leaders.get(group_id)
+            if leader is not None and 'agreed_at' in leader:
+                continue
+            alive = [node for node in members if node.is_running]
+            known = {node.leader_id for node in alive}
+            if leader is None and known != {None}:
+                leader = leaders[group_id] = {'first_leader_at': now}
+            if len(known) == 1 and None not in known and any(node.node_id in known for node in alive):
+                leader['leader_id'] = known.pop()
+                leader['agreed_at'] = now
+        if len(leaders) == len(groups) and all('agreed_at' in leader for leader in leaders.values()):
+            return leaders
+        if now >= deadline:
+            return leaders
+        time.sleep(poll)
+
+def _node_status(node):
+    return {
+        'node_id': node.node_id,
+        'group': node.group_id,
+        'leader_id': node.leader_id,
+        'lamport_time': node.clock.get_time(),
+        'active_nodes': len(node.active_nodes),
+        'pending_tasks': node.scheduler.pending(),
+    }
+
+def _worker(assignments, group_a, group_b, stop_signal, status_queue, status_interval, stop_timeout, metrics_port):
+    # Ctrl+C chega a todo o grupo de processos; quem coordena o encerramento é o processo pai
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # As métricas são por processo: cada worker publica as suas em uma porta própria
+    metrics = start_metrics_server(metrics_port, METRICS_HOST)
+    nodes = [create_node(group_id, node_id, group_a, group_b) for group_id, node_id in assignments]
+    for node in nodes:
+        node.start()
+    # O pai fecha a outra ponta do pipe para pedir o encerramento
+    while not stop_signal.poll(status_interval):
+        for node in nodes:
+            status_queue.put(_node_status(node))
+    for node in nodes:
+        node.stop()
+    for node in nodes:
+        node.join(timeout=stop_timeout)
+    if metrics is not None:
+        metrics.shutdown()
+
+class ClusterLauncher:
+    """Executa os nós em processos separados (um por nó ou vários por processo), fora do GIL do processo principal.
+
+    Usa o método 'spawn': o gRPC não suporta fork depois de iniciado, e cada processo monta seus próprios canais.
+    """
+
+    def __init__(self, group_a, group_b, nodes_per_process=1, processes=None,
+                 status_interval=LAUNCHER_STATUS_INTERVAL, stop_timeout=LAUNCHER_STOP_TIMEOUT, metrics_port=METRICS_PORT):
+        self.group_a = group_a
+        self.group_b = group_b
+        self.status_interval = status_interval
+        self.stop_timeout = stop_timeout
+        self.metrics_port = metrics_port
+        self.assignments = self._assign(nodes_per_process, processes)
+        self.workers = []
+        self.node_status = {}
+        self._context = multiprocessing.get_context('spawn')
+        # Um pipe de parada e uma fila por processo: um processo morto (SIGKILL, OOM) nunca confirmaria o set() de um
+        # Event compartilhado, e no meio de um put deixaria preso o lock de escrita de uma fila compartilhada
+        self._stop_signals = []
+        self._status_queues = []
+
+    def _assign(self, nodes_per_process, processes):
+        nodes = [('A', nid) for nid in sorted(self.group_a)] + [('B', nid) for nid in sorted(self.group_b)]
+        if processes:
+            # Distribuição alternada: os dois grupos ficam espalhados entre os processos
+            return [chunk for chunk in (nodes[i::processes] for i in range(processes)) if chunk]
+        return [nodes[i:i + nodes_per_process] for i in range(0, len(nodes), nodes_per_process)]
+
+    def start(self):
+        for index, assignments in enumerate(self.assignments):
+            stop_signal, stop_sender = self._context.Pipe(duplex=False)
+            status_queue = self._context.Queue()
+            worker = self._context.Process(
+                target=_worker, name=f"nodes-{index}",
+                args=(assignments, self.group_a, self.group_b, stop_signal, status_queue,
+                      self.status_interval, self.stop_timeout, self.metrics_port + 1 + index),
+            )
+            worker.start()
+            self.workers.append(worker)
+            stop_signal.close()
+            self._stop_signals.append(stop_sender)
+            self._status_queues.append(status_queue)
+        log.info("Started %s nodes in %s processes (metrics on ports %s-%s).", len(self.group_a) + len(self.group_b),
+                 len(self.workers), self.metrics_port + 1, self.metrics_port + len(self.workers))
+
+    def poll_status(self):
+        """Consome os relatórios pendentes e retorna o último estado conhecido de cada nó."""
+        for status_queue in self._status_queues:
+            while True:
+                try:
+                    status = status_queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.node_status[status['node_id']] = status
+        return self.node_status
+
+    def alive_workers(self):
+        return [worker for worker in self.workers if worker.is_alive()]
+
+    def stop(self):
+        """Pede o encerramento a todos os processos e os recolhe, forçando o término de quem não responder."""
+        for stop_sender in self._stop_signals:
+            stop_sender.close()
+        # Os nós de cada processo param em paralelo; o prazo total cobre o join de todos eles.
+        # A fila é drenada durante a espera, senão um processo com relatórios pendentes não consegue sair.
+        deadline = time.monotonic() + self.stop_timeout * 2
+        while time.monotonic() < deadline:
+            alive = self.alive_workers()
+            if not alive:
+                break
+            self.poll_status()
+            alive[0].join(timeout=0.1)
+        for worker in self.alive_workers():
+            log.warning("Process %s did not stop in time; terminating it.", worker.name)
+            worker.terminate()
+            worker.join(timeout=self.stop_timeout)
+        for worker in self.alive_workers():
+            worker.kill()
+            worker.join()
+        self.poll_status()
+        for status_queue in self._status_queues:
+            status_queue.close()
+            status_queue.join_thread()
+        exit_codes = [worker.exitcode for worker in self.workers]
+        log.info("Reaped %s processes (exit codes: %s).", len(self.workers), sorted(set(exit_codes)))
+        return exit_codes
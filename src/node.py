@@ -1,20 +1,395 @@
+import abc
 import threading
+import time
+from src.common.timers import call_later, shared_executor, SerialExecutor
 from src.common.lamport_clock import LamportClock
+from src.common.vector_clock import VectorClock
+from src.common.membership import SwimMembership
+from src.common.snapshot import SnapshotManager
+from src.common.task_scheduler import TaskScheduler
+from src.common.leader_lease import LeaderLease
+from src.common.token_manager import TokenManager
+from src.common.instrumentation import counter, histogram, get_logger
+from src.common.multicast_communicator import (MulticastCommunicator, MSG_LEADER_ANNOUNCE, MSG_STATE, MSG_SUPER_COORDINATOR,
+                                               LEADER_PAYLOAD, STATE_PAYLOAD)
+from src.config import (MEMBERSHIP_PROTOCOL, HEARTBEAT_INTERVAL, HEARTBEAT_TIMEOUT, SWIM_PROTOCOL_PERIOD, SWIM_ACK_TIMEOUT,
+                        SWIM_INDIRECT_PROBES, SWIM_MAX_RELAYS, SWIM_MAX_PIGGYBACK, SWIM_RECONNECT_PERIODS, PHI_THRESHOLD,
+                        SNAPSHOT_DIR, SNAPSHOT_TIMEOUT, SNAPSHOT_HISTORY, LEASE_DURATION, LEASE_RENEW_INTERVAL, LEASE_RENEW_TIMEOUT,
+                        MULTICAST_GROUP, MULTICAST_PORT,
+                        MULTICAST_FLUSH_INTERVAL, MULTICAST_MAX_DATAGRAM, MULTICAST_REORDER_TIMEOUT,
+                        INTERGROUP_ANNOUNCE_INTERVAL, INTERGROUP_LEADER_TTL, TOKEN_EXPIRATION_SECONDS, TOKEN_RENEW_MARGIN,
+                        SCHEDULER_MAX_IN_FLIGHT, SCHEDULER_LATENCY_ALPHA, SCHEDULER_RETRY_DELAY,
+                        SCHEDULER_REPLICATION_DELAY, SCHEDULER_SYNC_GAP_TIMEOUT,
+                        ELECTION_STARTUP_DELAY, STARTUP_PROBE_INTERVAL, STARTUP_PROBE_TIMEOUT)
 
-class Node(threading.Thread):
-    def __init__(self, node_id, group_id, all_nodes_config):
+log = get_logger('node')
+
+class Node(threading.Thread, metaclass=abc.ABCMeta):
+    def __init__(self, node_id, group_id, all_nodes_config, cluster_ids=None, schedule=None, now=time.monotonic, rng=None,
+                 membership_protocol=MEMBERSHIP_PROTOCOL):
         super().__init__()
         self.node_id = node_id
         self.group_id = group_id
         self.all_nodes_config = all_nodes_config
         self.clock = LamportClock()
+        self.vector_clock = VectorClock(node_id, cluster_ids) # cluster_ids: ids dos dois grupos
         self.leader_id = None
+        self.intergroup = None
+        self.group_leaders = {}
+        self.group_states = {}
+        self.super_coordinator_id = None
+        self._token = None
+        self._token_renew_at = 0
+        # Fonte de tempo, agendador e aleatoriedade dos motores; a simulação troca por tempo virtual semeado
+        self.schedule = schedule or self._schedule_on_node
+        # Os callbacks dos temporizadores deste nó (eleições, rodadas de liveness, consultas ao Name Server) podem
+        # bloquear em RPCs: rodam em fila, uma thread por vez do executor do processo, e não nos workers da roda
+        self._timer_queue = SerialExecutor(shared_executor()) if schedule is None else None
+        self.now = now
+        self.rng = rng
+        self.membership_protocol = membership_protocol
+        # Cada ping indireto atendido prende um worker do servidor até o ACK do alvo; o excedente é recusado
+        # (para quem pediu, equivale a uma sonda perdida) e os demais RPCs sempre encontram worker livre
+        self._relay_slots = threading.BoundedSemaphore(SWIM_MAX_RELAYS)
+        self.tasks_in_progress = 0
+        self._tasks_lock = threading.Lock()
+        self.tasks_executed = counter('simula_tasks_executed_total', "Tarefas executadas pelos nós.", group=group_id)
+        self.heartbeat_rtt = histogram('simula_heartbeat_rtt_seconds',
+                                       "Ida e volta de heartbeats, pings do SWIM e renovações de arrendamento.", group=group_id)
+        self.suppressed_elections = counter('simula_lease_suppressed_elections_total',
+                                            "Suspeitas sobre o líder ignoradas por haver um arrendamento válido.", group=group_id)
+        self.ready = threading.Event() # Sinalizado quando o servidor do nó já atende chamadas
         self.is_running = True
         self.daemon = True # Permite que a thread principal saia mesmo se as threads dos nós estiverem ativas
 
+    def _every(self, interval, callback, first=None):
+        """Executa callback a cada `interval` segundos no agendador do nó, enquanto o nó estiver ativo."""
+        def tick():
+            if not self.is_running:
+                return
+            try:
+                callback()
+            finally:
+                self.schedule(interval, tick)
+        self.schedule(interval if first is None else first, tick)
+
+    def _schedule_on_node(self, delay, callback):
+        """Agendador padrão: a roda compartilhada só marca o prazo e entrega o callback ao executor deste nó."""
+        timer = call_later(delay, lambda: self._submit_timer(timer, callback))
+        return timer
+
+    def _submit_timer(self, timer, callback):
+        if self.is_running:
+            self._timer_queue.submit(lambda: self._run_timer(timer, callback))
+
+    def _run_timer(self, timer, callback):
+        if timer.cancelled or not self.is_running:
+            return # Cancelado (ou o nó parou) enquanto esperava na fila
+        try:
+            callback()
+        except Exception:
+            log.exception("Node %s timer callback %r failed", self.node_id, callback)
+
+    def wait_ready(self, timeout=None):
+        """Bloqueia até o servidor do nó estar atendendo; retorna False se o prazo expirar."""
+        return self.ready.wait(timeout)
+
+    def _auth_token(self):
+        """Retorna o token deste nó para chamadas autenticadas, renovando-o perto da expiração."""
+        now = time.time()
+        if self._token is None or now >= self._token_renew_at:
+            self._token = TokenManager.generate_token(self.node_id)
+            self._token_renew_at = now + TOKEN_EXPIRATION_SECONDS - TOKEN_RENEW_MARGIN
+        return self._token
+
+    # --- Tarefas ---
+    def _run_task(self, task_name):
+        """Executa uma tarefa localmente e retorna seu status; comum às chamadas unitárias e em lote."""
+        with self._tasks_lock:
+            self.tasks_in_progress += 1
+        self.tasks_executed.inc()
+        try:
+            return "Task completed"
+        finally:
+            with self._tasks_lock:
+                self.tasks_in_progress -= 1
+
+    def _create_scheduler(self, dispatch, replicate):
+        # O próprio líder também executa tarefas
+        return TaskScheduler(self.node_id, lambda: [self.node_id] + list(self.active_nodes), dispatch, replicate,
+                             max_in_flight=SCHEDULER_MAX_IN_FLIGHT, latency_alpha=SCHEDULER_LATENCY_ALPHA,
+                             retry_delay=SCHEDULER_RETRY_DELAY, replication_delay=SCHEDULER_REPLICATION_DELAY,
+                             gap_timeout=SCHEDULER_SYNC_GAP_TIMEOUT, schedule=self.schedule, clock=self.now, rng=self.rng)
+
+    def submit_task(self, task_name):
+        """Entrega uma tarefa ao escalonador do líder; retorna o task_id, ou None se este nó não for o líder."""
+        if self.leader_id != self.node_id:
+            log.warning("Node %s is not the leader; submit tasks to Node %s.", self.node_id, self.leader_id)
+            return None
+        return self.scheduler.submit(task_name)
+
+    # --- Membership & Failure Detection ---
+    def _create_membership(self, ping, ping_req):
+        def timed_ping(target_id, updates, timeout, callback):
+            # Mede a ida e volta aqui, uma vez para os dois transportes
+            sent_at = time.perf_counter()
+
+            def on_reply(ok, received):
+                if ok:
+                    self.heartbeat_rtt.observe(time.perf_counter() - sent_at)
+                callback(ok, received)
+            ping(target_id, updates, timeout, on_reply)
+
+        return SwimMembership(
+            self.node_id, list(self.all_nodes_config), timed_ping, ping_req,
+            on_dead=self._handle_node_failure, on_alive=self._handle_node_recovery,
+            protocol_period=SWIM_PROTOCOL_PERIOD, ack_timeout=SWIM_ACK_TIMEOUT,
+            indirect_probes=SWIM_INDIRECT_PROBES, max_piggyback=SWIM_MAX_PIGGYBACK,
+            phi_threshold=PHI_THRESHOLD, reconnect_periods=SWIM_RECONNECT_PERIODS, clock=self.now, rng=self.rng,
+        )
+
+    def _create_lease(self, renew, duration=LEASE_DURATION):
+        def timed_renew(leader_id, timeout, callback):
+            sent_at = time.perf_counter()
+
+            def on_reply(ok, granted):
+                if ok:
+                    self.heartbeat_rtt.observe(time.perf_counter() - sent_at)
+                callback(ok, granted)
+            renew(leader_id, timeout, on_reply)
+
+        # Na membership por arrendamento, o líder é quem detecta a falha dos seguidores
+        on_follower_expired = self._on_follower_lease_expired if self.membership_protocol == 'lease' else None
+        return LeaderLease(self.node_id, timed_renew, on_expired=self._on_lease_expired, on_follower_expired=on_follower_expired,
+                           duration=duration, renew_interval=LEASE_RENEW_INTERVAL, renew_timeout=LEASE_RENEW_TIMEOUT,
+                           clock=self.now)
+
+    def _start_failure_detection(self):
+        # Períodos na roda de temporizadores compartilhada, e não em threads que dormem por nó
+        if self.lease.enabled:
+            self._every(self.lease.renew_interval, self._lease_period)
+        if self.membership_protocol == 'swim':
+            self._every(SWIM_PROTOCOL_PERIOD, self._membership_period)
+        elif self.membership_protocol == 'heartbeat':
+            self._every(HEARTBEAT_INTERVAL, self._heartbeat_round)
+            self._every(HEARTBEAT_INTERVAL, self._check_failures)
+
+    def _lease_period(self):
+        self.lease.tick()
+        if self.membership_protocol == 'lease':
+            # Sem as sondagens do SWIM, é assim que os lados de uma partição reparada voltam a se ver
+            self.membership.reconnect()
+
+    def _membership_period(self):
+        self.membership.probe()
+        self.membership.check()
+
+    def _heard_from(self, nid, lamport_time=None, two_way=True):
+        """Sinal de vida de um par do grupo: qualquer chamada recebida dele, ou resposta a uma chamada deste nó.
+
+        Os transportes chamam isto para toda mensagem, a partir do remetente e do relógio que viajam nos
+        metadados do gRPC ou nas anotações do Pyro5. Heartbeats, sondagens e renovações explícitos ficam
+        só para os pares quietos, então o tráfego de liveness encolhe conforme o da aplicação cresce.
+        two_way=False indica uma mensagem oneway: o remetente não recebe resposta e não fica sabendo deste nó.
+        """
+        if nid == self.node_id or nid not in self.all_nodes_config:
+            return
+        if lamport_time is not None:
+            self.clock.merge(lamport_time)
+        self.active_nodes[nid] = self.now()
+        self.membership.observe(nid)
+        self.lease.observe(nid, two_way)
+
+    def _peer_stamp(self):
+        """(id, tempo de Lamport) que os transportes anexam a cada chamada enviada."""
+        return self.node_id, self.clock.get_time()
+
+    def _quiet_peers(self, interval=HEARTBEAT_INTERVAL / 2):
+        """Pares ativos sem nenhuma mensagem há pelo menos `interval` segundos; só eles recebem heartbeat.
+
+        Meio intervalo: um par ouvido logo antes da rodada é sondado na seguinte, e o silêncio entre duas
+        trocas não passa de 1,5 rodada, bem abaixo de HEARTBEAT_TIMEOUT.
+        """
+        now = self.now()
+        return [nid for nid, last_seen in list(self.active_nodes.items()) if now - last_seen >= interval]
+
+    @abc.abstractmethod
+    def _heartbeat_round(self):
+        """Uma rodada da membership 'heartbeat': sonda os _quiet_peers() pelo transporte do grupo, sem bloquear."""
+
+    def _check_failures(self):
+        now = self.now()
+        for nid, last_seen in list(self.active_nodes.items()):
+            if now - last_seen > HEARTBEAT_TIMEOUT:
+                self._handle_node_failure(nid)
+
+    def _handle_node_failure(self, nid):
+        """Remove um par declarado morto; os grupos estendem com a limpeza do seu transporte."""
+        log.warning("Node %s detected failure of Node %s.", self.node_id, nid)
+        self.active_nodes.pop(nid, None)
+        self.snapshots.on_peer_failed(nid)
+        self.scheduler.on_member_failed(nid)
+        if nid == self.leader_id:
+            self._leader_failed(nid)
+
+    def _leader_failed(self, nid):
+        """A membership deu o líder como morto; com o arrendamento ainda válido, a eleição fica para a expiração."""
+        if self.lease.holds():
+            self.suppressed_elections.inc()
+            log.info("Node %s ignores the failure of LEADER %s: its lease is still valid.", self.node_id, nid)
+            return
+        log.warning("LEADER %s failed! Starting new election.", nid)
+        self.start_election()
+
+    # --- Arrendamento do líder ---
+    def _grant_lease(self, sender_id, updates):
+        """Trata uma renovação recebida; retorna (concedida, atualizações de membership devolvidas por piggyback)."""
+        piggyback = self.membership.receive(sender_id, updates)
+        return self.lease.grant(sender_id), piggyback
+
+    def _on_lease_expired(self, leader_id, refused):
+        if leader_id != self.leader_id:
+            return
+        if refused:
+            log.info("Node %s is no longer the leader for Node %s. Starting new election.", leader_id, self.node_id)
+            self.start_election()
+            return
+        log.warning("Node %s lost its lease with LEADER %s.", self.node_id, leader_id)
+        if not self.membership.declare_dead(leader_id):
+            # A membership já o dera como morto e a eleição esperava o fim do arrendamento
+            self.start_election()
+
+    def _on_follower_lease_expired(self, nid):
+        log.warning("Node %s stopped renewing its lease.", nid)
+        self.membership.declare_dead(nid)
+
+    # --- Inicialização ---
+    def _start_election_on_quorum(self, ping, deadline=ELECTION_STARTUP_DELAY):
+        """Inicia a primeira eleição assim que uma maioria do grupo responde a `ping`, ou no prazo.
+
+        `ping` tem a assinatura do ping do SWIM. Se outro nó iniciar a eleição antes, ela chega por mensagem
+        e esta não é necessária; nós que aparecerem depois entram pela recuperação da membership.
+        """
+        peers = [nid for nid in self.all_nodes_config if nid != self.node_id]
+        quorum = len(self.all_nodes_config) // 2 + 1
+        state = {'reachable': {self.node_id}, 'started': False, 'lock': threading.Lock()}
+        give_up = self.now() + deadline
+
+        def start():
+            with state['lock']:
+                if state['started']:
+                    return
+                state['started'] = True
+            if self.is_running and self.leader_id is None:
+                self.start_election()
+
+        def on_reply(nid, ok):
+            if not ok:
+                return
+            with state['lock']:
+                state['reachable'].add(nid)
+                reached = len(state['reachable']) >= quorum
+            if reached:
+                start()
+
+        def probe():
+            if state['started'] or not self.is_running:
+                return
+            if len(state['reachable']) >= quorum or self.now() >= give_up:
+                start()
+                return
+            for nid in peers:
+                if nid not in state['reachable']:
+                    ping(nid, [], STARTUP_PROBE_TIMEOUT, lambda ok, _, nid=nid: on_reply(nid, ok))
+            self.schedule(STARTUP_PROBE_INTERVAL, probe)
+        probe()
+
+    def _handle_node_recovery(self, nid):
+        self.active_nodes[nid] = self.now()
+        if self.leader_id is not None and nid > self.leader_id:
+            # Um nó maior que o líder voltou (ou uma partição foi reparada): a eleição precisa considerá-lo
+            self.start_election()
+
+    # --- Snapshot (Chandy-Lamport) ---
+    def _create_snapshot_manager(self, send_markers):
+        return SnapshotManager(self.node_id, lambda: list(self.active_nodes), send_markers, self._snapshot_state,
+                               output_dir=SNAPSHOT_DIR, timeout=SNAPSHOT_TIMEOUT, history=SNAPSHOT_HISTORY,
+                               schedule=self.schedule, clock=self.now)
+
+    def _snapshot_state(self):
+        return {
+            'group': self.group_id,
+            'lamport_time': self.clock.get_time(),
+            'vector_clock': self.vector_clock.to_dict(),
+            'leader_id': self.leader_id,
+            'active_nodes': sorted(self.active_nodes),
+        }
+
+    def initiate_snapshot(self, snapshot_id=None):
+        """Inicia um snapshot global a partir deste nó e retorna seu identificador."""
+        if snapshot_id is None:
+            snapshot_id = f"{self.node_id}.{self.clock.increment()}"
+        return self.snapshots.initiate(snapshot_id)
+
+    # --- Comunicação Intergrupos (Multicast) ---
+    def _on_leadership_change(self):
+        """Somente o líder de cada grupo despacha tarefas e participa do barramento multicast intergrupos."""
+        self.lease.follow(self.leader_id, list(self.active_nodes))
+        if self.leader_id == self.node_id:
+            self.scheduler.activate()
+        else:
+            self.scheduler.deactivate()
+        if self.leader_id == self.node_id and self.intergroup is None and self.is_running:
+            self.intergroup = MulticastCommunicator(
+                self.node_id, self.group_id, self.clock, self._on_intergroup_message, MULTICAST_GROUP, MULTICAST_PORT,
+                flush_interval=MULTICAST_FLUSH_INTERVAL, max_datagram=MULTICAST_MAX_DATAGRAM,
+                reorder_timeout=MULTICAST_REORDER_TIMEOUT,
+            )
+            self.intergroup.start()
+            communicator = self.intergroup
+            self.schedule(0, lambda: self._run_intergroup(communicator))
+        elif self.leader_id != self.node_id and self.intergroup is not None:
+            self.intergroup.stop()
+            self.intergroup = None
+
+    def _run_intergroup(self, communicator):
+        # Reagendado a cada anúncio até este nó deixar a liderança (e o barramento) ou parar
+        if not self.is_running or self.intergroup is not communicator:
+            return
+        communicator.send(MSG_LEADER_ANNOUNCE, LEADER_PAYLOAD.pack(self.node_id))
+        communicator.send(MSG_STATE, STATE_PAYLOAD.pack(self.node_id, len(self.active_nodes)))
+        self._update_super_coordinator()
+        self.schedule(INTERGROUP_ANNOUNCE_INTERVAL, lambda: self._run_intergroup(communicator))
+
+    def _on_intergroup_message(self, sender_id, group_id, msg_type, lamport_time, payload):
+        if msg_type == MSG_LEADER_ANNOUNCE:
+            (leader_id,) = LEADER_PAYLOAD.unpack_from(payload)
+            self.group_leaders[group_id] = (leader_id, self.now())
+        elif msg_type == MSG_STATE:
+            leader_id, active_count = STATE_PAYLOAD.unpack_from(payload)
+            self.group_states[group_id] = {'leader_id': leader_id, 'active_nodes': active_count, 'lamport_time': lamport_time}
+        elif msg_type == MSG_SUPER_COORDINATOR:
+            (self.super_coordinator_id,) = LEADER_PAYLOAD.unpack_from(payload)
+
+    def _update_super_coordinator(self):
+        # Supercoordenador: o maior id entre os líderes de grupo que anunciaram recentemente
+        now = self.now()
+        leaders = [self.node_id] + [leader_id for group_id, (leader_id, seen) in self.group_leaders.items()
+                                    if group_id != self.group_id and now - seen < INTERGROUP_LEADER_TTL]
+        winner = max(leaders)
+        if winner != self.super_coordinator_id:
+            self.super_coordinator_id = winner
+            if winner == self.node_id:
+                log.info("Node %s is the SUPER-COORDINATOR.", self.node_id)
+                self.intergroup.send(MSG_SUPER_COORDINATOR, LEADER_PAYLOAD.pack(self.node_id))
+
     def stop(self):
         self.is_running = False
-        print(f"Node {self.node_id} is stopping.")
+        if self._timer_queue is not None:
+            self._timer_queue.close()
+        if self.intergroup is not None:
+            self.intergroup.stop()
+        log.info("Node %s is stopping.", self.node_id)
 
     def __str__(self):
         return f"Node(id={self.node_id}, group='{self.group_id}', clock={self.clock.get_time()}, leader={self.leader_id})"
@@ -0,0 +1,118 @@
+from collections import Counter
+
+class SimNetwork:
+    """Transporte em memória sobre o Simulator, com atraso, perda e partições semeados.
+
+    Cada mensagem sofre um atraso uniforme em [min_delay, max_delay] e é perdida com probabilidade `loss`.
+    Nós derrubados e nós em lados diferentes de uma partição não se alcançam. Como os metadados do gRPC e as
+    anotações do Pyro5, o envelope identifica o remetente: cada entrega passa por on_envelope(remetente, two_way).
+    """
+
+    def __init__(self, simulator, min_delay=0.001, max_delay=0.01, loss=0.0):
+        self.simulator = simulator
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.loss = loss
+        self.rng = simulator.rng
+        self.nodes = {}
+        self.crashed = set()
+        self.stalled_until = {}
+        self.stats = {'sent': 0, 'delivered': 0, 'lost': 0, 'unreachable': 0, 'timeouts': 0}
+        self.messages = Counter() # Mensagens enviadas por método remoto
+        self._side = {}
+
+    def register(self, node):
+        self.nodes[node.node_id] = node
+
+    # --- Falhas ---
+    def crash(self, node_id):
+        self.crashed.add(node_id)
+        self.nodes[node_id].crash()
+
+    def stall(self, node_id, duration):
+        """Pausa o nó por `duration` segundos: nada chega a ele nem sai dele, e seus temporizadores esperam."""
+        until = self.simulator.now() + duration
+        self.stalled_until[node_id] = until
+        self.nodes[node_id].stall(until)
+
+    def partition(self, *sides):
+        """Divide a rede: nós em conjuntos diferentes não se comunicam; quem não foi listado fica no lado 0."""
+        self._side = {node_id: index for index, side in enumerate(sides, start=1) for node_id in side}
+
+    def heal(self):
+        self._side = {}
+
+    def reachable(self, source, target):
+        return (source not in self.crashed and target not in self.crashed and target in self.nodes
+                and self._side.get(source, 0) == self._side.get(target, 0))
+
+    # --- Envio ---
+    def send(self, source, target, method, *args):
+        """Entrega assíncrona de uma mensagem sem resposta; retorna False se o alvo está inalcançável agora.
+
+        Como em uma conexão real, uma mensagem perdida em trânsito não é detectada por quem enviou.
+        """
+        self.stats['sent'] += 1
+        self.messages[method] += 1
+        if not self.reachable(source, target):
+            self.stats['unreachable'] += 1
+            return False
+        self._transmit(source, target, lambda: self._deliver(source, target, False, method, args))
+        return True
+
+    def call(self, source, target, method, args, timeout, callback):
+        """Requisição/resposta: o método remoto recebe `reply` como último argumento e pode responder depois.
+
+        callback(ok, response) é chamado uma única vez: com a resposta, ou com (False, None) no timeout.
+        """
+        state = {'done': False}
+
+        def finish(ok, response):
+            if state['done']:
+                return
+            state['done'] = True
+            if ok:
+                timer.cancel()
+            else:
+                self.stats['timeouts'] += 1
+            callback(ok, response)
+
+        def reply(response):
+            self._transmit(target, source, lambda: on_reply(response))
+
+        def on_reply(response):
+            if not state['done']:
+                self.nodes[source].on_envelope(target, True)
+            finish(True, response)
+
+        timer = self.simulator.call_later(timeout, lambda: finish(False, None))
+        self.stats['sent'] += 1
+        self.messages[method] += 1
+        if self.reachable(source, target):
+            self._transmit(source, target, lambda: self._deliver(source, target, True, method, args + (reply,)))
+        else:
+            self.stats['unreachable'] += 1
+
+    def _deliver(self, source, target, two_way, method, args):
+        node = self.nodes[target]
+        node.on_envelope(source, two_way)
+        getattr(node, method)(*args)
+
+    def _transmit(self, source, target, deliver):
+        if self.rng.random() < self.loss:
+            self.stats['lost'] += 1
+            return
+        delay = self.rng.uniform(self.min_delay, self.max_delay)
+        # Mensagens de ou para um nó pausado ficam retidas até o fim da pausa, como em um socket cujo processo parou
+        held = max(self.stalled_until.get(source, 0.0), self.stalled_until.get(target, 0.0)) - self.simulator.now()
+        if held > 0:
+            delay += held
+
+        def arrive():
+            # A partição ou a queda pode ter acontecido enquanto a mensagem estava em trânsito
+            if not self.reachable(source, target):
+                self.stats['unreachable'] += 1
+                return
+            self.stats['delivered'] += 1
+            deliver()
+        self.simulator.call_later(delay, arrive)
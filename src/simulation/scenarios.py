@@ -0,0 +1,216 @@
+import argparse
+import json
+import logging
+import time
+from collections import Counter
+
+from src.config import MEMBERSHIP_PROTOCOL, LEASE_DURATION
+from src.simulation.simulator import Simulator
+from src.simulation.network import SimNetwork
+from src.simulation.sim_node import SimNode
+
+# Mensagens que só existem para detectar falhas: pings do SWIM e renovações do arrendamento
+LIVENESS_METHODS = ('on_ping', 'on_ping_req', 'on_renew_lease')
+
+class LeaderAgreement:
+    """Acompanha, a cada troca de líder ou queda, em quem os nós vivos acreditam.
+
+    Evita varrer o grupo inteiro a cada evento só para testar a condição de parada.
+    """
+
+    def __init__(self, node_ids):
+        self.beliefs = {nid: None for nid in node_ids}
+        self.votes = Counter({None: len(self.beliefs)})
+
+    def on_leader(self, node_id, leader_id):
+        if node_id not in self.beliefs:
+            return
+        self._withdraw(self.beliefs[node_id])
+        self.votes[leader_id] += 1
+        self.beliefs[node_id] = leader_id
+
+    def on_crash(self, node_id):
+        if node_id in self.beliefs:
+            self._withdraw(self.beliefs.pop(node_id))
+
+    def _withdraw(self, leader_id):
+        self.votes[leader_id] -= 1
+        if not self.votes[leader_id]:
+            del self.votes[leader_id]
+
+    def leader(self):
+        """O líder se todos os nós vivos concordam nele e ele está vivo; senão None."""
+        if len(self.votes) != 1:
+            return None
+        (leader_id,) = self.votes
+        return leader_id if leader_id in self.beliefs else None
+
+def build_cluster(nodes, algorithm='bully', seed=0, min_delay=0.001, max_delay=0.01, loss=0.0,
+                  membership=MEMBERSHIP_PROTOCOL, lease_duration=LEASE_DURATION):
+    """Cria um grupo simulado com ids 1..nodes; retorna (simulator, network, {id: SimNode}, agreement)."""
+    simulator = Simulator(seed)
+    network = SimNetwork(simulator, min_delay=min_delay, max_delay=max_delay, loss=loss)
+    ids = list(range(1, nodes + 1))
+    agreement = LeaderAgreement(ids)
+    group = {nid: SimNode(simulator, network, nid, 'A' if algorithm == 'bully' else 'B', ids, ids, algorithm=algorithm,
+                          observer=agreement, membership_protocol=membership, lease_duration=lease_duration)
+             for nid in ids}
+    return simulator, network, group, agreement
+
+def _elect(simulator, group, agreement, limit):
+    for node in group.values():
+        node.start_simulation(election_delay=simulator.rng.uniform(0, 1.0))
+    simulator.run(until=limit, stop_when=lambda: agreement.leader() is not None)
+    return agreement.leader()
+
+def failover(nodes=50, algorithm='bully', seed=0, loss=0.0, min_delay=0.001, max_delay=0.01, partition=False, settle=10.0,
+             limit=3600.0, membership=MEMBERSHIP_PROTOCOL, lease_duration=LEASE_DURATION):
+    """Elege um líder, espera o grupo estabilizar por `settle` segundos, derruba o líder e mede,
+    em tempo virtual, quanto o grupo leva para convergir de novo.
+
+    Com partition=True a rede também é dividida ao meio durante a recuperação e reunida em seguida.
+    """
+    started = time.perf_counter()
+    simulator, network, group, agreement = build_cluster(nodes, algorithm, seed, min_delay, max_delay, loss,
+                                                         membership, lease_duration)
+    result = {'nodes': nodes, 'algorithm': algorithm, 'seed': seed, 'loss': loss, 'membership': membership,
+              'lease_duration': lease_duration}
+    first_leader = _elect(simulator, group, agreement, limit)
+    result['first_leader'] = first_leader
+    result['time_to_first_leader'] = simulator.now()
+    if first_leader is None:
+        return _finish(result, simulator, network, started)
+
+    simulator.run(until=simulator.now() + settle)
+    crashed_at = simulator.now()
+    network.crash(first_leader)
+    if partition:
+        survivors = sorted(nid for nid in group if nid != first_leader)
+        network.partition(survivors[:len(survivors) // 2])
+        simulator.run(until=crashed_at + limit / 2)
+        network.heal()
+    simulator.run(until=crashed_at + limit, stop_when=lambda: agreement.leader() not in (None, first_leader))
+    result['new_leader'] = agreement.leader()
+    result['failover_time'] = simulator.now() - crashed_at
+    detections = [node.leader_history[-1][0] for node in group.values()
+                  if not node.crashed and node.leader_history and node.leader_history[-1][1] != first_leader]
+    if detections:
+        result['first_node_switched_after'] = min(detections) - crashed_at
+    return _finish(result, simulator, network, started)
+
+def stall(nodes=50, algorithm='bully', seed=0, loss=0.0, min_delay=0.001, max_delay=0.01, pause=3.0, settle=10.0,
+          limit=3600.0, membership=MEMBERSHIP_PROTOCOL, lease_duration=LEASE_DURATION):
+    """Elege um líder, pausa-o por `pause` segundos (como uma coleta de lixo longa) e conta as trocas de
+    líder desnecessárias até `settle` segundos depois do fim da pausa. O líder não falhou: o esperado é zero.
+    """
+    started = time.perf_counter()
+    simulator, network, group, agreement = build_cluster(nodes, algorithm, seed, min_delay, max_delay, loss,
+                                                         membership, lease_duration)
+    result = {'nodes': nodes, 'algorithm': algorithm, 'seed': seed, 'loss': loss, 'membership': membership,
+              'lease_duration': lease_duration, 'pause': pause}
+    first_leader = _elect(simulator, group, agreement, limit)
+    result['first_leader'] = first_leader
+    if first_leader is None:
+        return _finish(result, simulator, network, started)
+
+    simulator.run(until=simulator.now() + settle)
+    stalled_at = simulator.now()
+    # O contador é do processo (um por grupo), então mede-se a diferença
+    suppressed = group[first_leader].suppressed_elections.value()
+    network.stall(first_leader, pause)
+    simulator.run(until=stalled_at + pause + settle)
+    switches = [leader_id for node in group.values() for at, leader_id in node.leader_history
+                if at >= stalled_at and leader_id != first_leader]
+    result['spurious_leader_switches'] = len(switches)
+    result['nodes_switched'] = len({node.node_id for node in group.values()
+                                    if any(at >= stalled_at and leader_id != first_leader
+                                           for at, leader_id in node.leader_history)})
+    result['final_leader'] = agreement.leader()
+    result['suppressed_elections'] = group[first_leader].suppressed_elections.value() - suppressed
+    return _finish(result, simulator, network, started)
+
+def traffic(nodes=50, algorithm='bully', seed=0, loss=0.0, min_delay=0.001, max_delay=0.01, task_rate=0.0, duration=60.0,
+            settle=10.0, limit=3600.0, membership=MEMBERSHIP_PROTOCOL, lease_duration=LEASE_DURATION):
+    """Elege um líder e, por `duration` segundos, faz o líder despachar `task_rate` tarefas por segundo em
+    rodízio entre os seguidores; conta as mensagens de liveness e de tarefas no período.
+
+    Como toda mensagem conta como sinal de vida, as de liveness devem cair conforme task_rate cresce.
+    """
+    started = time.perf_counter()
+    simulator, network, group, agreement = build_cluster(nodes, algorithm, seed, min_delay, max_delay, loss,
+                                                         membership, lease_duration)
+    result = {'nodes': nodes, 'algorithm': algorithm, 'seed': seed, 'loss': loss, 'membership': membership,
+              'lease_duration': lease_duration, 'task_rate': task_rate, 'duration': duration}
+    first_leader = _elect(simulator, group, agreement, limit)
+    result['first_leader'] = first_leader
+    if first_leader is None:
+        return _finish(result, simulator, network, started)
+
+    simulator.run(until=simulator.now() + settle)
+    window_start = simulator.now()
+    before = Counter(network.messages)
+    leader = group[first_leader]
+    followers = sorted(nid for nid in group if nid != first_leader)
+    dispatched = [0]
+
+    def dispatch():
+        if simulator.now() >= window_start + duration:
+            return
+        leader.dispatch_task(followers[dispatched[0] % len(followers)], 'sim-task')
+        dispatched[0] += 1
+        simulator.call_later(1.0 / task_rate, dispatch)
+    if task_rate > 0 and followers:
+        dispatch()
+    simulator.run(until=window_start + duration)
+
+    window = network.messages - before
+    liveness = sum(window[method] for method in LIVENESS_METHODS)
+    result['tasks'] = window['on_task']
+    result['liveness_messages'] = liveness
+    result['liveness_per_node_per_second'] = liveness / nodes / duration
+    result['messages'] = dict(window)
+    result['leader_switches'] = sum(1 for node in group.values() for at, leader_id in node.leader_history
+                                    if at >= window_start and leader_id != first_leader)
+    return _finish(result, simulator, network, started)
+
+def _finish(result, simulator, network, started):
+    result['virtual_time'] = simulator.now()
+    result['events'] = simulator.events_processed
+    result['network'] = dict(network.stats)
+    result['wall_time'] = time.perf_counter() - started
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação determinística de eleição e detecção de falhas em tempo virtual.")
+    parser.add_argument('--scenario', choices=('failover', 'stall', 'traffic'), default='failover',
+                        help="failover: o líder cai; stall: o líder pausa e volta; traffic: liveness sob carga de tarefas")
+    parser.add_argument('--nodes', type=int, default=50)
+    parser.add_argument('--algorithm', choices=('bully', 'ring'), default='bully')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--loss', type=float, default=0.0, help="probabilidade de perda de cada mensagem")
+    parser.add_argument('--min-delay', type=float, default=0.001)
+    parser.add_argument('--max-delay', type=float, default=0.01)
+    parser.add_argument('--partition', action='store_true', help="divide a rede ao meio durante a recuperação")
+    parser.add_argument('--settle', type=float, default=10.0, help="segundos virtuais entre a eleição e a queda do líder")
+    parser.add_argument('--limit', type=float, default=3600.0, help="segundos virtuais máximos por fase")
+    parser.add_argument('--pause', type=float, default=3.0, help="segundos virtuais de pausa do líder (cenário stall)")
+    parser.add_argument('--task-rate', type=float, default=0.0, help="tarefas por segundo despachadas pelo líder (cenário traffic)")
+    parser.add_argument('--duration', type=float, default=60.0, help="segundos virtuais medidos (cenário traffic)")
+    parser.add_argument('--membership', choices=('lease', 'swim'), default=MEMBERSHIP_PROTOCOL)
+    parser.add_argument('--lease', type=float, default=LEASE_DURATION, help="duração do arrendamento; 0 desliga")
+    args = parser.parse_args()
+    # Com grupos grandes, os eventos de cada nó seriam milhares de linhas; o resultado é o JSON final
+    logging.getLogger('simula').setLevel(logging.ERROR)
+    if args.scenario == 'traffic':
+        result = traffic(args.nodes, args.algorithm, args.seed, args.loss, args.min_delay, args.max_delay, args.task_rate,
+                         args.duration, args.settle, args.limit, args.membership, args.lease)
+    elif args.scenario == 'stall':
+        result = stall(args.nodes, args.algorithm, args.seed, args.loss, args.min_delay, args.max_delay, args.pause,
+                       args.settle, args.limit, args.membership, args.lease)
+    else:
+        result = failover(args.nodes, args.algorithm, args.seed, args.loss, args.min_delay, args.max_delay,
+                          args.partition, args.settle, args.limit, args.membership, args.lease)
+    print(json.dumps(result, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+import random
+
+from src.node import Node
+from src.common.bully_election import BullyElection
+from src.common.ring_election import RingElection
+from src.config import (SWIM_PROTOCOL_PERIOD, HEARTBEAT_INTERVAL, ELECTION_TIMEOUT, COORDINATOR_TIMEOUT, RING_ELECTION_TIMEOUT, MEMBERSHIP_PROTOCOL,
+                        LEASE_DURATION)
+
+class SimNode(Node):
+    """Nó simulado: o mesmo Node, com a eleição (Bully ou anel), o SWIM e o arrendamento ligados ao SimNetwork.
+
+    Não é iniciado como thread: start_simulation() agenda os laços de sondagem/renovação e a primeira eleição
+    no relógio virtual. As mensagens carregam o tempo de Lamport como nos transportes reais, e toda entrega
+    conta como sinal de vida do remetente (on_envelope). A membership 'heartbeat' não é simulada.
+    """
+
+    def __init__(self, simulator, network, node_id, group_id, group_ids, cluster_ids=None, algorithm='bully', observer=None,
+                 membership_protocol=MEMBERSHIP_PROTOCOL, lease_duration=LEASE_DURATION):
+        self.simulator = simulator
+        self.stalled_until = 0.0
+        super().__init__(node_id, group_id, {nid: {} for nid in group_ids}, cluster_ids,
+                         schedule=self._schedule, now=simulator.now, rng=random.Random(simulator.rng.random()),
+                         membership_protocol=membership_protocol)
+        self.network = network
+        self.observer = observer
+        self.crashed = False
+        self.leader_history = []
+        self.active_nodes = {nid: self.now() for nid in group_ids if nid != node_id}
+        if algorithm == 'bully':
+            self.election = BullyElection(node_id, self._election_candidates, self._broadcast_election,
+                                          on_leader=self._on_leader_elected, election_timeout=ELECTION_TIMEOUT,
+                                          coordinator_timeout=COORDINATOR_TIMEOUT, schedule=self.schedule, clock=self.now)
+        else:
+            self.election = RingElection(node_id, group_ids, self._send_ring_message, self._is_alive,
+                                         on_leader=self._on_leader_elected, election_timeout=RING_ELECTION_TIMEOUT,
+                                         unreachable_ttl=RING_ELECTION_TIMEOUT, schedule=self.schedule, clock=self.now)
+        self.membership = self._create_membership(self._ping, self._ping_req)
+        self.lease = self._create_lease(self._renew_lease, duration=lease_duration)
+        network.register(self)
+
+    # --- Ciclo de vida ---
+    def start_simulation(self, election_delay=0.0):
+        # Fases aleatórias: os nós não sondam nem renovam todos no mesmo instante virtual
+        if self.lease.enabled:
+            self._every(self.lease.renew_interval, self._lease_period, first=self.rng.uniform(0, self.lease.renew_interval))
+        if self.membership_protocol == 'swim':
+            self._every(SWIM_PROTOCOL_PERIOD, self._membership_period, first=self.rng.uniform(0, SWIM_PROTOCOL_PERIOD))
+        elif self.membership_protocol == 'heartbeat':
+            phase = self.rng.uniform(0, HEARTBEAT_INTERVAL)
+            self._every(HEARTBEAT_INTERVAL, self._heartbeat_round, first=phase)
+            self._every(HEARTBEAT_INTERVAL, self._check_failures, first=phase)
+        self.schedule(election_delay, self.start_election)
+
+    def _schedule(self, delay, callback):
+        return self.simulator.call_later(delay, lambda: self._when_awake(callback))
+
+    def _when_awake(self, callback):
+        # Durante uma pausa (ex.: coleta de lixo) nenhum temporizador do nó roda; os vencidos disparam ao final
+        if self.simulator.now() < self.stalled_until:
+            self.simulator.call_later(self.stalled_until - self.simulator.now(), lambda: self._when_awake(callback))
+            return
+        callback()
+
+    def stall(self, until):
+        self.stalled_until = max(self.stalled_until, until)
+
+    def crash(self):
+        self.crashed = True
+        self.is_running = False
+        if self.observer:
+            self.observer.on_crash(self.node_id)
+
+    def on_envelope(self, sender_id, two_way):
+        self._heard_from(sender_id, two_way=two_way)
+
+    # --- Eleição ---
+    def start_election(self):
+        if not self.crashed:
+            self.election.start()
+
+    def _election_candidates(self):
+        return [self.node_id] + list(self.active_nodes)
+
+    def _is_alive(self, nid):
+        return nid in self.active_nodes
+
+    def _on_leader_elected(self, leader_id):
+        self.leader_id = leader_id
+        self.leader_history.append((self.now(), leader_id))
+        self._on_leadership_change()
+        if self.observer:
+            self.observer.on_leader(self.node_id, leader_id)
+
+    def _on_leadership_change(self):
+        # Sem multicast intergrupos nem escalonador de tarefas na simulação
+        self.lease.follow(self.leader_id, list(self.active_nodes))
+
+    def _broadcast_election(self, targets, message_type, timeout, callback):
+        if not targets:
+            callback(set())
+            return
+        state = {'pending': len(targets), 'responders': set()}
+
+        def on_reply(nid, ok, response):
+            if ok:
+                self.clock.update(response[0])
+                if message_type != 'ELECTION' or response[1]:
+                    state['responders'].add(nid)
+            state['pending'] -= 1
+            if state['pending'] == 0:
+                callback(state['responders'])
+
+        for nid in targets:
+            self.network.call(self.node_id, nid, 'on_election_message', (self.node_id, message_type, self.clock.increment()),
+                              timeout, lambda ok, response, nid=nid: on_reply(nid, ok, response))
+
+    def on_election_message(self, sender_id, message_type, lamport_time, reply):
+        reply_time = self.clock.update_and_increment(lamport_time)
+        if message_type == 'ELECTION':
+            reply((reply_time, self.election.on_election(sender_id)))
+        else:
+            reply((reply_time, True))
+            self.election.on_coordinator(sender_id)
+
+    def _send_ring_message(self, target_id, message):
+        return self.network.send(self.node_id, target_id, 'on_ring_message', message, self.clock.increment())
+
+    def on_ring_message(self, message, lamport_time):
+        self.clock.update(lamport_time)
+        self.election.on_message(message)
+
+    # --- SWIM ---
+    def _ping(self, target_id, updates, timeout, callback):
+        self.network.call(self.node_id, target_id, 'on_ping', (self.node_id, self.clock.increment(), updates), timeout,
+                          lambda ok, response: self._on_ping_reply(callback, ok, response))
+
+    def _ping_req(self, helper_id, target_id, updates, timeout, callback):
+        self.network.call(self.node_id, helper_id, 'on_ping_req', (self.node_id, target_id, self.clock.increment(), updates),
+                          timeout, lambda ok, response: self._on_ping_reply(callback, ok, response))
+
+    def _on_ping_reply(self, callback, ok, response):
+        if not ok:
+            callback(False, [])
+            return
+        lamport_time, alive, updates = response
+        self.clock.update(lamport_time)
+        callback(alive, updates)
+
+    def on_ping(self, sender_id, lamport_time, updates, reply):
+        reply_time = self.clock.update_and_increment(lamport_time)
+        reply((reply_time, True, self.membership.receive(sender_id, updates)))
+
+    def on_ping_req(self, sender_id, target_id, lamport_time, updates, reply):
+        self.clock.update(lamport_time)
+        piggyback = self.membership.receive(sender_id, updates)
+
+        def on_target_reply(ok, response):
+            if ok:
+                self.clock.update(response[0])
+                self.membership.receive(target_id, response[2])
+            reply((self.clock.increment(), ok, piggyback))
+        self.network.call(self.node_id, target_id, 'on_ping', (self.node_id, self.clock.increment(), self.membership.piggyback()),
+                          self.membership.ack_timeout, on_target_reply)
+
+    # --- Arrendamento ---
+    def _renew_lease(self, leader_id, timeout, callback):
+        self.network.call(self.node_id, leader_id, 'on_renew_lease', (self.node_id, self.clock.increment(), self.membership.piggyback()),
+                          timeout, lambda ok, response: self._on_lease_reply(leader_id, callback, ok, response))
+
+    def _on_lease_reply(self, leader_id, callback, ok, response):
+        if not ok:
+            callback(False, False)
+            return
+        lamport_time, granted, updates = response
+        self.clock.update(lamport_time)
+        self.membership.record_reply(leader_id, updates)
+        callback(True, granted)
+
+    def on_renew_lease(self, sender_id, lamport_time, updates, reply):
+        reply_time = self.clock.update_and_increment(lamport_time)
+        granted, piggyback = self._grant_lease(sender_id, updates)
+        reply((reply_time, granted, piggyback))
+
+    # --- Tarefas (tráfego da aplicação) ---
+    def dispatch_task(self, target_id, task_name):
+        self.network.call(self.node_id, target_id, 'on_task', (self.node_id, task_name, self.clock.increment()),
+                          ELECTION_TIMEOUT, self._on_task_reply)
+
+    def _on_task_reply(self, ok, response):
+        if ok:
+            self.clock.update(response[0])
+
+    def on_task(self, sender_id, task_name, lamport_time, reply):
+        reply_time = self.clock.update_and_increment(lamport_time)
+        reply((reply_time, self._run_task(task_name)))
+
+    def _heartbeat_round(self):
+        # As respostas chegam como sinal de vida por on_envelope; o callback não tem o que fazer
+        for nid in self._quiet_peers():
+            self._ping(nid, [], ELECTION_TIMEOUT, lambda ok, updates: None)
+
+    def _handle_node_failure(self, nid):
+        # Sem snapshots nem escalonador de tarefas na simulação
+        self.active_nodes.pop(nid, None)
+        if nid == self.leader_id:
+            self._leader_failed(nid)
@@ -0,0 +1,67 @@
+import heapq
+import itertools
+import random
+
+class _Event:
+    __slots__ = ('callback', 'cancelled')
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class Simulator:
+    """Laço de eventos discretos com relógio virtual.
+
+    `call_later` e `now` têm a mesma forma de `timers.call_later` e `time.monotonic`, então podem ser
+    injetados nos motores de eleição, membership e snapshot. Tudo roda em uma única thread, na ordem
+    (instante, ordem de agendamento): com a mesma semente, a execução é sempre a mesma.
+    """
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.events_processed = 0
+        self._now = 0.0
+        self._queue = []
+        self._sequence = itertools.count()
+
+    def now(self):
+        return self._now
+
+    def call_later(self, delay, callback):
+        """Agenda callback para daqui a `delay` segundos virtuais; retorna um handle com cancel()."""
+        event = _Event(callback)
+        heapq.heappush(self._queue, (self._now + max(delay, 0.0), next(self._sequence), event))
+        return event
+
+    def run(self, until=None, stop_when=None, max_events=None):
+        """Processa eventos até o instante `until`, até stop_when() ser verdadeiro ou até a fila esvaziar.
+
+        Retorna True se parou porque stop_when() foi satisfeito.
+        """
+        processed = 0
+        stopped = False
+        while self._queue:
+            if stop_when is not None and stop_when():
+                stopped = True
+                break
+            when, _, event = self._queue[0]
+            if until is not None and when > until:
+                break
+            if max_events is not None and processed >= max_events:
+                break
+            heapq.heappop(self._queue)
+            if event.cancelled:
+                continue
+            self._now = when
+            event.callback()
+            processed += 1
+        self.events_processed += processed
+        # Só avança o relógio até `until` se a janela foi esgotada, não quando stop_when() interrompeu antes
+        stopped = stopped or (stop_when is not None and stop_when())
+        if not stopped and until is not None and self._now < until:
+            self._now = until
+        return stopped
@@ -0,0 +1,25 @@
+from src.config import GROUP_A_NODES, GROUP_B_NODES, CLUSTER_HOST, GROUP_A_BASE_PORT, GROUP_B_BASE_PORT
+
+def default_topology():
+    """A topologia fixa de src/config.py: (nós do Grupo A, nós do Grupo B)."""
+    return GROUP_A_NODES, GROUP_B_NODES
+
+def generate_topology(nodes_a, nodes_b, host=CLUSTER_HOST, base_port_a=GROUP_A_BASE_PORT, base_port_b=GROUP_B_BASE_PORT):
+    """Gera a configuração de N nós por grupo no mesmo formato de GROUP_A_NODES/GROUP_B_NODES.
+
+    Os ids são consecutivos (Grupo A primeiro, depois o Grupo B) e as portas sobem a partir de cada base.
+    Um grupo pode ficar vazio (não é iniciado), mas não os dois.
+    """
+    if nodes_a < 0 or nodes_b < 0 or nodes_a + nodes_b < 1:
+        raise ValueError("The cluster needs at least one node, and no group can have a negative size.")
+    ports_a = range(base_port_a, base_port_a + nodes_a)
+    ports_b = range(base_port_b, base_port_b + nodes_b)
+    if set(ports_a) & set(ports_b):
+        raise ValueError(f"Port ranges overlap: A uses {ports_a.start}-{ports_a.stop - 1}, B uses {ports_b.start}-{ports_b.stop - 1}.")
+    group_a = {node_id: {'host': host, 'port': port} for node_id, port in zip(range(1, nodes_a + 1), ports_a)}
+    group_b = {node_id: {'host': host, 'port': port} for node_id, port in zip(range(nodes_a + 1, nodes_a + nodes_b + 1), ports_b)}
+    return group_a, group_b
+
+def cluster_ids(group_a, group_b):
+    """Ids de todos os nós, na ordem usada pelo relógio vetorial."""
+    return sorted(set(group_a) | set(group_b))
@@ -0,0 +1,91 @@
+import types
+from datetime import datetime, timedelta, timezone
+
+import grpc
+import jwt
+import Pyro5.api
+import Pyro5.errors
+import pytest
+
+from src.common import token_manager
+from src.common.token_manager import TokenManager
+from src.config import TOKEN_SECRET_KEY, TOKEN_NEGATIVE_CACHE_TTL
+from src.group_a import service_pb2
+from src.group_a.auth_interceptor import auth_metadata
+from src.group_a.channel_pool import ChannelPool
+
+def _token(node_id, expires_in):
+    exp = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+    return jwt.encode({'node_id': node_id, 'exp': exp}, TOKEN_SECRET_KEY, algorithm="HS256")
+
+def _stats_delta(before):
+    return {key: TokenManager.stats[key] - value for key, value in before.items()}
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Relógio de parede controlado pelo teste, só dentro do token_manager."""
+    fake = types.SimpleNamespace(now=token_manager.time.time())
+    monkeypatch.setattr(token_manager, 'time', types.SimpleNamespace(time=lambda: fake.now,
+                                                                     perf_counter=token_manager.time.perf_counter))
+    return fake
+
+def test_verified_token_is_served_from_cache():
+    token = _token(7, 3600)
+    before = dict(TokenManager.stats)
+    assert TokenManager.validate_token(token)['node_id'] == 7
+    assert TokenManager.validate_tokens([token, token]) == [TokenManager.validate_token(token)] * 2
+    assert _stats_delta(before) == {'hits': 3, 'misses': 1, 'negative_hits': 0, 'expired_evictions': 0}
+
+def test_rejected_token_is_remembered_for_a_while(clock):
+    token = _token(7, 3600)[:-2] + "xx" # Assinatura inválida
+    before = dict(TokenManager.stats)
+    assert TokenManager.validate_token(token) is None
+    assert TokenManager.validate_token(token) is None
+    assert _stats_delta(before)['negative_hits'] == 1
+    clock.now += TOKEN_NEGATIVE_CACHE_TTL + 1
+    assert TokenManager.validate_token(token) is None
+    assert _stats_delta(before) == {'hits': 0, 'misses': 2, 'negative_hits': 1, 'expired_evictions': 0}
+
+def test_cached_token_stops_being_accepted_when_it_expires(clock):
+    token = _token(7, 60)
+    assert TokenManager.validate_token(token)['node_id'] == 7
+    before = dict(TokenManager.stats)
+    clock.now += 61
+    assert TokenManager.validate_token(token) is None
+    assert TokenManager.validate_token(token) is None # Agora vem do cache negativo, sem verificar a assinatura
+    assert _stats_delta(before) == {'hits': 0, 'misses': 0, 'negative_hits': 1, 'expired_evictions': 1}
+
+def test_group_a_task_rpcs_require_a_token(cluster):
+    node = cluster('A', 1)[0]
+    pool = ChannelPool(node.all_nodes_config)
+    try:
+        stub = pool.get_stub(node.node_id)
+        request = service_pb2.TaskRequest(task_name='auth', lamport_time=1, sender_id=9)
+        for metadata in ((), auth_metadata(_token(9, 3600)[:-2] + "xx")):
+            with pytest.raises(grpc.RpcError) as error:
+                stub.ExecuteTask(request, metadata=metadata, timeout=5)
+            assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
+            with pytest.raises(grpc.RpcError) as error:
+                list(stub.ExecuteTasks(iter([request]), metadata=metadata, timeout=5))
+            assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
+
+        metadata = auth_metadata(TokenManager.generate_token(9))
+        assert stub.ExecuteTask(request, metadata=metadata, timeout=5).status == "Task completed"
+        assert [r.status for r in stub.ExecuteTasks(iter([request]), metadata=metadata, timeout=5)] == ["Task completed"]
+        # Heartbeats e eleições não são protegidos
+        assert stub.Heartbeat(service_pb2.HeartbeatMessage(sender_id=9, lamport_time=1), timeout=5).status == \
+            service_pb2.HeartbeatResponse.ALIVE
+    finally:
+        pool.close()
+
+def test_group_b_connections_require_a_token(pyro_ns, cluster):
+    node = cluster('B', 1)[0]
+    uri = node.resolver.resolve(node.node_id)
+    for handshake in (None, "not-a-token"):
+        with Pyro5.api.Proxy(uri) as proxy:
+            proxy._pyroHandshake = handshake
+            with pytest.raises(Pyro5.errors.CommunicationError):
+                proxy.heartbeat(9, 1)
+    with Pyro5.api.Proxy(uri) as proxy:
+        proxy._pyroHandshake = TokenManager.generate_token(9)
+        assert proxy.heartbeat(9, 1)[0] == "ALIVE"
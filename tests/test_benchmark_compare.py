@@ -0,0 +1,17 @@
+from src.benchmarks.cluster import compare
+
+def test_latency_regression_beyond_tolerance_is_reported():
+    regressions = compare({'tasks.A.p99_ms': 12.0, 'tasks.A.p50_ms': 2.1}, {'tasks.A.p99_ms': 10.0, 'tasks.A.p50_ms': 2.0}, 0.1)
+    assert [regression['metric'] for regression in regressions] == ['tasks.A.p99_ms']
+    assert abs(regressions[0]['change'] - 0.2) < 1e-9
+
+def test_throughput_regresses_when_it_drops():
+    baseline = {'tasks.B.throughput': 1000.0}
+    assert compare({'tasks.B.throughput': 1200.0}, baseline, 0.1) == []
+    assert [regression['metric'] for regression in compare({'tasks.B.throughput': 800.0}, baseline, 0.1)] == ['tasks.B.throughput']
+
+def test_missing_and_zero_baselines():
+    # Métricas novas ou ausentes não contam; sobre uma base zero, qualquer piora conta
+    assert compare({'startup.A.first_leader': 0.5}, {}, 0.1) == []
+    assert compare({'failover.A.cpu': None}, {'failover.A.cpu': 0.1}, 0.1) == []
+    assert compare({'tasks.A.errors': 2}, {'tasks.A.errors': 0}, 0.1)[0]['change'] is None
@@ -0,0 +1,71 @@
+from src.common.bully_election import BullyElection, IDLE, WAITING_COORDINATOR
+
+def _bully(node_id, peer_ids):
+    """Motor com transporte e prazos manuais: o teste responde aos envios e dispara os prazos."""
+    sent, timers, leaders = [], [], []
+    election = BullyElection(node_id, lambda: list(peer_ids),
+                             lambda targets, message, timeout, callback: sent.append((targets, message, callback)),
+                             on_leader=leaders.append, schedule=lambda delay, callback: timers.append(callback),
+                             clock=lambda: 0.0)
+    return election, sent, timers, leaders
+
+def test_highest_node_elects_itself_and_announces():
+    election, sent, _, leaders = _bully(3, [1, 2, 3])
+    assert election.start()
+    assert election.leader_id == 3 and leaders == [3]
+    assert [(targets, message) for targets, message, _ in sent] == [([1, 2], 'COORDINATOR')]
+    sent[0][2]([1, 2])
+    assert election.last_election == {'leader': 3, 'duration': 0.0, 'messages': 4}
+
+def test_election_goes_to_all_higher_nodes_at_once():
+    election, sent, _, _ = _bully(1, [1, 2, 3])
+    election.start()
+    assert [(targets, message) for targets, message, _ in sent] == [([2, 3], 'ELECTION')]
+    assert not election.start() # Eleição concorrente neste nó é suprimida
+    assert election.stats['suppressed'] == 1
+
+def test_no_answer_from_higher_nodes_makes_the_starter_leader():
+    election, sent, _, leaders = _bully(1, [1, 2, 3])
+    election.start()
+    sent[0][2]([])
+    assert leaders == [1]
+    assert sent[1][:2] == ([2, 3], 'COORDINATOR')
+
+def test_ok_without_coordinator_restarts_the_election():
+    election, sent, timers, leaders = _bully(1, [1, 2, 3])
+    election.start()
+    sent[0][2]([3])
+    assert election.state == WAITING_COORDINATOR
+    timers.pop()()
+    assert election.stats['restarts'] == 1
+    assert len(sent) == 2 and sent[1][1] == 'ELECTION'
+    assert leaders == []
+
+def test_coordinator_ends_the_local_election_and_drops_stale_replies():
+    election, sent, timers, leaders = _bully(1, [1, 2, 3])
+    election.start()
+    election.on_coordinator(3)
+    assert election.state == IDLE and leaders == [3]
+    sent[0][2]([]) # Resposta atrasada da eleição já encerrada
+    assert election.leader_id == 3 and leaders == [3]
+
+def test_lower_node_election_is_taken_over():
+    election, sent, _, _ = _bully(2, [1, 2, 3])
+    assert election.on_election(1)
+    assert sent[0][:2] == ([3], 'ELECTION')
+    assert not election.on_election(3)
+
+def test_settled_leader_reannounces_to_a_late_starter_only():
+    election, sent, _, _ = _bully(3, [1, 2, 3])
+    election.start()
+    sent.clear()
+    assert election.on_election(1)
+    assert [(targets, message) for targets, message, _ in sent] == [([1], 'COORDINATOR')]
+    assert election.state == IDLE
+
+def test_lower_coordinator_triggers_a_new_election():
+    election, sent, _, leaders = _bully(2, [1, 2])
+    election.on_coordinator(1)
+    assert leaders[0] == 1
+    # Sem nós maiores, este nó assume na mesma hora
+    assert election.leader_id == 2 and leaders == [1, 2]
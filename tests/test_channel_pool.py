@@ -0,0 +1,61 @@
+import socket
+import time
+
+import grpc
+import pytest
+
+from src.group_a import service_pb2
+from src.group_a.channel_pool import ChannelPool, ChannelPoolClosed
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _heartbeat(stub):
+    return stub.Heartbeat(service_pb2.HeartbeatMessage(sender_id=99, lamport_time=1), timeout=2)
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_stub_is_reused_across_calls(cluster):
+    node = cluster('A', 1)[0]
+    pool = ChannelPool(node.all_nodes_config)
+    try:
+        stub = pool.get_stub(node.node_id)
+        for _ in range(3):
+            assert _heartbeat(pool.get_stub(node.node_id)).status == service_pb2.HeartbeatResponse.ALIVE
+        assert pool.get_stub(node.node_id) is stub
+        assert pool.get_stats() == {'hits': 4, 'misses': 1, 'reconnects': 0}
+    finally:
+        pool.close()
+
+def test_broken_channel_is_replaced_with_backoff():
+    pool = ChannelPool({1: {'host': '127.0.0.1', 'port': _closed_port()}}, base_backoff=2.0, max_backoff=4.0)
+    try:
+        stub = pool.get_stub(1)
+        with pytest.raises(grpc.RpcError):
+            _heartbeat(stub)
+        assert _wait_for(lambda: pool._entries[1].is_broken())
+
+        replaced = pool.get_stub(1)
+        assert replaced is not stub and pool.get_stats()['reconnects'] == 1
+        with pytest.raises(grpc.RpcError):
+            _heartbeat(replaced)
+        assert _wait_for(lambda: pool._entries[1].is_broken())
+        # Dentro do intervalo de espera, o canal quebrado é devolvido em vez de recriado a cada chamada
+        assert pool.get_stub(1) is replaced
+        time.sleep(max(pool._next_retry[1] - time.monotonic(), 0) + 0.01)
+        assert pool.get_stub(1) is not replaced and pool.get_stats()['reconnects'] == 2
+    finally:
+        pool.close()
+
+def test_closed_pool_refuses_stubs():
+    pool = ChannelPool({1: {'host': '127.0.0.1', 'port': _closed_port()}})
+    pool.get_stub(1)
+    pool.close()
+    with pytest.raises(ChannelPoolClosed):
+        pool.get_stub(1)
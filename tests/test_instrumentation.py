@@ -0,0 +1,66 @@
+import threading
+import urllib.request
+
+from src.common import instrumentation
+from src.common.instrumentation import Counter, Histogram, Registry
+
+def test_counter_sums_the_cells_of_every_thread():
+    counter = Counter()
+    threads = [threading.Thread(target=lambda: [counter.inc() for _ in range(1000)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(5)
+    assert counter.value() == 4005
+
+def test_histogram_percentiles_stay_within_one_sub_bucket():
+    histogram = Histogram()
+    for micros in range(1, 1001):
+        histogram.observe(micros / 1e6)
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 1000
+    assert abs(snapshot['sum'] - 0.5005) < 1e-9
+    # Limite superior da subfaixa: no máximo 1/16 acima do percentil exato
+    for name, exact in (('p50', 500e-6), ('p90', 900e-6), ('p99', 990e-6)):
+        assert exact <= snapshot[name] <= exact * (1 + 1 / 16)
+
+def test_registry_reuses_metrics_and_renders_prometheus_text():
+    registry = Registry()
+    requests = registry.counter('test_requests_total', "Requests.", method='get')
+    assert registry.counter('test_requests_total', "Requests.", method='get') is requests
+    requests.inc(3)
+    registry.histogram('test_latency_seconds', "Latency.").observe(0.002)
+    text = registry.render()
+    assert '# TYPE test_requests_total counter' in text
+    assert 'test_requests_total{method="get"} 3' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 1' in text
+    assert 'test_latency_seconds_bucket{le="0.002048"} 1' in text
+    assert 'test_latency_seconds_bucket{le="0.001024"} 0' in text
+    assert 'test_latency_seconds_count 1' in text
+
+def test_spans_are_recorded_only_when_sampled():
+    try:
+        instrumentation.set_trace_sample_rate(0.0)
+        with instrumentation.span('test.skipped') as skipped:
+            skipped.set('key', 'value')
+        instrumentation.set_trace_sample_rate(1.0)
+        with instrumentation.span('test.sampled', lamport_time=7, peer=2):
+            pass
+    finally:
+        instrumentation.set_trace_sample_rate(instrumentation.TRACE_SAMPLE_RATE)
+    names = [record['name'] for record in instrumentation.recent_spans()]
+    assert 'test.skipped' not in names
+    record = [record for record in instrumentation.recent_spans() if record['name'] == 'test.sampled'][-1]
+    assert record['lamport_time'] == 7 and record['peer'] == 2 and record['duration'] >= 0
+
+def test_metrics_endpoint_serves_the_registry():
+    instrumentation.counter('test_endpoint_total', "Endpoint test.").inc()
+    server = instrumentation.start_metrics_server(0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert 'test_endpoint_total 1' in response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
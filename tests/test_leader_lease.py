@@ -0,0 +1,147 @@
+from src.common.leader_lease import LeaderLease
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def _lease(node_id=2, **kwargs):
+    # Renovações ficam pendentes em `sent` até o teste responder por elas
+    clock = FakeClock()
+    sent, expired, lapsed = [], [], []
+    lease = LeaderLease(node_id, lambda leader_id, timeout, callback: sent.append((leader_id, callback)),
+                        on_expired=lambda leader_id, refused: expired.append((leader_id, refused)),
+                        on_follower_expired=lapsed.append, duration=5.0, renew_interval=1.0, clock=clock, **kwargs)
+    return lease, clock, sent, expired, lapsed
+
+def test_follower_holds_lease_from_the_coordinator_announcement():
+    lease, clock, sent, expired, _ = _lease()
+    assert not lease.holds()
+    lease.follow(1)
+    assert lease.holds()
+    clock.now = 4.9
+    assert lease.holds()
+    clock.now = 5.0
+    assert not lease.holds()
+
+def test_granted_renewal_extends_the_lease_from_when_it_was_sent():
+    lease, clock, sent, expired, _ = _lease()
+    lease.follow(1)
+    clock.now = 3.0
+    lease.tick()
+    assert [leader_id for leader_id, _ in sent] == [1]
+    clock.now = 4.0
+    sent[0][1](True, True)
+    assert lease.stats['granted'] == 1
+    clock.now = 7.9
+    assert lease.holds()
+    clock.now = 8.0
+    assert not lease.holds()
+
+def test_only_one_renewal_is_in_flight_at_a_time():
+    lease, clock, sent, _, _ = _lease()
+    lease.follow(1)
+    clock.now = 1.0
+    lease.tick()
+    clock.now = 2.0
+    lease.tick()
+    assert len(sent) == 1 and lease.stats['renewals'] == 1
+    sent[0][1](False, False)
+    assert lease.stats['failed'] == 1
+    clock.now = 3.0
+    lease.tick()
+    assert len(sent) == 2
+
+def test_lease_expires_once_without_renewals():
+    lease, clock, sent, expired, _ = _lease()
+    lease.follow(1)
+    clock.now = 1.0
+    lease.tick()
+    sent[0][1](False, False)
+    clock.now = 5.0
+    lease.tick()
+    clock.now = 6.0
+    lease.tick()
+    assert expired == [(1, False)]
+    assert lease.stats['expirations'] == 1
+    assert not lease.holds()
+
+def test_refused_renewal_expires_the_lease_immediately():
+    lease, clock, sent, expired, _ = _lease()
+    lease.follow(1)
+    clock.now = 1.0
+    lease.tick()
+    sent[0][1](True, False)
+    assert expired == [(1, True)]
+    assert lease.stats['refused'] == 1
+    assert not lease.holds()
+
+def test_renewal_answered_after_a_leader_change_is_ignored():
+    lease, clock, sent, expired, _ = _lease()
+    lease.follow(1)
+    clock.now = 1.0
+    lease.tick()
+    lease.follow(3)
+    sent[0][1](True, False)
+    assert expired == []
+    assert lease.leader_id == 3 and lease.holds()
+
+def test_two_way_traffic_with_the_leader_skips_the_next_renewal():
+    lease, clock, sent, _, _ = _lease()
+    lease.follow(1)
+    clock.now = 4.0
+    lease.observe(1)
+    clock.now = 4.2
+    lease.tick()
+    assert sent == [] and lease.stats['skipped'] == 1
+    clock.now = 8.9
+    assert lease.holds()
+
+def test_oneway_traffic_extends_the_lease_but_still_renews():
+    lease, clock, sent, _, _ = _lease()
+    lease.follow(1)
+    clock.now = 4.0
+    lease.observe(1, two_way=False)
+    clock.now = 4.2
+    lease.tick()
+    assert len(sent) == 1
+    assert lease.holds()
+
+def test_leader_grants_renewals_and_collects_lapsed_followers():
+    lease, clock, _, _, lapsed = _lease(node_id=1)
+    lease.follow(1, followers=(1, 2, 3))
+    assert not lease.holds()
+    clock.now = 3.0
+    assert lease.grant(2)
+    clock.now = 5.5
+    lease.tick()
+    assert lapsed == [3]
+    clock.now = 8.5
+    lease.tick()
+    assert lapsed == [3, 2]
+    assert lease.stats['follower_expirations'] == 2
+
+def test_leader_counts_application_traffic_as_renewal():
+    lease, clock, _, _, lapsed = _lease(node_id=1)
+    lease.follow(1, followers=(2,))
+    clock.now = 4.0
+    lease.observe(2)
+    clock.now = 6.0
+    lease.tick()
+    assert lapsed == []
+
+def test_follower_refuses_to_grant():
+    lease, _, _, _, _ = _lease()
+    lease.follow(1)
+    assert not lease.grant(3)
+
+def test_zero_duration_disables_leases():
+    lease, clock, sent, expired, _ = _lease()
+    lease.duration = 0
+    lease.follow(1)
+    clock.now = 10.0
+    lease.tick()
+    assert not lease.holds()
+    assert sent == [] and expired == []
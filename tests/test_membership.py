@@ -0,0 +1,97 @@
+import random
+
+from src.common.membership import PhiAccrualDetector, SwimMembership, ALIVE, SUSPECT, DEAD
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def _swim(node_id=1, peer_ids=(1, 2, 3), **kwargs):
+    """Membership com transporte manual: pings e pings indiretos ficam pendentes até o teste responder."""
+    clock = FakeClock()
+    pings, ping_reqs, dead, alive = [], [], [], []
+    membership = SwimMembership(node_id, list(peer_ids),
+                                lambda target, updates, timeout, callback: pings.append((target, updates, callback)),
+                                lambda helper, target, updates, timeout, callback: ping_reqs.append((helper, target, callback)),
+                                on_dead=dead.append, on_alive=alive.append, clock=clock, rng=random.Random(1), **kwargs)
+    return membership, clock, pings, ping_reqs, dead, alive
+
+def test_phi_grows_with_silence():
+    detector = PhiAccrualDetector(min_std_dev=0.1)
+    for now in range(10):
+        detector.heartbeat(2, float(now))
+    assert detector.phi(2, 9.5) < 1.0
+    assert detector.phi(2, 9.5) < detector.phi(2, 11.0) < detector.phi(2, 13.0)
+    assert detector.phi(3, 100.0) == 0.0
+
+def test_failed_direct_and_indirect_probes_suspect_then_kill():
+    membership, clock, pings, ping_reqs, dead, _ = _swim()
+    clock.now = 1.0
+    membership.probe()
+    target, _, callback = pings.pop()
+    callback(False, [])
+    assert sorted(helper for helper, _, _ in ping_reqs) == [nid for nid in (2, 3) if nid != target]
+    for _, _, indirect in ping_reqs:
+        indirect(False, [])
+    assert membership.status(target) == SUSPECT
+
+    clock.now = 2.0
+    membership.check() # Suspeita recente demais: a refutação ainda pode chegar
+    assert dead == []
+    clock.now = 20.0
+    membership.check()
+    assert dead == [target]
+    assert membership.status(target) == DEAD
+    assert target not in membership.alive_members()
+
+def test_indirect_ack_keeps_the_target_alive():
+    membership, clock, pings, ping_reqs, _, _ = _swim()
+    clock.now = 1.0
+    membership.probe()
+    target, _, callback = pings.pop()
+    callback(False, [])
+    ping_reqs[0][2](True, [])
+    assert membership.status(target) == ALIVE
+    assert membership.stats['suspicions'] == 0
+
+def test_suspicion_about_self_is_refuted_with_higher_incarnation():
+    membership, _, _, _, _, _ = _swim()
+    updates = membership.receive(2, [(1, SUSPECT, 0)])
+    assert membership.incarnation == 1
+    assert (1, ALIVE, 1) in updates
+    assert membership.stats['refutations'] == 1
+
+def test_gossiped_death_and_revival_follow_incarnations():
+    membership, _, _, _, dead, alive = _swim()
+    membership.receive(2, [(3, DEAD, 0)])
+    assert dead == [3] and membership.status(3) == DEAD
+    membership.receive(2, [(3, ALIVE, 0)]) # Boato antigo não ressuscita o membro
+    assert membership.status(3) == DEAD
+    membership.receive(2, [(3, ALIVE, 1)])
+    assert alive == [3] and membership.status(3) == ALIVE
+
+def test_recent_application_traffic_skips_the_probe():
+    membership, clock, pings, _, _, _ = _swim(peer_ids=(1, 2))
+    clock.now = 5.0
+    membership.observe(2)
+    clock.now = 5.5
+    membership.probe()
+    assert pings == [] and membership.stats['skipped'] == 1
+    clock.now = 6.5
+    membership.probe()
+    assert [target for target, _, _ in pings] == [2]
+
+def test_declared_dead_member_is_revisited_and_revived():
+    membership, _, pings, _, dead, alive = _swim(peer_ids=(1, 2), reconnect_periods=1)
+    assert membership.declare_dead(2)
+    assert not membership.declare_dead(2)
+    assert dead == [2]
+    membership.reconnect()
+    target, updates, callback = pings.pop()
+    assert target == 2 and (2, DEAD, 0) in updates
+    callback(True, [])
+    assert alive == [2]
+    assert membership.status(2) == ALIVE
@@ -0,0 +1,52 @@
+import threading
+import time
+
+from src.common.lamport_clock import LamportClock
+from src.common.multicast_communicator import (MulticastCommunicator, DATAGRAM_HEADER, MESSAGE_HEADER, MAGIC, VERSION,
+                                               MSG_LEADER_ANNOUNCE, LEADER_PAYLOAD)
+
+def _datagram(sender_id, *seqs, session=1):
+    payload = LEADER_PAYLOAD.pack(sender_id)
+    messages = b''.join(MESSAGE_HEADER.pack(seq, seq, MSG_LEADER_ANNOUNCE, len(payload)) + payload for seq in seqs)
+    return memoryview(DATAGRAM_HEADER.pack(MAGIC, VERSION, len(seqs), sender_id, b'A', session) + messages)
+
+def _communicator(received, reorder_timeout):
+    on_message = lambda sender_id, group_id, msg_type, lamport_time, payload: received.append((sender_id, lamport_time))
+    return MulticastCommunicator(1, 'B', LamportClock(), on_message, '224.1.1.1', 5007, flush_interval=0.005,
+                                 reorder_timeout=reorder_timeout)
+
+def test_out_of_order_messages_wait_for_the_gap():
+    received = []
+    communicator = _communicator(received, reorder_timeout=60)
+    communicator._parse(_datagram(2, 1))
+    communicator._parse(_datagram(2, 3))
+    assert received == [(2, 1)]
+    communicator._parse(_datagram(2, 2, 3)) # Chega a que faltava; a cópia repetida de 3 é descartada
+    assert received == [(2, 1), (2, 2), (2, 3)]
+    assert communicator.stats['duplicates'] == 1
+
+def test_gap_expires_even_if_the_sender_goes_quiet():
+    received = []
+    communicator = _communicator(received, reorder_timeout=0.05)
+    communicator._parse(_datagram(2, 1))
+    communicator._parse(_datagram(2, 3, 4)) # A 2 se perdeu e o remetente não envia mais nada
+    communicator._parse(_datagram(3, 1))
+    communicator._running = True
+    flusher = threading.Thread(target=communicator._flush_loop, daemon=True)
+    flusher.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(received) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        communicator._running = False
+        flusher.join()
+    assert received == [(2, 1), (3, 1), (2, 3), (2, 4)]
+    assert communicator.stats['gaps'] == 1
+
+def test_start_after_stop_opens_nothing():
+    # O nó pode parar enquanto outra thread dele ainda está assumindo a liderança e subindo o barramento
+    communicator = _communicator([], reorder_timeout=0.2)
+    communicator.stop()
+    communicator.start()
+    assert communicator._send_sock is None and communicator._recv_sock is None
@@ -0,0 +1,49 @@
+import threading
+
+import Pyro5.errors
+import pytest
+
+from src.common.token_manager import TokenManager
+from src.group_b.name_resolver import NameResolver, ProxyPool
+
+@pytest.fixture
+def group_b(pyro_ns, cluster):
+    return cluster('B', 2)
+
+def test_resolver_caches_until_invalidated(group_b):
+    resolver = NameResolver(ttl=60)
+    uri = resolver.resolve(1)
+    assert resolver.resolve(1) == uri
+    resolver.invalidate(1)
+    assert resolver.resolve(1) == uri
+    assert resolver.get_stats() == {'hits': 1, 'lookups': 2, 'invalidations': 1}
+
+def test_expired_entry_is_looked_up_again(group_b):
+    resolver = NameResolver(ttl=0)
+    resolver.resolve(1)
+    resolver.resolve(1)
+    assert resolver.get_stats()['lookups'] == 2
+
+def test_proxies_are_reused_per_thread_and_evicted_on_failure(group_b):
+    pool = ProxyPool(NameResolver(), handshake=lambda: TokenManager.generate_token(1))
+    try:
+        heartbeat = lambda: pool.call(2, 'heartbeat', 1, 1)
+        assert heartbeat()[0] == "ALIVE"
+        proxy = pool.get(2)
+        assert heartbeat()[0] == "ALIVE" and pool.get(2) is proxy
+
+        # Proxies não podem ser compartilhados entre threads: cada uma tem o seu
+        other = []
+        thread = threading.Thread(target=lambda: other.append(pool.get(2)))
+        thread.start()
+        thread.join()
+        assert other[0] is not proxy
+
+        group_b[1].stop()
+        with pytest.raises(Pyro5.errors.CommunicationError):
+            heartbeat()
+        # A falha descarta o proxy desta thread e a URI em cache
+        assert 2 not in pool._proxies()
+        assert pool.resolver.get_stats()['invalidations'] == 1
+    finally:
+        pool.close()
@@ -0,0 +1,17 @@
+from src.launcher import wait_for_leaders
+
+def test_group_a_elects_runs_tasks_and_fails_over(cluster):
+    nodes = cluster('A', 3)
+    assert wait_for_leaders(nodes, 15)['A']['leader_id'] == 3
+    leader = nodes[-1]
+    assert leader.send_task(1, "smoke") == "Task completed"
+
+    leader.stop()
+    assert wait_for_leaders(nodes, 30)['A']['leader_id'] == 2
+
+def test_election_reply_is_stamped_after_the_received_time(cluster):
+    from src.group_a import service_pb2
+    node = cluster('A', 1)[0]
+    request = service_pb2.ElectionMessage(type=service_pb2.ElectionMessage.COORDINATOR, sender_id=9, lamport_time=100)
+    # Recepção (101) e carimbo da resposta (102) em uma única operação do relógio
+    assert node.HandleElection(request, None).lamport_time == 102
@@ -0,0 +1,63 @@
+import time
+
+import Pyro5.errors
+import pytest
+
+from src.config import HEARTBEAT_INTERVAL, HEARTBEAT_ROUND_DEADLINE
+from src.launcher import wait_for_leaders
+
+@pytest.fixture
+def group_b(pyro_ns, cluster):
+    return cluster('B', 4)
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def _heartbeat(sender, target_id):
+    return sender.proxy_pool.call(target_id, 'heartbeat', sender.node_id, sender.clock.increment())
+
+def test_stopped_leader_is_replaced(group_b):
+    assert wait_for_leaders(group_b, 15)['B']['leader_id'] == 4
+    leader, follower = group_b[-1], group_b[0]
+    assert _heartbeat(follower, leader.node_id)[0] == "ALIVE" # Abre a conexão persistente desta thread
+    leader.stop()
+
+    # A conexão já estabelecida não pode continuar sendo atendida pelo nó parado
+    with pytest.raises(Pyro5.errors.PyroError):
+        _heartbeat(follower, leader.node_id)
+    assert wait_for_leaders(group_b, 30)['B']['leader_id'] == 3
+
+def test_stopped_node_does_not_relay_indirect_pings(group_b):
+    sender, helper, target = group_b[:3]
+    assert helper.ping_req(sender.node_id, target.node_id, sender.clock.increment())[0] == "ALIVE"
+    # Uma chamada que chegue antes de a conexão ser fechada não pode atestar que o alvo está vivo
+    helper.stop()
+    with pytest.raises(Pyro5.errors.CommunicationError):
+        helper.ping_req(sender.node_id, target.node_id, sender.clock.increment())
+
+def test_only_the_leader_grants_lease_renewals(group_b):
+    assert wait_for_leaders(group_b, 15)['B']['leader_id'] == 4
+    follower, other, leader = group_b[0], group_b[1], group_b[-1]
+    granted, _, _ = follower.proxy_pool.call(leader.node_id, 'renew_lease', follower.node_id, follower.clock.increment())
+    assert granted
+    granted, _, _ = follower.proxy_pool.call(other.node_id, 'renew_lease', follower.node_id, follower.clock.increment())
+    assert not granted
+    assert follower.lease.holds()
+
+def test_heartbeat_round_pings_quiet_peers_under_one_deadline(group_b):
+    leader = group_b[-1]
+    group_b[1].stop()
+    for nid in (1, 2, 3):
+        leader.active_nodes[nid] = leader.now() - HEARTBEAT_INTERVAL # Todos parecem quietos
+    leader.last_heartbeat_round = None
+    leader._heartbeat_round()
+    assert _wait_for(lambda: (leader.last_heartbeat_round or {}).get('peers') == 3)
+    heartbeat_round = leader.last_heartbeat_round
+    assert heartbeat_round['failed'] == [2]
+    assert sorted(heartbeat_round['rtt']) == [1, 3]
+    assert heartbeat_round['duration'] <= HEARTBEAT_ROUND_DEADLINE + 0.5
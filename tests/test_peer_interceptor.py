@@ -0,0 +1,39 @@
+from concurrent import futures
+
+import grpc
+import pytest
+
+from src.common.token_manager import TokenManager
+from src.group_a.auth_interceptor import AuthInterceptor, auth_metadata
+from src.group_a.peer_interceptor import PeerInterceptor, peer_metadata
+
+@pytest.fixture
+def server():
+    heard = []
+    echo = grpc.unary_unary_rpc_method_handler(lambda request, context: request)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2),
+                         interceptors=[AuthInterceptor(('Protected',)), PeerInterceptor(lambda *peer: heard.append(peer))])
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler('test.Echo', {'Protected': echo, 'Open': echo}),))
+    port = server.add_insecure_port('127.0.0.1:0')
+    server.start()
+    channel = grpc.insecure_channel(f'127.0.0.1:{port}')
+    yield channel, heard
+    channel.close()
+    server.stop(0)
+
+def _call(channel, method, metadata):
+    return channel.unary_unary(f'/test.Echo/{method}')(b'ping', metadata=metadata, timeout=5)
+
+def test_rejected_call_is_not_a_sign_of_life(server):
+    channel, heard = server
+    with pytest.raises(grpc.RpcError) as error:
+        _call(channel, 'Protected', (peer_metadata(7, 3), ('authorization', 'Bearer invalid')))
+    assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
+    assert heard == []
+
+def test_authenticated_and_open_calls_refresh_liveness(server):
+    channel, heard = server
+    token = TokenManager.generate_token(7)
+    assert _call(channel, 'Protected', (peer_metadata(7, 3),) + auth_metadata(token)) == b'ping'
+    assert _call(channel, 'Open', (peer_metadata(7, 4),)) == b'ping'
+    assert heard == [(7, 3), (7, 4)]
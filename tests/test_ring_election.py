@@ -0,0 +1,42 @@
+from src.common.ring_election import RingElection
+from src.simulation.scenarios import failover
+
+def _ring(node_id, ring_ids, send, alive=None):
+    """Anel com agendador inerte: nenhum prazo dispara durante o teste."""
+    alive = set(ring_ids) if alive is None else alive
+    leaders = []
+    election = RingElection(node_id, ring_ids, send, lambda nid: nid in alive, on_leader=leaders.append,
+                            schedule=lambda delay, callback: None, clock=lambda: 0.0)
+    return election, leaders
+
+def test_lone_node_elects_itself():
+    election, leaders = _ring(1, [1], send=lambda target, message: True)
+    assert election.start()
+    assert election.leader_id == 1
+    assert leaders == [1]
+    assert not election.in_progress
+
+def test_unreachable_successors_elect_the_starter():
+    # O sucessor ainda parece vivo, mas nenhuma entrega funciona
+    election, leaders = _ring(1, [1, 2], send=lambda target, message: False)
+    election.start()
+    assert election.leader_id == 1
+    assert leaders == [1]
+    assert election.stats['skipped'] == 1
+
+def test_relay_without_successor_elects_itself():
+    # Candidatura de um nó morto chega a quem já não tem para quem repassar
+    election, leaders = _ring(2, [1, 2, 3], send=lambda target, message: False, alive={2})
+    election.on_message({'type': 'ELECTION', 'candidate': 3, 'hops': 1})
+    assert election.leader_id == 2
+    assert leaders == [2]
+
+def test_single_node_cluster_has_a_leader():
+    result = failover(nodes=1, algorithm='ring', seed=1, limit=60.0)
+    assert result['first_leader'] == 1
+
+def test_two_node_ring_fails_over():
+    result = failover(nodes=2, algorithm='ring', seed=1, limit=120.0)
+    assert result['first_leader'] == 2
+    assert result['new_leader'] == 1
+    assert result['failover_time'] < 30.0
@@ -0,0 +1,61 @@
+import pytest
+
+from src.simulation.scenarios import failover, stall
+from src.simulation.simulator import Simulator
+
+def test_single_node_bully_cluster_has_a_leader():
+    assert failover(nodes=1, algorithm='bully', seed=1, limit=60.0)['first_leader'] == 1
+
+def test_two_node_bully_fails_over():
+    result = failover(nodes=2, algorithm='bully', seed=1, limit=60.0)
+    assert (result['first_leader'], result['new_leader']) == (2, 1)
+    assert result['failover_time'] < 30.0
+
+@pytest.mark.parametrize('algorithm', ['bully', 'ring'])
+@pytest.mark.parametrize('membership', ['lease', 'swim'])
+@pytest.mark.parametrize('seed', [1, 2])
+def test_failover_under_message_loss(algorithm, membership, seed):
+    result = failover(nodes=10, algorithm=algorithm, seed=seed, loss=0.05, membership=membership, limit=120.0)
+    assert result['first_leader'] == 10
+    assert result['new_leader'] == 9 # O maior sobrevivente, nos dois algoritmos
+    assert result['failover_time'] < 60.0
+
+@pytest.mark.parametrize('algorithm', ['bully', 'ring'])
+def test_heartbeat_failure_detection_runs_on_virtual_time(algorithm):
+    # Sem arrendamento, só o timeout do heartbeat (no relógio virtual) detecta a queda do líder
+    runs = [failover(nodes=8, algorithm=algorithm, seed=1, loss=0.05, membership='heartbeat', lease_duration=0, limit=120.0)
+            for _ in range(2)]
+    for run in runs:
+        run.pop('wall_time')
+    assert runs[0] == runs[1]
+    assert runs[0]['new_leader'] == 7
+    assert runs[0]['failover_time'] < 30.0
+
+def test_failover_across_a_healed_partition():
+    result = failover(nodes=10, algorithm='bully', seed=1, loss=0.02, partition=True, limit=120.0)
+    assert result['new_leader'] == 9
+
+def test_same_seed_reproduces_the_run():
+    runs = [failover(nodes=10, algorithm='ring', seed=3, loss=0.05, limit=120.0) for _ in range(2)]
+    for run in runs:
+        run.pop('wall_time')
+    assert runs[0] == runs[1]
+
+def test_short_leader_pause_keeps_the_leader_under_a_lease():
+    result = stall(nodes=10, seed=1, pause=3.0, lease_duration=10.0, limit=120.0)
+    assert result['spurious_leader_switches'] == 0
+    assert result['final_leader'] == result['first_leader']
+
+def test_simulator_runs_events_in_time_then_scheduling_order():
+    simulator = Simulator(seed=0)
+    fired = []
+    simulator.call_later(2.0, lambda: fired.append('late'))
+    simulator.call_later(1.0, lambda: fired.append('first'))
+    simulator.call_later(1.0, lambda: fired.append('second'))
+    simulator.call_later(1.5, lambda: fired.append('cancelled')).cancel()
+    simulator.call_later(0.5, lambda: simulator.call_later(0.5, lambda: fired.append('nested')))
+    simulator.run(until=1.9)
+    assert fired == ['first', 'second', 'nested']
+    assert simulator.now() == 1.9 # A janela esgotada avança o relógio até `until`
+    simulator.run()
+    assert fired[-1] == 'late' and simulator.now() == 2.0
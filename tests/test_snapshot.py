@@ -0,0 +1,74 @@
+import json
+
+from src.common.snapshot import SnapshotManager
+
+class _Pair:
+    """Dois nós A (1) e B (2) ligados por canais sem FIFO: cada envio fica na fila até o teste entregá-lo."""
+
+    def __init__(self, tmp_path, history=32):
+        self.in_flight = []
+        self.processed = {1: 0, 2: 0}
+        self.nodes = {nid: self._manager(nid, tmp_path, history) for nid in (1, 2)}
+
+    def _manager(self, nid, tmp_path, history):
+        peer = 3 - nid
+
+        def send_markers(snapshot_id, cutoffs):
+            for target, sent in cutoffs.items():
+                self.in_flight.append(('marker', nid, target, (snapshot_id, nid, sent)))
+
+        return SnapshotManager(nid, lambda: [peer], send_markers, lambda: {'processed': self.processed[nid]},
+                               output_dir=str(tmp_path), history=history, schedule=lambda delay, cb: None,
+                               clock=lambda: 0.0)
+
+    def send(self, sender, target, payload):
+        self.in_flight.append(('msg', sender, target, (sender, 'task', payload, self.nodes[sender].stamp(target))))
+
+    def deliver(self, index=0):
+        kind, _, target, args = self.in_flight.pop(index)
+        if kind == 'marker':
+            self.nodes[target].on_marker(*args)
+        else:
+            self.nodes[target].on_message(*args)
+            self.processed[target] += 1
+
+def _records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def test_message_overtaken_by_marker_is_recorded_in_transit(tmp_path):
+    pair = _Pair(tmp_path)
+    pair.send(1, 2, 'before')
+    pair.nodes[1].initiate('s1')
+    pair.deliver(1) # O marcador chega antes da mensagem enviada antes dele
+    pair.deliver(1) # Marcador de B para A
+    assert 's1' in pair.nodes[1].completed
+    assert 's1' not in pair.nodes[2].completed # B ainda espera a mensagem em trânsito
+
+    pair.deliver()
+    result = pair.nodes[2].completed['s1']
+    assert result['complete'] and result['channel_messages'] == 1
+    assert [r['m'] for r in _records(result['path']) if r['k'] == 'msg'] == ['before']
+
+def test_message_sent_after_snapshot_starts_recording_before_processing(tmp_path):
+    pair = _Pair(tmp_path)
+    pair.nodes[1].initiate('s1')
+    pair.send(1, 2, 'after')
+    pair.deliver(1) # A mensagem posterior ao snapshot chega antes do marcador
+    pair.deliver()  # Marcador de A, com corte 0
+    pair.deliver()  # Marcador de B
+
+    result = pair.nodes[2].completed['s1']
+    assert result['complete'] and result['channel_messages'] == 0
+    state = next(r['state'] for r in _records(result['path']) if r['k'] == 'state')
+    assert state == {'processed': 0} # Estado gravado antes de processar a mensagem
+    assert pair.nodes[1].completed['s1']['complete']
+
+def test_completed_history_is_bounded(tmp_path):
+    pair = _Pair(tmp_path, history=2)
+    for snapshot_id in ('s1', 's2', 's3'):
+        pair.nodes[1].initiate(snapshot_id)
+        while pair.in_flight:
+            pair.deliver()
+    assert list(pair.nodes[1].completed) == ['s2', 's3']
+    assert list(pair.nodes[2].completed) == ['s2', 's3']
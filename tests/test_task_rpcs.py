@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+TASKS = [(task_id, f"batch-{task_id}") for task_id in range(20)]
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def _assert_delivered(sender, target):
+    # O destino viu todos os envios do remetente, e o remetente viu as respostas
+    assert target.vector_clock.to_dict()[sender.node_id] >= len(TASKS)
+    assert sender.vector_clock.to_dict()[target.node_id] >= 1
+    assert sender.clock.get_time() > len(TASKS)
+
+def test_group_a_streams_a_batch_over_one_call(cluster):
+    sender, target = cluster('A', 2)
+    results = list(sender.send_tasks(target.node_id, TASKS, timeout=10))
+    # As respostas saem na ordem em que as tarefas terminam: cada task_id volta uma única vez
+    assert sorted(int(task_id) for task_id, _ in results) == [task_id for task_id, _ in TASKS]
+    assert {status for _, status in results} == {"Task completed"}
+    _assert_delivered(sender, target)
+
+@pytest.fixture
+def group_b(pyro_ns, cluster):
+    return cluster('B', 2)
+
+def test_group_b_sends_a_batch_in_one_request(group_b):
+    sender, target = group_b
+    results = list(sender.send_tasks(target.node_id, TASKS, timeout=10))
+    assert results == [(task_id, "Task completed") for task_id, _ in TASKS] # Na ordem do lote
+    _assert_delivered(sender, target)
+
+def test_group_b_oneway_batch_reaches_the_target(group_b):
+    sender, target = group_b
+    sender.send_tasks_oneway(target.node_id, TASKS)
+    sent_at = sender.clock.get_time()
+    # Sem resposta: o delta vetorial do lote só chega com ele (heartbeats e renovações não levam o relógio vetorial)
+    assert _wait_for(lambda: target.vector_clock.to_dict().get(sender.node_id, 0) >= 1)
+    assert _wait_for(lambda: target.clock.get_time() > sent_at)
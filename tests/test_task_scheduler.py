@@ -0,0 +1,70 @@
+import random
+
+from src.common.task_scheduler import TaskScheduler, OP_ADD, OP_DONE
+
+class _Harness:
+    """Escalonador com temporizadores manuais: os callbacks agendados só rodam em run_timers()."""
+
+    def __init__(self, members=(1, 2, 3), node_id=1):
+        self.timers = []
+        self.batches = []
+        self.dispatched = []
+        self.scheduler = TaskScheduler(node_id, lambda: list(members), self._dispatch, self._replicate,
+                                       schedule=lambda delay, cb: self.timers.append(cb), clock=lambda: 0.0,
+                                       rng=random.Random(1))
+
+    def _dispatch(self, target_id, task_id, task_name, callback):
+        self.dispatched.append((task_id, callback))
+
+    def _replicate(self, stream, seq, ops):
+        self.batches.append((stream, seq, ops))
+
+    def run_timers(self):
+        timers, self.timers = self.timers, []
+        for cb in timers:
+            cb()
+
+    def complete(self, task_id):
+        callback = next(cb for tid, cb in self.dispatched if tid == task_id)
+        callback(True, "Task completed", 0)
+
+def test_replication_is_batched_and_coalesced():
+    leader = _Harness()
+    leader.scheduler.activate()
+    t1 = leader.scheduler.submit('a')
+    t2 = leader.scheduler.submit('b')
+    leader.complete(t1) # Concluída antes do envio: o ADD e o DONE se anulam
+    assert leader.batches == []
+
+    leader.run_timers()
+    assert [(seq, ops) for _, seq, ops in leader.batches] == [(1, [(OP_ADD, t2, 'b')])]
+
+    leader.complete(t2)
+    leader.run_timers()
+    assert [(seq, ops) for _, seq, ops in leader.batches][1:] == [(2, [(OP_DONE, t2, '')])]
+
+def test_follower_applies_batches_in_sequence_order():
+    follower = _Harness(node_id=2)
+    follower.scheduler.apply(1, 7, 2, [(OP_DONE, '1.1', '')])
+    follower.scheduler.apply(1, 7, 1, [(OP_ADD, '1.1', 'a')])
+    assert follower.scheduler.pending() == 0 # O ADD atrasado não ressuscita a tarefa concluída
+
+    follower.scheduler.apply(1, 7, 1, [(OP_ADD, '1.1', 'a')]) # Repetido
+    assert follower.scheduler.pending() == 0
+
+def test_follower_skips_a_lost_batch_after_the_gap_timeout():
+    follower = _Harness(node_id=2)
+    follower.scheduler.apply(1, 7, 2, [(OP_ADD, '1.2', 'b')])
+    assert follower.scheduler.pending() == 0
+    follower.run_timers()
+    assert follower.scheduler.pending() == 1
+
+    follower.scheduler.apply(1, 8, 1, [(OP_ADD, '1.3', 'c')]) # Líder reiniciado: novo fluxo
+    assert follower.scheduler.pending() == 2
+
+def test_choose_samples_instead_of_scanning_the_group():
+    harness = _Harness(members=range(1, 1001))
+    harness.scheduler.activate()
+    harness.scheduler.submit('a')
+    assert len(harness.dispatched) == 1
+    assert len(harness.scheduler._load) <= 2
@@ -0,0 +1,85 @@
+import threading
+from concurrent import futures
+
+from src.common.timers import TimerWheel, SerialExecutor
+
+def _wheel(**kwargs):
+    # Um único worker: os callbacks rodam na ordem em que a roda os entrega
+    return TimerWheel(workers=1, **kwargs)
+
+def test_timers_fire_in_deadline_order():
+    wheel = _wheel(tick=0.005)
+    fired = []
+    done = threading.Event()
+    try:
+        for delay in (0.06, 0.02, 0.04):
+            wheel.call_later(delay, lambda delay=delay: fired.append(delay))
+        wheel.call_later(0.08, done.set)
+        assert done.wait(5)
+        assert fired == [0.02, 0.04, 0.06]
+    finally:
+        wheel.stop()
+
+def test_timers_cascading_from_upper_levels_keep_their_order():
+    # Quatro slots por nível: os prazos mais longos passam pelos níveis superiores e pelo transbordo
+    wheel = _wheel(tick=0.002, slots=4, levels=2)
+    fired = []
+    done = threading.Event()
+    try:
+        for delay in (0.1, 0.005, 0.05, 0.02):
+            wheel.call_later(delay, lambda delay=delay: fired.append(delay))
+        wheel.call_later(0.12, done.set)
+        assert done.wait(5)
+        assert fired == [0.005, 0.02, 0.05, 0.1]
+    finally:
+        wheel.stop()
+
+def test_cancelled_timer_does_not_fire():
+    wheel = _wheel(tick=0.005)
+    fired = []
+    done = threading.Event()
+    try:
+        wheel.call_later(0.02, lambda: fired.append('cancelled')).cancel()
+        wheel.call_later(0.01, lambda: fired.append('kept'))
+        wheel.call_later(0.04, done.set)
+        assert done.wait(5)
+        assert fired == ['kept']
+        assert wheel.get_stats()['cancelled'] == 1
+    finally:
+        wheel.stop()
+
+def test_serial_executor_runs_one_callback_per_owner_in_order():
+    executor = futures.ThreadPoolExecutor(max_workers=2)
+    slow, fast = SerialExecutor(executor), SerialExecutor(executor)
+    release = threading.Event()
+    order = []
+    done = threading.Event()
+    try:
+        # O primeiro callback do dono lento bloqueia; os seguintes dele esperam, os do outro dono não
+        slow.submit(lambda: (release.wait(5), order.append('slow-1')))
+        slow.submit(lambda: order.append('slow-2'))
+        fast.submit(lambda: order.append('fast-1'))
+        fast.submit(lambda: (order.append('fast-2'), done.set()))
+        assert done.wait(5)
+        assert order == ['fast-1', 'fast-2']
+        release.set()
+        finished = threading.Event()
+        slow.submit(finished.set)
+        assert finished.wait(5)
+        assert order == ['fast-1', 'fast-2', 'slow-1', 'slow-2']
+    finally:
+        release.set()
+        executor.shutdown(wait=False)
+
+def test_closed_serial_executor_drops_queued_callbacks():
+    executor = futures.ThreadPoolExecutor(max_workers=1)
+    owner = SerialExecutor(executor)
+    release = threading.Event()
+    fired = []
+    owner.submit(lambda: release.wait(5))
+    owner.submit(lambda: fired.append('queued'))
+    owner.close()
+    owner.submit(lambda: fired.append('late'))
+    release.set()
+    executor.shutdown(wait=True) # O worker termina o callback que bloqueava; nada mais foi agendado
+    assert fired == []
@@ -0,0 +1,23 @@
+import pytest
+
+from src.topology import generate_topology, cluster_ids
+
+def test_generated_ids_are_consecutive_across_groups():
+    group_a, group_b = generate_topology(3, 2, host='127.0.0.1', base_port_a=6000, base_port_b=7000)
+    assert group_a == {1: {'host': '127.0.0.1', 'port': 6000}, 2: {'host': '127.0.0.1', 'port': 6001},
+                       3: {'host': '127.0.0.1', 'port': 6002}}
+    assert group_b == {4: {'host': '127.0.0.1', 'port': 7000}, 5: {'host': '127.0.0.1', 'port': 7001}}
+    assert cluster_ids(group_a, group_b) == [1, 2, 3, 4, 5]
+
+def test_one_group_may_be_empty():
+    group_a, group_b = generate_topology(0, 2)
+    assert group_a == {} and sorted(group_b) == [1, 2]
+
+@pytest.mark.parametrize('nodes_a, nodes_b', [(0, 0), (-1, 3)])
+def test_invalid_sizes_are_rejected(nodes_a, nodes_b):
+    with pytest.raises(ValueError):
+        generate_topology(nodes_a, nodes_b)
+
+def test_overlapping_port_ranges_are_rejected():
+    with pytest.raises(ValueError, match="overlap"):
+        generate_topology(5, 5, base_port_a=6000, base_port_b=6003)
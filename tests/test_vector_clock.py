@@ -0,0 +1,47 @@
+from src.common.vector_clock import VectorClock
+
+IDS = [1, 2, 3]
+
+def _clocks():
+    return (VectorClock(nid, IDS) for nid in IDS)
+
+def _deliver(sender, receiver, delta):
+    """Entrega um delta e confirma o envio, como o cliente faz depois de um RPC bem-sucedido."""
+    receiver.merge_and_tick(delta)
+    sender.acknowledge(receiver.node_id, delta)
+
+def test_lost_message_is_resent_in_next_delta():
+    a, b, c = _clocks()
+    _deliver(a, b, a.prepare_send(2))
+    _deliver(c, a, c.prepare_send(1)) # A passa a conhecer C
+
+    a.prepare_send(2) # Perdido: sem resposta, sem confirmação
+    _deliver(a, b, a.prepare_send(2))
+
+    assert b.to_dict()[1] == a.to_dict()[1]
+    assert b.to_dict()[3] == a.to_dict()[3] == 1
+
+def test_out_of_order_delivery_converges():
+    a, b, c = _clocks()
+    _deliver(c, a, c.prepare_send(1))
+    first = a.prepare_send(2)
+    c.tick()
+    _deliver(c, a, c.prepare_send(1))
+    second = a.prepare_send(2)
+
+    # As duas chamadas concorrentes chegam em ordem trocada
+    _deliver(a, b, second)
+    _deliver(a, b, first)
+    assert b.to_dict()[1] == a.to_dict()[1]
+    assert b.to_dict()[3] == a.to_dict()[3] == 3
+
+    c.tick()
+    _deliver(c, a, c.prepare_send(1))
+    _deliver(a, b, a.prepare_send(2))
+    assert b.to_dict()[3] == a.to_dict()[3] == 5
+
+def test_acknowledged_entries_are_not_resent():
+    a, b, c = _clocks()
+    _deliver(c, a, c.prepare_send(1))
+    _deliver(a, b, a.prepare_send(2))
+    assert [i for i, _ in a.prepare_send(2)] == [0] # Só a entrada local mudou desde o último envio confirmado